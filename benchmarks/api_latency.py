@@ -0,0 +1,240 @@
+"""Latency probe: /api/health and audio range requests under segment load.
+
+Starts the FastAPI app with uvicorn in a child process against a
+throw-away data directory holding one synthetic job, then measures
+``/api/health`` and ``/api/jobs/{id}/audio/original`` (Range requests)
+twice: once on an idle server and once while N clients hammer
+``/api/jobs/{id}/segments``.  With blocking work kept off the event loop,
+the p99 of both probes should stay roughly flat between the two phases.
+
+Usage:
+    python -m benchmarks.api_latency --segments 20000 --fetchers 16
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import httpx
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+
+def _use_data_dir(data_dir: Path):
+    from src.api import storage
+
+    storage.DATA_DIR = data_dir
+    storage.DB_FILE = data_dir / "jobs.db"
+    storage.LEGACY_JOBS_FILE = data_dir / "jobs.json"
+
+
+def make_job(data_dir: Path, n_segments: int, audio_mb: int) -> str:
+    """Create a completed job with synthetic artifacts; return its id."""
+    from src.api import storage
+    from src.api.models import Job, JobStatus
+
+    _use_data_dir(data_dir)
+
+    job_id = "bench0000001"
+    workdir = data_dir / "work" / job_id
+    workdir.mkdir(parents=True)
+    write_artifacts(workdir, n_segments)
+
+    input_path = data_dir / "input" / f"{job_id}_bench.wav"
+    input_path.parent.mkdir(parents=True)
+    with open(input_path, "wb") as f:
+        f.write(b"RIFF\x00\x00\x00\x00WAVE")
+        f.write(random.randbytes(audio_mb * 1024 * 1024))
+
+    storage.create_job(Job(
+        id=job_id, filename="bench.wav", input_path=str(input_path),
+        workdir=str(workdir), status=JobStatus.completed,
+    ))
+    return job_id
+
+
+def write_artifacts(workdir: Path, n_segments: int):
+    """Write synthetic translations.json and timeline_map.json for the API to read."""
+    segments, tm_segments = [], []
+    t = 0.0
+    for i in range(n_segments):
+        dur = random.uniform(1.0, 8.0)
+        text = " ".join(random.choice(["hello", "world", "interview", "voice"]) for _ in range(20))
+        segments.append({
+            "start": round(t, 3), "end": round(t + dur, 3), "duration": round(dur, 3),
+            "speaker": f"SPEAKER_0{i % 2}", "text_en": text, "text_es": text,
+        })
+        tm_segments.append({
+            "start_en": round(t, 3), "end_en": round(t + dur, 3),
+            "start_es": round(t * 1.05, 3), "end_es": round((t + dur) * 1.05, 3),
+            "speaker": f"SPEAKER_0{i % 2}",
+        })
+        t += dur + random.uniform(0.1, 1.0)
+
+    (workdir / "translations.json").write_text(json.dumps({"segments": segments}, indent=2))
+    (workdir / "timeline_map.json").write_text(json.dumps({
+        "segments": tm_segments, "duration_en": round(t, 3), "duration_es": round(t * 1.05, 3),
+    }, indent=2))
+
+
+def _serve(data_dir: str, port: int):
+    import uvicorn
+
+    _use_data_dir(Path(data_dir))
+    from src.api.app import app
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def start_server(data_dir: Path, port: int, target=_serve,
+                 args: tuple = ()) -> multiprocessing.Process:
+    """Run uvicorn in a separate process (own GIL) and wait until it is up.
+
+    *target* is called as ``target(data_dir, port, *args)`` in the child.
+    """
+    proc = multiprocessing.get_context("spawn").Process(
+        target=target, args=(str(data_dir), port, *args), daemon=True,
+    )
+    proc.start()
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1).raise_for_status()
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("API server did not start")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def probe(client: httpx.AsyncClient, job_id: str, audio_size: int,
+                duration: float) -> dict[str, list[float]]:
+    """Alternate health and random range requests, recording latency in ms."""
+    samples: dict[str, list[float]] = {"health": [], "audio_range": []}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        r = await client.get("/api/health")
+        r.raise_for_status()
+        samples["health"].append((time.perf_counter() - t0) * 1000)
+
+        start = random.randrange(0, max(1, audio_size - 65536))
+        t0 = time.perf_counter()
+        r = await client.get(
+            f"/api/jobs/{job_id}/audio/original",
+            headers={"Range": f"bytes={start}-{start + 65535}"},
+        )
+        r.raise_for_status()
+        samples["audio_range"].append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(0.005)
+    return samples
+
+
+async def _fetch_segments_loop(base_url: str, job_id: str, fetchers: int, stop) -> int:
+    count = 0
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal count
+        while not stop.is_set():
+            r = await client.get(f"/api/jobs/{job_id}/segments")
+            r.raise_for_status()
+            count += 1
+
+    limits = httpx.Limits(max_connections=fetchers)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        await asyncio.gather(*(worker(client) for _ in range(fetchers)))
+    return count
+
+
+def _segment_load(base_url: str, job_id: str, fetchers: int, stop, result):
+    """Child process: hammer /segments until *stop* is set."""
+    result.value = asyncio.run(_fetch_segments_loop(base_url, job_id, fetchers, stop))
+
+
+async def run_phases(base_url: str, job_id: str, audio_size: int, fetchers: int,
+                     duration: float) -> dict:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        idle = await probe(client, job_id, audio_size, duration)
+
+        # Load generators live in their own process so that downloading
+        # large bodies does not delay the probe's own event loop.
+        ctx = multiprocessing.get_context("spawn")
+        stop, fetched = ctx.Event(), ctx.Value("i", 0)
+        load = ctx.Process(target=_segment_load, args=(base_url, job_id, fetchers, stop, fetched))
+        load.start()
+        await asyncio.sleep(1.0)
+        loaded = await probe(client, job_id, audio_size, duration)
+        stop.set()
+        load.join()
+
+    return {"idle": idle, "loaded": loaded, "segment_fetches": fetched.value}
+
+
+@click.command()
+@click.option("--segments", default=20000, help="Segments in the synthetic job")
+@click.option("--audio-mb", default=64, help="Size of the synthetic audio file")
+@click.option("--fetchers", default=16, help="Concurrent /segments clients in the loaded phase")
+@click.option("--duration", default=10.0, help="Seconds per phase")
+@click.option("--port", default=8765)
+@click.option("--output", type=click.Path(), default=None, help="Write raw results as JSON")
+def main(segments: int, audio_mb: int, fetchers: int, duration: float, port: int,
+         output: str | None):
+    """Measure probe latency on an idle vs. segment-loaded API server."""
+    data_dir = Path(tempfile.mkdtemp(prefix="loro-bench-"))
+    job_id = make_job(data_dir, segments, audio_mb)
+    audio_size = audio_mb * 1024 * 1024 + 12
+    server = start_server(data_dir, port)
+
+    try:
+        results = asyncio.run(run_phases(
+            f"http://127.0.0.1:{port}", job_id, audio_size, fetchers, duration,
+        ))
+    finally:
+        server.terminate()
+
+    table = Table(title=f"Probe latency (ms), {fetchers} segment fetchers, {segments} segments")
+    for col in ("endpoint", "phase", "n", "p50", "p95", "p99", "max"):
+        table.add_column(col)
+    summary = {}
+    for endpoint in ("health", "audio_range"):
+        for phase in ("idle", "loaded"):
+            s = results[phase][endpoint]
+            row = {
+                "n": len(s), "p50": statistics.median(s) if s else float("nan"),
+                "p95": percentile(s, 95), "p99": percentile(s, 99), "max": max(s, default=0.0),
+            }
+            summary[f"{endpoint}/{phase}"] = row
+            table.add_row(endpoint, phase, str(row["n"]),
+                          *(f"{row[k]:.1f}" for k in ("p50", "p95", "p99", "max")))
+    console.print(table)
+    console.print(f"  /segments responses served during loaded phase: {results['segment_fetches']}")
+
+    if output:
+        Path(output).write_text(json.dumps({
+            "params": {"segments": segments, "audio_mb": audio_mb,
+                       "fetchers": fetchers, "duration": duration},
+            "summary": summary,
+            "segment_fetches": results["segment_fetches"],
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
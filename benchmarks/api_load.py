@@ -0,0 +1,404 @@
+"""Capacity test: a mix of uploads, readers and WebSocket subscribers.
+
+Starts the API in a child process with the pipeline replaced by a local
+stand-in: each created job walks through the six steps in
+``--job-seconds``, broadcasting ``step_start``/``step_progress``/
+``step_complete`` events at ``--progress-hz`` like the real worker, and
+writes translations, timeline map and a rendered track when it reaches
+render.  Events carry their send time so subscribers can measure
+delivery latency.
+
+The ``--mix`` gives the number of concurrent clients per kind:
+
+* ``upload``: ``POST /api/jobs`` with a fresh WAV of ``--upload-seconds``;
+* ``segments``: full and windowed ``GET /segments`` on a completed job;
+* ``audio``: random 64 KiB ``Range`` requests on its original track;
+* ``ws``: subscribe to a running job (picked from ``GET /api/jobs``) until
+  it completes, then move on to another one.
+
+Clients can be spread over ``--processes`` so the load generator is not
+the bottleneck.  Reports requests/s and latency percentiles per endpoint.
+
+Usage:
+    python -m benchmarks.api_load --mix upload=2,segments=16,audio=32,ws=200 --duration 30
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+from functools import partial
+from pathlib import Path
+
+import click
+import httpx
+import numpy as np
+import soundfile as sf
+import websockets
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.api_latency import _serve, make_job, percentile, start_server, write_artifacts
+
+console = Console()
+
+KINDS = ("upload", "segments", "audio", "ws")
+
+# Share of a stand-in job's run time spent in each step.
+STEP_WEIGHTS = {
+    "asr": 0.25,
+    "diarize": 0.15,
+    "merge": 0.02,
+    "translate": 0.15,
+    "tts": 0.35,
+    "render": 0.08,
+}
+
+# Steps that report per-segment progress in the real pipeline.
+PROGRESS_STEPS = ("translate", "tts")
+
+RANGE_BYTES = 65536
+
+
+# ── server side ─────────────────────────────────────────────────────────
+
+def _stand_in_pipeline(job_id: str, input_path: str, workdir: str, config: dict,
+                       youtube_url: str | None = None, *, job_seconds: float,
+                       progress_hz: float, n_segments: int):
+    from src.api.models import JobStatus
+    from src.api.progress import progress_manager
+    from src.api.storage import update_job
+
+    started = time.monotonic()
+
+    def emit(event: dict):
+        left = max(0.0, job_seconds - (time.monotonic() - started))
+        progress_manager.broadcast_sync(job_id, {
+            **event, "eta_seconds": round(left), "sent_at": time.time(),
+        })
+
+    progress_manager.reset(job_id)
+    update_job(job_id, status=JobStatus.processing)
+    for step, weight in STEP_WEIGHTS.items():
+        seconds = job_seconds * weight
+        t0 = time.monotonic()
+        emit({"type": "step_start", "step": step})
+        update_job(job_id, current_step=step)
+        if step in PROGRESS_STEPS:
+            n = max(1, int(seconds * progress_hz))
+            for i in range(n):
+                time.sleep(seconds / n)
+                emit({"type": "step_progress", "step": step, "current": i + 1, "total": n})
+        else:
+            time.sleep(seconds)
+        if step == "render":
+            write_artifacts(Path(workdir), n_segments)
+            shutil.copy(input_path, Path(workdir) / "rendered.wav")
+        wall = round(time.monotonic() - t0, 3)
+        emit({"type": "step_complete", "step": step,
+              "metrics": {"wall_seconds": wall, "cpu_seconds": 0.0, "phases": {}}})
+    update_job(job_id, status=JobStatus.completed, current_step=None, eta_at=None)
+    emit({"type": "pipeline_complete"})
+
+
+def _start_stand_in(job_id: str, input_path: str, workdir: str, config: dict,
+                    youtube_url: str | None = None, **opts):
+    t = threading.Thread(
+        target=_stand_in_pipeline,
+        args=(job_id, input_path, workdir, config, youtube_url),
+        kwargs=opts, daemon=True, name=f"pipeline-{job_id}",
+    )
+    t.start()
+    return t
+
+
+async def _environment_ok() -> dict:
+    return {}
+
+
+def _serve_with_stand_in(data_dir: str, port: int, job_seconds: float, progress_hz: float,
+                         n_segments: int):
+    from src.api.routes import jobs
+
+    jobs.start_pipeline = partial(_start_stand_in, job_seconds=job_seconds,
+                                  progress_hz=progress_hz, n_segments=n_segments)
+    # The stand-in needs neither ffmpeg nor HF_TOKEN
+    jobs.validate_environment = _environment_ok
+    _serve(data_dir, port)
+
+
+# ── client side ─────────────────────────────────────────────────────────
+
+def _wav_bytes(seconds: float, sr: int = 16000) -> bytes:
+    buf = io.BytesIO()
+    audio = (np.random.default_rng().standard_normal(int(seconds * sr)) * 0.1).astype(np.float32)
+    sf.write(buf, audio, sr, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+class _Samples:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, Counter] = {}
+        self.ws = {"connections": 0, "failed": 0, "messages": 0, "delivery_ms": []}
+
+    def add(self, endpoint: str, ms: float):
+        self.latencies.setdefault(endpoint, []).append(ms)
+
+    def error(self, endpoint: str, reason: str):
+        self.errors.setdefault(endpoint, Counter())[reason] += 1
+
+    async def timed(self, endpoint: str, request) -> httpx.Response | None:
+        t0 = time.perf_counter()
+        try:
+            r = await request
+        except httpx.HTTPError as e:
+            self.error(endpoint, type(e).__name__)
+            return None
+        if r.is_error:
+            self.error(endpoint, str(r.status_code))
+            return None
+        self.add(endpoint, (time.perf_counter() - t0) * 1000)
+        return r
+
+    def to_dict(self) -> dict:
+        return {"latencies": self.latencies,
+                "errors": {k: dict(v) for k, v in self.errors.items()}, "ws": self.ws}
+
+
+async def _uploader(client: httpx.AsyncClient, body: bytes, s: _Samples, deadline: float):
+    while time.monotonic() < deadline:
+        # A unique tail keeps uploads from being deduplicated by input hash
+        data = body[:-16] + os.urandom(16)
+        await s.timed("upload", client.post(
+            "/api/jobs", files={"file": ("load.wav", data, "audio/wav")},
+            data={"max_speakers": "2"},
+        ))
+
+
+async def _segments_reader(client: httpx.AsyncClient, job_id: str, duration_s: float,
+                           s: _Samples, deadline: float):
+    while time.monotonic() < deadline:
+        if random.random() < 0.5:
+            await s.timed("segments", client.get(f"/api/jobs/{job_id}/segments"))
+        else:
+            t = random.uniform(0, max(0.0, duration_s - 60))
+            await s.timed("segments_window", client.get(
+                f"/api/jobs/{job_id}/segments", params={"from": t, "to": t + 60},
+            ))
+
+
+async def _audio_reader(client: httpx.AsyncClient, job_id: str, size: int,
+                        s: _Samples, deadline: float):
+    while time.monotonic() < deadline:
+        start = random.randrange(0, max(1, size - RANGE_BYTES))
+        await s.timed("audio_range", client.get(
+            f"/api/jobs/{job_id}/audio/original",
+            headers={"Range": f"bytes={start}-{start + RANGE_BYTES - 1}"},
+        ))
+
+
+async def _subscriber(client: httpx.AsyncClient, ws_base: str, s: _Samples, deadline: float):
+    while time.monotonic() < deadline:
+        r = await s.timed("jobs_list", client.get("/api/jobs"))
+        live = [j["id"] for j in (r.json() if r else [])
+                if j["status"] in ("pending", "processing")]
+        if not live:
+            await asyncio.sleep(0.2)
+            continue
+        try:
+            async with websockets.connect(f"{ws_base}/api/jobs/{random.choice(live)}/ws",
+                                          max_queue=None) as ws:
+                s.ws["connections"] += 1
+                connected = time.time()
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), remaining)
+                    except asyncio.TimeoutError:
+                        return
+                    msg = json.loads(raw)
+                    if msg["type"] in ("ping", "pong"):
+                        continue
+                    s.ws["messages"] += 1
+                    # Replayed snapshot events were sent before we connected
+                    if msg.get("sent_at", 0) >= connected:
+                        s.ws["delivery_ms"].append((time.time() - msg["sent_at"]) * 1000)
+                    if msg["type"] in ("pipeline_complete", "error"):
+                        break
+        except (OSError, websockets.WebSocketException):
+            s.ws["failed"] += 1
+            await asyncio.sleep(0.2)
+
+
+async def _load(base_url: str, mix: dict[str, int], job_id: str, duration_s: float,
+                audio_size: int, upload_seconds: float, duration: float) -> dict:
+    s = _Samples()
+    body = _wav_bytes(upload_seconds)
+    ws_base = base_url.replace("http://", "ws://", 1)
+    limits = httpx.Limits(max_connections=sum(mix.values()) + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        deadline = time.monotonic() + duration
+        tasks = [_uploader(client, body, s, deadline) for _ in range(mix.get("upload", 0))]
+        tasks += [_segments_reader(client, job_id, duration_s, s, deadline)
+                  for _ in range(mix.get("segments", 0))]
+        tasks += [_audio_reader(client, job_id, audio_size, s, deadline)
+                  for _ in range(mix.get("audio", 0))]
+        tasks += [_subscriber(client, ws_base, s, deadline) for _ in range(mix.get("ws", 0))]
+        await asyncio.gather(*tasks)
+    return s.to_dict()
+
+
+def _client_process(args: tuple) -> dict:
+    return asyncio.run(_load(*args))
+
+
+def _split_mix(mix: dict[str, int], processes: int) -> list[dict[str, int]]:
+    parts = [dict.fromkeys(mix, 0) for _ in range(processes)]
+    for kind, count in mix.items():
+        for i in range(count):
+            parts[i % processes][kind] += 1
+    return [p for p in parts if any(p.values())]
+
+
+def _parse_mix(ctx, param, value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        kind, _, count = item.partition("=")
+        if kind not in KINDS or not count.isdigit():
+            raise click.BadParameter(f"expected kind=count with kind in {', '.join(KINDS)}")
+        mix[kind] = int(count)
+    return mix
+
+
+def _merge(results: list[dict]) -> dict:
+    merged = {"latencies": {}, "errors": {}, "ws": {"connections": 0, "failed": 0,
+                                                    "messages": 0, "delivery_ms": []}}
+    for r in results:
+        for endpoint, samples in r["latencies"].items():
+            merged["latencies"].setdefault(endpoint, []).extend(samples)
+        for endpoint, reasons in r["errors"].items():
+            counter = merged["errors"].setdefault(endpoint, Counter())
+            counter.update(reasons)
+        for key in ("connections", "failed", "messages"):
+            merged["ws"][key] += r["ws"][key]
+        merged["ws"]["delivery_ms"].extend(r["ws"]["delivery_ms"])
+    return merged
+
+
+def _summarize(merged: dict, duration: float) -> dict:
+    endpoints = {}
+    for endpoint in sorted(merged["latencies"].keys() | merged["errors"].keys()):
+        samples = merged["latencies"].get(endpoint, [])
+        endpoints[endpoint] = {
+            "ok": len(samples),
+            "errors": dict(merged["errors"].get(endpoint, {})),
+            "rps": round(len(samples) / duration, 1),
+            "p50_ms": round(statistics.median(samples), 2) if samples else None,
+            "p95_ms": round(percentile(samples, 95), 2) if samples else None,
+            "p99_ms": round(percentile(samples, 99), 2) if samples else None,
+        }
+    delivery = merged["ws"]["delivery_ms"]
+    ws = {
+        "connections": merged["ws"]["connections"],
+        "failed": merged["ws"]["failed"],
+        "messages": merged["ws"]["messages"],
+        "msgs_per_s": round(merged["ws"]["messages"] / duration, 1),
+        "delivery_p50_ms": round(statistics.median(delivery), 2) if delivery else None,
+        "delivery_p99_ms": round(percentile(delivery, 99), 2) if delivery else None,
+    }
+    return {"endpoints": endpoints, "ws": ws}
+
+
+def _fmt(value) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+@click.command()
+@click.option("--mix", default="upload=2,segments=16,audio=32,ws=200", callback=_parse_mix,
+              help="Concurrent clients per kind (upload, segments, audio, ws)")
+@click.option("--duration", default=30.0, help="Seconds of load")
+@click.option("--processes", default=1, help="Client processes the mix is spread over")
+@click.option("--job-seconds", default=30.0, help="Run time of each stand-in pipeline job")
+@click.option("--progress-hz", default=20.0, help="step_progress events per second per job")
+@click.option("--live-jobs", default=4, help="Jobs created before the load starts")
+@click.option("--segments", default=2000, help="Segments in the read jobs")
+@click.option("--audio-mb", default=64, help="Size of the audio served to range readers")
+@click.option("--upload-seconds", default=60.0, help="Length of each uploaded WAV")
+@click.option("--port", default=8768)
+@click.option("--output", type=click.Path(), default=None, help="Write results as JSON")
+def main(mix: dict[str, int], duration: float, processes: int, job_seconds: float,
+         progress_hz: float, live_jobs: int, segments: int, audio_mb: int,
+         upload_seconds: float, port: int, output: str | None):
+    """Measure throughput and latency of one API instance under mixed load."""
+    data_dir = Path(tempfile.mkdtemp(prefix="loro-bench-"))
+    job_id = make_job(data_dir, segments, audio_mb)
+    audio_size = audio_mb * 1024 * 1024 + 12
+    # make_job's timeline runs ~5 s per segment
+    duration_s = segments * 5.0
+
+    server = start_server(data_dir, port, target=_serve_with_stand_in,
+                          args=(job_seconds, progress_hz, segments))
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        body = _wav_bytes(upload_seconds)
+        for _ in range(live_jobs):
+            httpx.post(f"{base_url}/api/jobs", timeout=60,
+                       files={"file": ("live.wav", body[:-16] + os.urandom(16), "audio/wav")},
+                       ).raise_for_status()
+
+        args = [(base_url, part, job_id, duration_s, audio_size, upload_seconds, duration)
+                for part in _split_mix(mix, max(1, processes))]
+        console.print(f"Load for {duration:.0f}s: "
+                      + ", ".join(f"{k}={v}" for k, v in mix.items())
+                      + f" over {len(args)} process(es)")
+        if len(args) == 1:
+            results = [_client_process(args[0])]
+        else:
+            with multiprocessing.get_context("spawn").Pool(len(args)) as pool:
+                results = pool.map(_client_process, args)
+    finally:
+        server.terminate()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    summary = _summarize(_merge(results), duration)
+
+    table = Table(title="Endpoints")
+    for col in ("endpoint", "ok", "errors", "req/s", "p50 ms", "p95 ms", "p99 ms"):
+        table.add_column(col)
+    for endpoint, row in summary["endpoints"].items():
+        errors = ", ".join(f"{k}×{v}" for k, v in row["errors"].items()) or "0"
+        table.add_row(endpoint, str(row["ok"]), errors, f"{row['rps']:.1f}",
+                      _fmt(row["p50_ms"]), _fmt(row["p95_ms"]), _fmt(row["p99_ms"]))
+    console.print(table)
+    ws = summary["ws"]
+    console.print(
+        f"WebSocket: {ws['connections']} connections ({ws['failed']} failed), "
+        f"{ws['messages']} messages ({ws['msgs_per_s']:.0f}/s), delivery "
+        f"p50 {_fmt(ws['delivery_p50_ms'])} ms / p99 {_fmt(ws['delivery_p99_ms'])} ms"
+    )
+
+    if output:
+        Path(output).write_text(json.dumps({
+            "params": {"mix": mix, "duration": duration, "processes": processes,
+                       "job_seconds": job_seconds, "progress_hz": progress_hz,
+                       "live_jobs": live_jobs, "segments": segments, "audio_mb": audio_mb,
+                       "upload_seconds": upload_seconds},
+            **summary,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Concurrent seek throughput for /api/jobs/{id}/audio/{track}.
+
+Simulates listeners scrubbing through a long track: each client issues
+random ``Range`` requests (a mix of ``a-b``, open-ended ``a-`` capped by
+the client, and suffix ``-N`` forms) as fast as responses come back.
+Reports requests/s, MB/s and latency percentiles per concurrency level.
+
+Usage:
+    python -m benchmarks.audio_seek --audio-mb 256 --clients 1,8,32,64
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import click
+import httpx
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.api_latency import make_job, percentile, start_server
+
+console = Console()
+
+
+def _random_range(size: int, span: int) -> str:
+    kind = random.random()
+    if kind < 0.1:
+        return f"bytes=-{span}"
+    start = random.randrange(0, max(1, size - span))
+    if kind < 0.3:
+        return f"bytes={start}-"  # read up to span bytes, then dropped
+    return f"bytes={start}-{start + span - 1}"
+
+
+async def _client(client: httpx.AsyncClient, url: str, size: int, span: int,
+                  deadline: float, latencies: list[float]) -> int:
+    received = 0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        async with client.stream("GET", url, headers={"Range": _random_range(size, span)}) as r:
+            if r.status_code != 206:
+                raise RuntimeError(f"expected 206, got {r.status_code}")
+            # Like a player scrubbing away, stop reading an open-ended range
+            # after span bytes (the connection is closed)
+            got = 0
+            async for chunk in r.aiter_bytes():
+                got += len(chunk)
+                if got >= span:
+                    break
+        received += min(got, span)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return received
+
+
+async def run_level(base_url: str, url: str, size: int, clients: int, span: int,
+                    duration: float) -> dict:
+    latencies: list[float] = []
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+        t0 = time.perf_counter()
+        received = await asyncio.gather(*(
+            _client(client, url, size, span, deadline, latencies) for _ in range(clients)
+        ))
+        elapsed = time.perf_counter() - t0
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "req_per_s": len(latencies) / elapsed,
+        "mb_per_s": sum(received) / elapsed / (1024 * 1024),
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+@click.command()
+@click.option("--audio-mb", default=256, help="Size of the synthetic audio file")
+@click.option("--clients", default="1,8,32,64", help="Comma-separated concurrency levels")
+@click.option("--span-kb", default=256, help="Bytes per range request (KB)")
+@click.option("--duration", default=10.0, help="Seconds per concurrency level")
+@click.option("--port", default=8766)
+@click.option("--output", type=click.Path(), default=None, help="Write results as JSON")
+def main(audio_mb: int, clients: str, span_kb: int, duration: float, port: int,
+         output: str | None):
+    """Measure range-request throughput at several concurrency levels."""
+    data_dir = Path(tempfile.mkdtemp(prefix="loro-bench-"))
+    job_id = make_job(data_dir, 10, audio_mb)
+    size = audio_mb * 1024 * 1024 + 12
+    url = f"/api/jobs/{job_id}/audio/original"
+    levels = [int(c) for c in clients.split(",")]
+
+    server = start_server(data_dir, port)
+    try:
+        results = [
+            asyncio.run(run_level(f"http://127.0.0.1:{port}", url, size, n,
+                                  span_kb * 1024, duration))
+            for n in levels
+        ]
+    finally:
+        server.terminate()
+
+    table = Table(title=f"Audio range throughput ({audio_mb} MB file, {span_kb} KB ranges)")
+    for col in ("clients", "requests", "req/s", "MB/s", "p50 ms", "p99 ms"):
+        table.add_column(col)
+    for r in results:
+        table.add_row(str(r["clients"]), str(r["requests"]), f"{r['req_per_s']:.0f}",
+                      f"{r['mb_per_s']:.1f}", f"{r['p50_ms']:.1f}", f"{r['p99_ms']:.1f}")
+    console.print(table)
+
+    if output:
+        Path(output).write_text(json.dumps({
+            "params": {"audio_mb": audio_mb, "span_kb": span_kb, "duration": duration},
+            "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
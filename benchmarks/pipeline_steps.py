@@ -0,0 +1,341 @@
+"""Offline pipeline benchmark: every step at several input lengths.
+
+For each scale (``1m``, ``1h``, ``8h`` ...) a synthetic transcript and the
+matching audio are generated, the model libraries are replaced by the
+stubs in ``benchmarks.stubs``, and the six real steps run in order in a
+fresh workdir.  Per step the suite records wall/CPU time, peak RSS and
+sub-phases (``PipelineStep.metrics``); per scale it also times
+``split_text_for_tts`` over the translated text and the read routes
+(segments, audio ranges, timeline map) on the produced job.  The storage
+layer is timed once.
+
+Results are written as JSON.  The run exits non-zero if any step fails;
+``--compare`` checks the results against an earlier run and also exits
+non-zero on regressions beyond ``--tolerance``.
+Needs torch (CPU is enough), librosa, pyloudnorm and ffmpeg like the
+real pipeline; no models or network.
+
+Usage:
+    python -m benchmarks.pipeline_steps --scales 1m,1h --output bench.json
+    python -m benchmarks.pipeline_steps --scales 1m,1h --compare bench.json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks import stubs, synth
+from benchmarks.api_latency import _use_data_dir, percentile
+from src.pipeline.registry import STEPS_ORDER, get_step
+
+console = Console()
+
+SCALES = {"1m": 60.0, "10m": 600.0, "1h": 3600.0, "8h": 8 * 3600.0}
+
+# Storage micro-benchmark size.
+STORAGE_JOBS = 500
+
+# Requests per timed route.
+ROUTE_REQUESTS = 100
+
+
+def _parse_scale(name: str) -> float:
+    if name in SCALES:
+        return SCALES[name]
+    unit = {"s": 1, "m": 60, "h": 3600}.get(name[-1:])
+    try:
+        return float(name[:-1]) * unit if unit else float(name)
+    except ValueError:
+        raise click.BadParameter(f"invalid scale {name!r} (e.g. 1m, 90s, 8h)")
+
+
+def _timed(fn, repeat: int) -> list[float]:
+    """Milliseconds per call of *fn* over *repeat* calls."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _summary(samples: list[float]) -> dict:
+    return {"p50_ms": round(statistics.median(samples), 3),
+            "p99_ms": round(percentile(samples, 99), 3)}
+
+
+def bench_storage(n_jobs: int) -> dict:
+    """Time the job store: inserts, updates, point reads and listings."""
+    from src.api import storage
+    from src.api.models import Job, JobStatus
+
+    ids = [f"store{i:07d}" for i in range(n_jobs)]
+    it = iter(ids)
+    results = {
+        "create_job": _summary(_timed(lambda: storage.create_job(Job(
+            id=next(it), filename="x.wav", input_path="/dev/null", workdir="/dev/null",
+        )), n_jobs)),
+        "update_job": _summary(_timed(lambda: storage.update_job(
+            random.choice(ids), status=JobStatus.processing, current_step="tts",
+        ), n_jobs)),
+        "get_job": _summary(_timed(lambda: storage.get_job(random.choice(ids)), n_jobs)),
+        "list_jobs": _summary(_timed(storage.list_jobs, 20)),
+    }
+    for job_id in ids:
+        storage.delete_job(job_id)
+    return results
+
+
+def bench_split_text(workdir: Path) -> dict:
+    """``split_text_for_tts`` over the translations, single and in groups of 4."""
+    from src.utils.artifacts import read_artifact
+    from src.utils.text import split_text_for_tts
+
+    texts = [s["text_es"] for s in read_artifact(workdir / "translations.json")["segments"]]
+    texts += [" ".join(texts[i:i + 4]) for i in range(0, len(texts), 4)]
+    t0 = time.perf_counter()
+    chunks = sum(len(split_text_for_tts(text)) for text in texts)
+    return {"texts": len(texts), "chunks": chunks,
+            "total_ms": round((time.perf_counter() - t0) * 1000, 3)}
+
+
+def bench_routes(job_id: str, audio_seconds: float) -> dict:
+    """Read routes on a completed job, through the ASGI app in-process."""
+    from fastapi.testclient import TestClient
+
+    from src.api.app import app
+
+    results = {}
+    with TestClient(app) as client:
+        def get(url: str, **kwargs):
+            client.get(url, **kwargs).raise_for_status()
+
+        base = f"/api/jobs/{job_id}"
+        results["segments_cold"] = _summary(_timed(lambda: get(f"{base}/segments"), 1))
+        results["segments_warm"] = _summary(_timed(lambda: get(f"{base}/segments"), 20))
+
+        def window():
+            t = random.uniform(0, max(0.0, audio_seconds - 60))
+            get(f"{base}/segments", params={"from": t, "to": t + 60})
+
+        results["segments_window"] = _summary(_timed(window, ROUTE_REQUESTS))
+
+        for track in ("original", "translated"):
+            size = int(client.head(f"{base}/audio/{track}").headers["content-length"])
+
+            def audio_range():
+                start = random.randrange(0, max(1, size - 65536))
+                get(f"{base}/audio/{track}", headers={"Range": f"bytes={start}-{start + 65535}"})
+
+            results[f"audio_range_{track}"] = _summary(_timed(audio_range, ROUTE_REQUESTS))
+
+        results["timeline_map"] = _summary(_timed(
+            lambda: get(f"{base}/timeline/map", params={"t": random.uniform(0, audio_seconds)}),
+            ROUTE_REQUESTS,
+        ))
+    return results
+
+
+def run_scale(name: str, seconds: float, root: Path, config: dict, seed: int) -> dict:
+    from src.api import storage
+    from src.api.models import Job, JobStatus
+
+    workdir = root / "work" / name
+    workdir.mkdir(parents=True)
+    console.print(f"[bold]{name}[/bold]: generating {seconds / 60:.0f} min of synthetic input...")
+    transcript = synth.make_transcript(seconds, seed=seed)
+    input_path = root / f"input_{name}.wav"
+    synth.write_audio(input_path, seconds, transcript, seed=seed)
+    stubs.install(transcript, seed)
+
+    result = {"audio_seconds": seconds, "segments": len(transcript), "steps": {}}
+    for step_name in STEPS_ORDER:
+        step = get_step(step_name)(workdir=workdir, config=config, force=True)
+        console.print(f"  {step_name}...")
+        try:
+            step.run(input_audio=str(input_path))
+        except Exception as e:
+            console.print(f"  [red]{step_name} failed: {e}[/red]")
+            result["steps"][step_name] = {"error": str(e)}
+            return result
+        result["steps"][step_name] = step.metrics
+
+    result["split_text_for_tts"] = bench_split_text(workdir)
+
+    job_id = f"bench{name}"
+    storage.create_job(Job(
+        id=job_id, filename=input_path.name, input_path=str(input_path),
+        workdir=str(workdir), status=JobStatus.completed,
+    ))
+    result["routes"] = bench_routes(job_id, seconds)
+    return result
+
+
+def _flatten(results: dict) -> dict[str, float]:
+    """``scale/section/name`` -> a lower-is-better number, for comparisons."""
+    flat = {}
+    for op, summary in results.get("storage", {}).items():
+        flat[f"storage/{op}"] = summary["p50_ms"]
+    for scale, data in results.get("scales", {}).items():
+        for step, metrics in data.get("steps", {}).items():
+            if "wall_seconds" in metrics:
+                flat[f"{scale}/step/{step}"] = metrics["wall_seconds"]
+                flat[f"{scale}/rss_mb/{step}"] = (metrics.get("peak_rss_bytes") or 0) / 2**20
+        if "split_text_for_tts" in data:
+            flat[f"{scale}/split_text_for_tts"] = data["split_text_for_tts"]["total_ms"]
+        for route, summary in data.get("routes", {}).items():
+            flat[f"{scale}/route/{route}"] = summary["p50_ms"]
+    return flat
+
+
+def _noise_floor(key: str) -> float:
+    """Absolute change below which a metric's difference is run-to-run noise."""
+    if "/rss_mb/" in key:
+        return 16.0
+    if "/step/" in key:
+        return 0.05
+    return 0.5  # milliseconds
+
+
+def compare(baseline: dict, current: dict, tolerance: float) -> int:
+    """Print current vs. baseline; return the number of regressions."""
+    old, new = _flatten(baseline), _flatten(current)
+    table = Table(title=f"Compared to {baseline.get('meta', {}).get('git') or 'baseline'}")
+    for col in ("metric", "baseline", "current", "change"):
+        table.add_column(col)
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        if before <= 0:
+            continue
+        change = after / before - 1
+        worse = change > tolerance and after - before > _noise_floor(key)
+        regressions += worse
+        style = "red" if worse else ("green" if change < -tolerance else "")
+        table.add_row(key, f"{before:.3f}", f"{after:.3f}",
+                      f"[{style}]{change:+.0%}[/{style}]" if style else f"{change:+.0%}")
+    console.print(table)
+    return regressions
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def _print_results(results: dict):
+    table = Table(title="Pipeline steps (stub models)")
+    columns = ["scale", "segments", *STEPS_ORDER, "split ms", "segments p50 ms"]
+    for col in columns:
+        table.add_column(col)
+    for scale, data in results["scales"].items():
+        steps = data["steps"]
+        cells = [
+            f"{steps[s]['wall_seconds']:.2f}s" if "wall_seconds" in steps.get(s, {})
+            else ("error" if s in steps else "-")
+            for s in STEPS_ORDER
+        ]
+        split = data.get("split_text_for_tts", {}).get("total_ms")
+        route = data.get("routes", {}).get("segments_warm", {}).get("p50_ms")
+        table.add_row(scale, str(data["segments"]), *cells,
+                      f"{split:.1f}" if split is not None else "-",
+                      f"{route:.1f}" if route is not None else "-")
+    console.print(table)
+
+
+@click.command()
+@click.option("--scales", default="1m,1h",
+              help="Comma-separated input lengths (1m, 1h, 8h, 90s...); 8h needs ~8 GB RAM")
+@click.option("--config", "config_path", default="configs/default.yaml")
+@click.option("--seed", default=0, help="Seed of the synthetic transcripts")
+@click.option("--output", type=click.Path(), default=None, help="Write results as JSON")
+@click.option("--compare", "baseline_path", type=click.Path(exists=True), default=None,
+              help="Earlier --output file to compare against")
+@click.option("--tolerance", default=0.2, help="Relative slowdown reported as a regression")
+@click.option("--keep", is_flag=True, default=False, help="Keep the generated workdirs")
+@click.option("--verbose", is_flag=True, default=False, help="Show the steps' own output")
+def main(scales: str, config_path: str, seed: int, output: str | None,
+         baseline_path: str | None, tolerance: float, keep: bool, verbose: bool):
+    """Time every pipeline step offline with stub models at several scales."""
+    from src.config import load_config
+    from src.pipeline.base import console as step_console
+
+    scale_seconds = {name: _parse_scale(name) for name in scales.split(",") if name}
+
+    root = Path(tempfile.mkdtemp(prefix="loro-bench-"))
+    _use_data_dir(root)
+    os.environ.setdefault("HF_TOKEN", "offline-benchmark")
+
+    config = load_config(config_path)
+    config["devices"] = {component: "cpu" for component in config.get("devices", {})}
+    # The NLLB stub is no nn.Module and cannot be converted to CTranslate2
+    config["translation"]["quantization"] = "none"
+    # Match speakers against an empty library, not the one in data/voices
+    if config.get("voices", {}).get("library_dir"):
+        config["voices"]["library_dir"] = str(root / "voices")
+    config.get("profiling", {}).pop("steps", None)
+    step_console.quiet = not verbose
+
+    results = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": seed,
+        },
+        "storage": bench_storage(STORAGE_JOBS),
+        "scales": {},
+    }
+    try:
+        for name, seconds in scale_seconds.items():
+            random.seed(seed)
+            results["scales"][name] = run_scale(name, seconds, root, config, seed)
+    finally:
+        if keep:
+            console.print(f"Workdirs kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    _print_results(results)
+
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2))
+        console.print(f"Results written to {output}")
+
+    failed = [f"{scale}/{step}" for scale, data in results["scales"].items()
+              for step, metrics in data["steps"].items() if "error" in metrics]
+    if failed:
+        console.print(f"[red]Steps failed: {', '.join(failed)}[/red]")
+        sys.exit(1)
+
+    if baseline_path:
+        baseline = json.loads(Path(baseline_path).read_text())
+        regressions = compare(baseline, results, tolerance)
+        if regressions:
+            console.print(f"[red]{regressions} regression(s) above {tolerance:.0%}[/red]")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Speed vs. quality of each preset on a reference clip set.
+
+Runs the real pipeline (real models) over every clip once per preset and
+reports, per preset, the real-time factor of each step next to the ASR
+word error rate and the end-to-end BLEU of the Spanish text.  This is
+what the values under ``presets:`` in ``configs/default.yaml`` should be
+tuned with.
+
+The clip set is a directory of audio files, each with reference texts
+next to it::
+
+    clips/
+      panel.wav      panel.en.txt   panel.es.txt
+      podcast.mp3    podcast.en.txt podcast.es.txt
+
+Clips are processed like ``src.batch`` (grouped by step, one model load
+per step type), so model loading is not counted against the clips.
+
+Usage:
+    python -m benchmarks.presets clips/ --presets fast,balanced,quality --output presets.json
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+
+def _tokens(text: str) -> list[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def wer(reference: str, hypothesis: str) -> float:
+    """Word error rate: word-level edit distance over the reference length."""
+    ref, hyp = _tokens(reference), _tokens(hypothesis)
+    if not ref:
+        return float(bool(hyp))
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h)))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def bleu(references: list[str], hypotheses: list[str], max_n: int = 4) -> float:
+    """Corpus BLEU (0-100) with add-one smoothing of the higher n-gram orders."""
+    matches, totals = [0] * max_n, [0] * max_n
+    ref_len = hyp_len = 0
+    for reference, hypothesis in zip(references, hypotheses):
+        ref, hyp = _tokens(reference), _tokens(hypothesis)
+        ref_len, hyp_len = ref_len + len(ref), hyp_len + len(hyp)
+        for n in range(1, max_n + 1):
+            ref_ngrams = Counter(tuple(ref[i:i + n]) for i in range(len(ref) - n + 1))
+            hyp_ngrams = Counter(tuple(hyp[i:i + n]) for i in range(len(hyp) - n + 1))
+            matches[n - 1] += sum((hyp_ngrams & ref_ngrams).values())
+            totals[n - 1] += max(0, len(hyp) - n + 1)
+    if hyp_len == 0 or matches[0] == 0:
+        return 0.0
+    log_precision = sum(
+        math.log((m + (n > 0)) / (t + (n > 0))) for n, (m, t) in enumerate(zip(matches, totals))
+    ) / max_n
+    brevity = min(0.0, 1 - ref_len / hyp_len)
+    return round(100 * math.exp(log_precision + brevity), 2)
+
+
+def find_clips(clip_dir: Path) -> list[tuple[Path, str, str]]:
+    """``(audio, reference EN, reference ES)`` for every clip with both references."""
+    from src.batch import AUDIO_EXTENSIONS
+
+    clips = []
+    for audio in sorted(clip_dir.iterdir()):
+        if audio.suffix.lower() not in AUDIO_EXTENSIONS:
+            continue
+        en, es = audio.with_suffix(".en.txt"), audio.with_suffix(".es.txt")
+        if en.exists() and es.exists():
+            clips.append((audio, en.read_text(), es.read_text()))
+        else:
+            console.print(f"[yellow]Skipping {audio.name}: missing .en.txt/.es.txt[/yellow]")
+    return clips
+
+
+def run_preset(preset: str, clips: list, config_path: str, root: Path) -> dict:
+    from src.batch import BatchItem, _run_step
+    from src.config import apply_preset, ensure_workdir, load_config
+    from src.pipeline.models import ModelCache
+    from src.pipeline.registry import STEPS_ORDER, get_step
+    from src.utils.audio import probe_duration
+    from src.utils.artifacts import read_artifact
+
+    config = apply_preset(load_config(config_path), preset)
+    items = [BatchItem(audio, ensure_workdir(str(root / preset / audio.stem)))
+             for audio, _, _ in clips]
+    models = ModelCache()
+    for step_name in STEPS_ORDER:
+        console.print(f"  {preset}: {step_name}")
+        for item in items:
+            if item.failed_step is None:
+                _run_step(get_step(step_name), item, config, True, models)
+        models.clear()
+
+    audio_seconds = sum(probe_duration(audio) or 0.0 for audio, _, _ in clips)
+    step_seconds = {
+        name: round(sum((item.steps.get(name) or {}).get("wall_seconds", 0.0) for item in items), 3)
+        for name in STEPS_ORDER
+    }
+    result = {
+        "audio_seconds": round(audio_seconds, 3),
+        "step_seconds": step_seconds,
+        "rtf": round(sum(step_seconds.values()) / audio_seconds, 4) if audio_seconds else None,
+        "model_load_seconds": models.load_seconds,
+        "failed": {str(item.input_path.name): item.error for item in items if item.failed_step},
+    }
+
+    refs_en, hyps_en, refs_es, hyps_es = [], [], [], []
+    for item, (_, ref_en, ref_es) in zip(items, clips):
+        if item.failed_step:
+            continue
+        asr = read_artifact(item.workdir / "asr.json")["segments"]
+        refs_en.append(ref_en)
+        hyps_en.append(" ".join(s.get("text", "") for s in asr))
+        translations = read_artifact(item.workdir / "translations.json")["segments"]
+        refs_es.append(ref_es)
+        hyps_es.append(" ".join(s.get("text_es", "") for s in translations))
+    if refs_en:
+        words = sum(len(_tokens(r)) for r in refs_en)
+        result["wer"] = round(
+            sum(wer(r, h) * len(_tokens(r)) for r, h in zip(refs_en, hyps_en)) / max(1, words), 4
+        )
+        result["bleu"] = bleu(refs_es, hyps_es)
+    return result
+
+
+@click.command()
+@click.argument("clip_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--presets", "preset_list", default=None,
+              help="Comma-separated presets (default: all in the config)")
+@click.option("--config", "config_path", default="configs/default.yaml")
+@click.option("--workdir-root", type=click.Path(path_type=Path), default=None,
+              help="Keep the per-preset workdirs here (default: a temporary directory)")
+@click.option("--output", type=click.Path(), default=None, help="Write results as JSON")
+def main(clip_dir: Path, preset_list: str | None, config_path: str,
+         workdir_root: Path | None, output: str | None):
+    """Measure speed (RTF) against WER/BLEU for each preset on reference clips."""
+    from src.config import load_config, preset_names, validate_environment
+
+    validate_environment()
+    names = preset_list.split(",") if preset_list else preset_names(load_config(config_path))
+    clips = find_clips(clip_dir)
+    if not clips:
+        raise click.ClickException(f"No clips with references in {clip_dir}")
+    root = workdir_root or Path(tempfile.mkdtemp(prefix="loro-presets-"))
+
+    results = {name: run_preset(name, clips, config_path, root) for name in names}
+
+    table = Table(title=f"Presets on {len(clips)} clip(s)")
+    for col in ("preset", "RTF", "asr s", "translate s", "tts s", "render s", "WER", "BLEU"):
+        table.add_column(col)
+    for name, r in results.items():
+        steps = r["step_seconds"]
+        table.add_row(
+            name,
+            f"{r['rtf']:.3f}" if r["rtf"] is not None else "-",
+            *(f"{steps[s]:.1f}" for s in ("asr", "translate", "tts", "render")),
+            f"{r['wer']:.1%}" if "wer" in r else "-",
+            f"{r['bleu']:.1f}" if "bleu" in r else "-",
+        )
+    console.print(table)
+    console.print(f"Workdirs: {root}")
+
+    if output:
+        Path(output).write_text(json.dumps({"clips": [a.name for a, _, _ in clips],
+                                            "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Startup budget: time to ``--help``, to a merge-only run and to API boot.
+
+Each scenario runs in a fresh interpreter ``--runs`` times; the median
+wall time must stay within ``--budget`` seconds.  One extra run under
+``python -X importtime`` lists the slowest imports and fails the check if
+any heavy model library (torch, whisperx, pyannote, transformers, TTS...)
+is imported: those belong inside the steps' ``execute``, reached through
+:func:`src.pipeline.registry.get_step` only when the step runs.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --budget 1.0
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# Argument lists after the interpreter
+SCENARIOS = {
+    "cli --help": ["-m", "src.main", "--help"],
+    # Everything `--steps merge` imports before the step reads its inputs
+    "cli --steps merge": ["-c", "import src.main; from src.pipeline.registry import get_step; "
+                                "get_step('merge')"],
+    "api boot": ["-c", "import src.api.app"],
+}
+
+HEAVY_MODULES = {"torch", "torchaudio", "whisperx", "pyannote", "transformers", "TTS",
+                 "ctranslate2", "librosa", "speechbrain", "lightning"}
+
+
+def _wall_seconds(args: list[str]) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, *args], check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+
+def import_times(args: list[str]) -> list[tuple[str, float]]:
+    """(module, cumulative seconds) of every import, from ``-X importtime``."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args],
+                          check=True, capture_output=True, text=True)
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules.append((name.strip(), int(cumulative) / 1e6))
+    return modules
+
+
+def measure(name: str, args: list[str], runs: int) -> dict:
+    _wall_seconds(args)  # warm the bytecode and OS file caches
+    walls = [_wall_seconds(args) for _ in range(runs)]
+    modules = import_times(args)
+    heavy = sorted({m.split(".")[0] for m, _ in modules} & HEAVY_MODULES)
+    top_level = [(m, t) for m, t in modules if "." not in m]
+    slowest = sorted(top_level, key=lambda mt: mt[1], reverse=True)[:5]
+    return {
+        "scenario": name,
+        "median_seconds": round(statistics.median(walls), 3),
+        "max_seconds": round(max(walls), 3),
+        "heavy_imports": heavy,
+        "slowest_imports": [{"module": m, "seconds": round(t, 3)} for m, t in slowest],
+    }
+
+
+@click.command()
+@click.option("--runs", default=5, help="Interpreter starts per scenario")
+@click.option("--budget", default=1.0, help="Maximum median wall seconds per scenario")
+@click.option("--output", type=click.Path(), default=None, help="Write results as JSON")
+def main(runs: int, budget: float, output: str | None):
+    """Check that CLI and API startup stay within the import-time budget."""
+    baseline = _wall_seconds(["-c", "pass"])
+    results = [measure(name, args, runs) for name, args in SCENARIOS.items()]
+
+    table = Table(title=f"Startup (bare interpreter {baseline:.3f}s, budget {budget:.2f}s)")
+    for col in ("scenario", "median s", "max s", "heavy imports", "slowest imports"):
+        table.add_column(col)
+    failures = 0
+    for r in results:
+        over = r["median_seconds"] > budget or r["heavy_imports"]
+        failures += bool(over)
+        style = "red" if over else "green"
+        table.add_row(
+            f"[{style}]{r['scenario']}[/{style}]",
+            f"{r['median_seconds']:.3f}", f"{r['max_seconds']:.3f}",
+            ", ".join(r["heavy_imports"]) or "-",
+            ", ".join(f"{s['module']} {s['seconds']:.2f}" for s in r["slowest_imports"]),
+        )
+    console.print(table)
+
+    if output:
+        Path(output).write_text(json.dumps({"budget": budget, "results": results}, indent=2))
+        console.print(f"Results written to {output}")
+
+    if failures:
+        console.print(f"[red]{failures} scenario(s) over budget or importing model libraries[/red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
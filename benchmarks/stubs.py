@@ -0,0 +1,212 @@
+"""Offline stand-ins for the model libraries used by the pipeline steps.
+
+:func:`install` registers fake ``whisperx``, ``pyannote.audio``,
+``transformers``, ``TTS.api`` and ``huggingface_hub`` modules in
+``sys.modules``, so the real step code runs end to end on CPU with no
+downloads.  The stubs answer with the synthetic transcript they were
+installed with and cost next to nothing, which leaves the timings to the
+code around the models: I/O, merging, reference clips, stretching and
+mixing.  torch itself is not stubbed; the steps need a (CPU) install.
+
+Only benchmark processes should call :func:`install`: it shadows the
+real libraries for the rest of the process.
+"""
+
+from __future__ import annotations
+
+import sys
+import types
+import zlib
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks import synth
+
+WHISPER_SAMPLE_RATE = 16000
+XTTS_SAMPLE_RATE = 24000
+SPEAKER_EMBEDDING_DIM = 256
+
+
+# ── whisperx ────────────────────────────────────────────────────────────
+
+class _WhisperModel:
+    def __init__(self, segments: list[dict]):
+        self._segments = segments
+
+    def transcribe(self, audio, batch_size: int = 8, **kwargs) -> dict:
+        return {"segments": [dict(s) for s in self._segments], "language": "en"}
+
+
+def _align(segments: list[dict], model, metadata, audio, device=None, **kwargs) -> dict:
+    """Spread each segment's words evenly over the segment."""
+    aligned, word_segments = [], []
+    for seg in segments:
+        words = seg["text"].split()
+        step = (seg["end"] - seg["start"]) / max(1, len(words))
+        seg_words = [
+            {"word": w, "start": round(seg["start"] + i * step, 3),
+             "end": round(seg["start"] + (i + 1) * step, 3), "score": 0.9}
+            for i, w in enumerate(words)
+        ]
+        aligned.append({**seg, "words": seg_words})
+        word_segments.extend(seg_words)
+    return {"segments": aligned, "word_segments": word_segments}
+
+
+def _load_audio(path: str, sr: int = WHISPER_SAMPLE_RATE):
+    audio, file_sr = sf.read(path, dtype="float32")
+    if file_sr != sr:
+        raise ValueError(f"stub whisperx.load_audio expects {sr} Hz input, got {file_sr}")
+    return audio if audio.ndim == 1 else audio.mean(axis=1)
+
+
+def _whisperx(segments: list[dict]) -> types.ModuleType:
+    mod = types.ModuleType("whisperx")
+    mod.audio = types.SimpleNamespace(SAMPLE_RATE=WHISPER_SAMPLE_RATE)
+    mod.load_model = lambda *args, **kwargs: _WhisperModel(segments)
+    mod.load_audio = _load_audio
+    mod.load_align_model = lambda *args, **kwargs: (object(), {})
+    mod.align = _align
+    return mod
+
+
+# ── pyannote.audio ──────────────────────────────────────────────────────
+
+class _Segment:
+    def __init__(self, start: float, end: float):
+        self.start, self.end = start, end
+
+
+class _Annotation:
+    def __init__(self, turns: list[dict]):
+        self._turns = turns
+
+    def itertracks(self, yield_label: bool = False):
+        for i, turn in enumerate(self._turns):
+            segment = _Segment(turn["start"], turn["end"])
+            yield (segment, i, turn["speaker"]) if yield_label else (segment, i)
+
+    def labels(self) -> list[str]:
+        return sorted({turn["speaker"] for turn in self._turns})
+
+    def write_rttm(self, f):
+        for turn in self._turns:
+            f.write(f"SPEAKER audio 1 {turn['start']:.3f} {turn['end'] - turn['start']:.3f} "
+                    f"<NA> <NA> {turn['speaker']} <NA> <NA>\n")
+
+
+class _DiarizationPipeline:
+    turns: list[dict] = []
+
+    @classmethod
+    def from_pretrained(cls, *args, **kwargs) -> "_DiarizationPipeline":
+        return cls()
+
+    def to(self, device) -> "_DiarizationPipeline":
+        return self
+
+    def apply(self, file, return_embeddings: bool = False, **params):
+        """Like pyannote 3.x: ``(annotation, embeddings)`` when asked for embeddings."""
+        annotation = _Annotation(self.turns)
+        if not return_embeddings:
+            return annotation
+        # A fixed vector per speaker, so window stitching and library matching agree
+        embeddings = np.stack([
+            np.random.default_rng(zlib.crc32(label.encode())).standard_normal(SPEAKER_EMBEDDING_DIM)
+            for label in annotation.labels()
+        ]) if self.turns else np.zeros((0, SPEAKER_EMBEDDING_DIM))
+        return annotation, embeddings
+
+    def __call__(self, audio_input, **params):
+        return self.apply(audio_input, **params)
+
+
+# ── transformers (NLLB) ─────────────────────────────────────────────────
+
+def pseudo_spanish(text: str) -> str:
+    """Deterministic "translation" about 10% longer than the source, like EN→ES."""
+    return " ".join(w + "o" if len(w) > 3 and w[-1].isalpha() else w for w in text.split())
+
+
+class _Ids(list):
+    def to(self, device) -> "_Ids":
+        return self
+
+
+class _Tokenizer:
+    src_lang = "eng_Latn"
+
+    def __call__(self, text: str, **kwargs) -> dict:
+        return {"input_ids": _Ids([text])}
+
+    def convert_tokens_to_ids(self, token: str) -> int:
+        return 0
+
+    def batch_decode(self, generated, **kwargs) -> list[str]:
+        return list(generated)
+
+
+class _Seq2Seq:
+    def to(self, device) -> "_Seq2Seq":
+        return self
+
+    def eval(self) -> "_Seq2Seq":
+        return self
+
+    def generate(self, input_ids, **kwargs) -> list[str]:
+        return [pseudo_spanish(text) for text in input_ids]
+
+
+def _transformers() -> types.ModuleType:
+    mod = types.ModuleType("transformers")
+    mod.AutoTokenizer = types.SimpleNamespace(from_pretrained=lambda *a, **k: _Tokenizer())
+    mod.AutoModelForSeq2SeqLM = types.SimpleNamespace(from_pretrained=lambda *a, **k: _Seq2Seq())
+    return mod
+
+
+# ── TTS (XTTS v2) ───────────────────────────────────────────────────────
+
+class _TTS:
+    def __init__(self, *args, **kwargs):
+        self._calls = 0
+
+    def to(self, device) -> "_TTS":
+        return self
+
+    def tts_to_file(self, text: str, file_path: str, **kwargs):
+        self._calls += 1
+        synth.write_tts_wav(file_path, text, sr=XTTS_SAMPLE_RATE, seed=self._calls)
+
+
+# ── install ─────────────────────────────────────────────────────────────
+
+def install(transcript: list[dict], seed: int = 0):
+    """Register the stub modules, serving *transcript* as the model output.
+
+    May be called again with another transcript (e.g. for the next scale).
+    """
+    _DiarizationPipeline.turns = synth.diarization_turns(transcript, seed)
+
+    pyannote = types.ModuleType("pyannote")
+    pyannote_audio = types.ModuleType("pyannote.audio")
+    pyannote_audio.Pipeline = _DiarizationPipeline
+    pyannote.audio = pyannote_audio
+
+    tts = types.ModuleType("TTS")
+    tts_api = types.ModuleType("TTS.api")
+    tts_api.TTS = _TTS
+    tts.api = tts_api
+
+    hub = types.ModuleType("huggingface_hub")
+    hub.login = lambda *args, **kwargs: None
+
+    sys.modules.update({
+        "whisperx": _whisperx(synth.asr_segments(transcript)),
+        "pyannote": pyannote,
+        "pyannote.audio": pyannote_audio,
+        "transformers": _transformers(),
+        "TTS": tts,
+        "TTS.api": tts_api,
+        "huggingface_hub": hub,
+    })
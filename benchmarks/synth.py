@@ -0,0 +1,140 @@
+"""Synthetic inputs for offline pipeline benchmarks.
+
+A transcript is generated first (timed segments with speaker and English
+text); the audio, the ASR/diarization outputs served by the stub models
+and the fake TTS audio are all derived from it, so every step sees
+mutually consistent data at any length.
+"""
+
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+WORDS = [
+    "the", "interview", "question", "answer", "really", "think", "people", "because",
+    "actually", "company", "started", "voice", "years", "important", "different",
+    "market", "product", "you", "know", "we", "were", "building", "something", "new",
+    "and", "then", "when", "right", "that", "was", "kind", "of", "hard", "problem",
+]
+
+# Speaking rate of the synthetic speakers.
+WORDS_PER_SECOND = 2.6
+
+
+def make_transcript(seconds: float, segment_seconds: float = 5.0, speakers: int = 2,
+                    seed: int = 0) -> list[dict]:
+    """Timed segments ``{start, end, speaker, text}`` covering *seconds* of audio.
+
+    Segment lengths vary around *segment_seconds* with a few sub-second
+    fragments, and the speaker changes on about a third of the segments.
+    """
+    rng = random.Random(seed)
+    segments = []
+    speaker = 0
+    t = 0.5
+    while True:
+        if rng.random() < 0.08:
+            dur = rng.uniform(0.2, 0.6)
+        else:
+            dur = rng.uniform(0.4, 1.6) * segment_seconds
+        if t + dur > seconds - 0.5:
+            break
+        if rng.random() < 0.35:
+            speaker = (speaker + rng.randrange(1, speakers)) % speakers if speakers > 1 else 0
+        segments.append({
+            "start": round(t, 3),
+            "end": round(t + dur, 3),
+            "speaker": f"SPEAKER_{speaker:02d}",
+            "text": _sentence_text(rng, max(1, round(dur * WORDS_PER_SECOND))),
+        })
+        t += dur + rng.uniform(0.1, 0.9)
+    return segments
+
+
+def _sentence_text(rng: random.Random, n_words: int) -> str:
+    words = []
+    until_stop = rng.randint(6, 16)
+    for i in range(n_words):
+        word = rng.choice(WORDS)
+        until_stop -= 1
+        if i == n_words - 1 or until_stop == 0:
+            word += rng.choice(".?.!")
+            until_stop = rng.randint(6, 16)
+        elif rng.random() < 0.08:
+            word += ","
+        words.append(word)
+    words[0] = words[0].capitalize()
+    return " ".join(words)
+
+
+def asr_segments(transcript: list[dict]) -> list[dict]:
+    """WhisperX ``transcribe`` output (before alignment)."""
+    return [{"start": s["start"], "end": s["end"], "text": " " + s["text"]} for s in transcript]
+
+
+def diarization_turns(transcript: list[dict], seed: int = 0) -> list[dict]:
+    """Speaker turns as pyannote would report them.
+
+    Consecutive segments of one speaker form a turn; boundaries are jittered
+    so turns never line up exactly with the ASR segments.
+    """
+    rng = random.Random(seed + 1)
+    turns: list[dict] = []
+    for seg in transcript:
+        if turns and turns[-1]["speaker"] == seg["speaker"]:
+            turns[-1]["end"] = seg["end"]
+            continue
+        turns.append({"start": seg["start"], "end": seg["end"], "speaker": seg["speaker"]})
+    for turn in turns:
+        turn["start"] = max(0.0, round(turn["start"] + rng.uniform(-0.2, 0.2), 3))
+        turn["end"] = max(turn["start"] + 0.1, round(turn["end"] + rng.uniform(-0.2, 0.2), 3))
+    return turns
+
+
+def speech_like(n_samples: int, sr: int, rng: np.random.Generator,
+                offset: int = 0) -> np.ndarray:
+    """Noise shaped by a ~4 Hz syllable envelope, float32 in [-1, 1]."""
+    t = (np.arange(n_samples) + offset) / sr
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4.0 * t) ** 2
+    voice = np.sin(2 * np.pi * 140.0 * t) * 0.3 + rng.standard_normal(n_samples) * 0.1
+    return (voice * envelope * 0.3).astype(np.float32)
+
+
+def write_audio(path: Path, seconds: float, transcript: list[dict] | None = None,
+                sr: int = 16000, seed: int = 0, chunk_seconds: float = 60.0):
+    """Write a mono 16-bit WAV of *seconds*, in chunks so hours fit in memory.
+
+    With a *transcript*, the gaps between segments are near-silent.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sr)
+    chunk = int(chunk_seconds * sr)
+    spans = [(int(s["start"] * sr), int(s["end"] * sr)) for s in transcript or []]
+    with sf.SoundFile(str(path), "w", samplerate=sr, channels=1, subtype="PCM_16") as f:
+        span_idx = 0
+        for offset in range(0, total, chunk):
+            n = min(chunk, total - offset)
+            audio = speech_like(n, sr, rng, offset)
+            if transcript is not None:
+                mask = np.zeros(n, dtype=bool)
+                while span_idx < len(spans) and spans[span_idx][1] <= offset:
+                    span_idx += 1
+                i = span_idx
+                while i < len(spans) and spans[i][0] < offset + n:
+                    a, b = spans[i]
+                    mask[max(0, a - offset):min(n, b - offset)] = True
+                    i += 1
+                audio[~mask] *= 0.01
+            f.write(audio)
+
+
+def write_tts_wav(path: Path, text: str, sr: int = 24000, chars_per_second: float = 16.0,
+                  seed: int = 0):
+    """Fake synthesized speech whose length follows the text length."""
+    n = max(1, int(len(text) / chars_per_second * sr))
+    audio = speech_like(n, sr, np.random.default_rng(seed))
+    sf.write(str(path), audio, sr)
@@ -0,0 +1,183 @@
+"""Progress fan-out: hundreds of WebSocket subscribers on one job.
+
+Starts the API in a child process together with a thread that plays a
+synthetic pipeline run into ``progress_manager`` (``step_start``, a burst
+of ``step_progress`` events at ``--rate`` per second, ``step_complete``
+and ``pipeline_complete``).  Every event carries its send time, so the
+clients can measure delivery latency.
+
+Three kinds of subscribers connect before the run starts:
+
+* fast clients read as quickly as possible;
+* slow clients sleep ``--slow-ms`` after every message, and should receive
+  fewer, coalesced progress events without delaying the fast ones;
+* late joiners connect halfway through and must see the snapshot (the
+  current step and its latest progress) as their first messages.
+
+Usage:
+    python -m benchmarks.ws_fanout --subscribers 500 --slow 50 --events 2000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import click
+import websockets
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.api_latency import _serve, make_job, percentile, start_server
+
+console = Console()
+
+
+def _play_run(job_id: str, events: int, rate: float, go, halfway):
+    from src.api.progress import progress_manager
+
+    go.wait()
+    progress_manager.broadcast_sync(job_id, {"type": "step_start", "step": "tts",
+                                             "sent_at": time.time()})
+    for i in range(events):
+        progress_manager.broadcast_sync(job_id, {
+            "type": "step_progress", "step": "tts", "current": i + 1, "total": events,
+            "sent_at": time.time(),
+        })
+        if i == events // 2:
+            halfway.set()
+        time.sleep(1.0 / rate)
+    progress_manager.broadcast_sync(job_id, {"type": "step_complete", "step": "tts",
+                                             "sent_at": time.time()})
+    progress_manager.broadcast_sync(job_id, {"type": "pipeline_complete",
+                                             "sent_at": time.time()})
+
+
+def _serve_with_run(data_dir: str, port: int, job_id: str, events: int, rate: float,
+                    go, halfway):
+    threading.Thread(target=_play_run, args=(job_id, events, rate, go, halfway),
+                     daemon=True).start()
+    _serve(data_dir, port)
+
+
+async def _subscriber(url: str, slow_s: float, stats: dict, replayed: int = 0):
+    """Read until pipeline_complete; the first *replayed* messages carry no latency."""
+    latencies: list[float] = []
+    first: list[dict] = []
+    received = 0
+    async with websockets.connect(url, max_queue=None) as ws:
+        stats["connected"] += 1
+        async for raw in ws:
+            msg = json.loads(raw)
+            if msg["type"] in ("ping", "pong"):
+                continue
+            received += 1
+            if len(first) < 2:
+                first.append(msg)
+            if "sent_at" in msg and received > replayed:
+                latencies.append((time.time() - msg["sent_at"]) * 1000)
+            if msg["type"] == "pipeline_complete":
+                break
+            if slow_s:
+                await asyncio.sleep(slow_s)
+    return {"latencies": latencies, "received": received, "first": first}
+
+
+async def _clients(url: str, fast: int, slow: int, late: int, slow_s: float,
+                   go, halfway) -> dict:
+    stats = {"connected": 0}
+    tasks = [asyncio.create_task(_subscriber(url, 0, stats)) for _ in range(fast)]
+    tasks += [asyncio.create_task(_subscriber(url, slow_s, stats)) for _ in range(slow)]
+    while stats["connected"] < fast + slow:
+        await asyncio.sleep(0.05)
+    go.set()
+
+    await asyncio.get_running_loop().run_in_executor(None, halfway.wait)
+    late_tasks = [asyncio.create_task(_subscriber(url, 0, stats, replayed=2))
+                  for _ in range(late)]
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    late_results = await asyncio.gather(*late_tasks, return_exceptions=True)
+    return {
+        "fast": [r for r in results[:fast] if isinstance(r, dict)],
+        "slow": [r for r in results[fast:] if isinstance(r, dict)],
+        "late": [r for r in late_results if isinstance(r, dict)],
+        "failed": sum(isinstance(r, Exception) for r in list(results) + list(late_results)),
+    }
+
+
+def _summarize(name: str, results: list[dict]) -> dict:
+    latencies = [x for r in results for x in r["latencies"]]
+    received = [r["received"] for r in results]
+    return {
+        "kind": name,
+        "clients": len(results),
+        "msgs_min": min(received, default=0),
+        "msgs_max": max(received, default=0),
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+@click.command()
+@click.option("--subscribers", default=500, help="Fast subscribers on the job")
+@click.option("--slow", default=50, help="Slow subscribers on the job")
+@click.option("--late", default=50, help="Subscribers joining halfway through the run")
+@click.option("--slow-ms", default=50.0, help="Per-message delay of slow subscribers")
+@click.option("--events", default=2000, help="step_progress events in the run")
+@click.option("--rate", default=200.0, help="step_progress events per second")
+@click.option("--port", default=8767)
+@click.option("--output", type=click.Path(), default=None, help="Write results as JSON")
+def main(subscribers: int, slow: int, late: int, slow_ms: float, events: int, rate: float,
+         port: int, output: str | None):
+    """Measure progress delivery latency and coalescing with many subscribers."""
+    data_dir = Path(tempfile.mkdtemp(prefix="loro-bench-"))
+    job_id = make_job(data_dir, 10, 1)
+
+    from src.api import storage
+    from src.api.models import JobStatus
+    storage.update_job(job_id, status=JobStatus.processing)
+
+    ctx = multiprocessing.get_context("spawn")
+    go, halfway = ctx.Event(), ctx.Event()
+    server = start_server(data_dir, port, target=_serve_with_run,
+                          args=(job_id, events, rate, go, halfway))
+    try:
+        url = f"ws://127.0.0.1:{port}/api/jobs/{job_id}/ws"
+        raw = asyncio.run(_clients(url, subscribers, slow, late, slow_ms / 1000, go, halfway))
+    finally:
+        server.terminate()
+
+    late_ok = sum(
+        1 for r in raw["late"]
+        if r["first"] and r["first"][0]["type"] == "step_start"
+        and len(r["first"]) > 1 and r["first"][1]["type"] == "step_progress"
+    )
+    rows = [_summarize("fast", raw["fast"]), _summarize("slow", raw["slow"]),
+            _summarize("late", raw["late"])]
+
+    table = Table(title=f"WebSocket fan-out ({events} progress events at {rate:.0f}/s)")
+    for col in ("kind", "clients", "msgs min", "msgs max", "p50 ms", "p99 ms"):
+        table.add_column(col)
+    for r in rows:
+        table.add_row(r["kind"], str(r["clients"]), str(r["msgs_min"]), str(r["msgs_max"]),
+                      f"{r['p50_ms']:.1f}", f"{r['p99_ms']:.1f}")
+    console.print(table)
+    console.print(f"Late joiners that received the snapshot first: {late_ok}/{len(raw['late'])}")
+    console.print(f"Failed connections: {raw['failed']}")
+
+    if output:
+        Path(output).write_text(json.dumps({
+            "params": {"subscribers": subscribers, "slow": slow, "late": late,
+                       "slow_ms": slow_ms, "events": events, "rate": rate},
+            "results": rows, "late_snapshot_ok": late_ok, "failed": raw["failed"],
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
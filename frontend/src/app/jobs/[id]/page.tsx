@@ -2,7 +2,7 @@
 
 import { use } from "react";
 import Link from "next/link";
-import { useJob, useSegments } from "@/hooks/useJob";
+import { useJob } from "@/hooks/useJob";
 import { useWebSocket } from "@/hooks/useWebSocket";
 import { ProcessingView } from "@/components/upload/ProcessingView";
 import { InterviewPlayer } from "@/components/player/InterviewPlayer";
@@ -11,7 +11,6 @@ import { Badge } from "@/components/ui/badge";
 export default function JobDetailPage({ params }: { params: Promise<{ id: string }> }) {
   const { id } = use(params);
   const { job, error, isLoading } = useJob(id);
-  const { segments } = useSegments(job?.status === "completed" ? id : null);
   const isProcessing = !job || job.status === "pending" || job.status === "processing";
   const { messages, isConnected } = useWebSocket(id, isProcessing);
 
@@ -69,7 +68,7 @@ export default function JobDetailPage({ params }: { params: Promise<{ id: string
       )}
 
       {job.status === "completed" && (
-        <InterviewPlayer jobId={id} segments={segments} />
+        <InterviewPlayer jobId={id} />
       )}
 
       {job.status === "failed" && (
@@ -1,28 +1,43 @@
 "use client";
 
-import { useEffect, useRef } from "react";
+import { useCallback, useEffect, useRef } from "react";
 import { Card } from "@/components/ui/card";
 import { useAudioEngine } from "@/hooks/useAudioEngine";
+import { useSegmentWindow } from "@/hooks/useJob";
 import { useSubtitleSync } from "@/hooks/useSubtitleSync";
 import { PlaybackControls } from "./PlaybackControls";
 import { LanguageSwitch } from "./LanguageSwitch";
 import { SubtitlePanel } from "./SubtitlePanel";
-import { getAudioUrl } from "@/lib/api";
-import type { Segment } from "@/lib/types";
+import { getAudioUrl, mapTimeOnServer } from "@/lib/api";
+import type { AudioVariant, Language, Segment } from "@/lib/types";
 
 interface Props {
   jobId: string;
-  segments: Segment[];
 }
 
-export function InterviewPlayer({ jobId, segments }: Props) {
-  const originalUrl = getAudioUrl(jobId, "original");
-  const translatedUrl = getAudioUrl(jobId, "translated");
+// Data-saver clients stream the 32 kbps Opus encode instead of the source file.
+function preferredVariant(): AudioVariant | undefined {
+  if (typeof navigator === "undefined") return undefined;
+  const conn = (navigator as Navigator & { connection?: { saveData?: boolean } }).connection;
+  return conn?.saveData ? "opus32" : undefined;
+}
+
+export function InterviewPlayer({ jobId }: Props) {
+  const variant = preferredVariant();
+  const originalUrl = getAudioUrl(jobId, "original", variant);
+  const translatedUrl = getAudioUrl(jobId, "translated", variant);
 
-  const segmentsRef = useRef<Segment[]>(segments);
+  // Segments around the playhead only; language switches map positions
+  // on the server, with this window as the offline fallback.
+  const segmentsRef = useRef<Segment[]>([]);
+  const mapOnServer = useCallback(
+    (time: number, from: Language, to: Language) => mapTimeOnServer(jobId, time, from, to),
+    [jobId],
+  );
+  const engine = useAudioEngine(originalUrl, translatedUrl, segmentsRef, mapOnServer);
+  const { segments } = useSegmentWindow(jobId, engine.currentTime, engine.language);
   segmentsRef.current = segments;
 
-  const engine = useAudioEngine(originalUrl, translatedUrl, segmentsRef);
   const activeIndex = useSubtitleSync(segments, engine.currentTime, engine.language);
 
   // Keyboard shortcuts
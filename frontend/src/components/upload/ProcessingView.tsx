@@ -112,6 +112,14 @@ function PendingDot() {
   return <div className="h-2 w-2 rounded-full bg-gray-300 mx-auto" />;
 }
 
+function formatEta(seconds: number): string {
+  if (seconds < 60) return "menos de un minuto restante";
+  const minutes = Math.round(seconds / 60);
+  if (minutes < 60) return `~${minutes} min restantes`;
+  const hours = Math.floor(minutes / 60);
+  return `~${hours} h ${minutes % 60} min restantes`;
+}
+
 export function ProcessingView({ messages, isConnected }: Props) {
   // Dynamically prepend "download" step if the backend emits it
   const hasDownloadStep = messages.some((m) => m.step === "download");
@@ -151,6 +159,7 @@ export function ProcessingView({ messages, isConnected }: Props) {
   const pipelineComplete = messages.some((m) => m.type === "pipeline_complete");
   const pipelineError = messages.find((m) => m.type === "error" && !m.step);
   const activeStep = steps.find((s) => stepStates[s]?.status === "running");
+  const etaSeconds = [...messages].reverse().find((m) => m.eta_seconds != null)?.eta_seconds;
 
   return (
     <Card className="p-6 max-w-xl mx-auto">
@@ -181,7 +190,10 @@ export function ProcessingView({ messages, isConnected }: Props) {
                 : "Procesando entrevista..."}
           </h2>
           {activeStep && !pipelineComplete && (
-            <p className="text-sm text-gray-500">{STEP_LABELS[activeStep]}</p>
+            <p className="text-sm text-gray-500">
+              {STEP_LABELS[activeStep]}
+              {etaSeconds != null && !pipelineError && ` · ${formatEta(etaSeconds)}`}
+            </p>
           )}
         </div>
       </div>
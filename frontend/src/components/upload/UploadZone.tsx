@@ -1,11 +1,12 @@
 "use client";
 
-import { useState, useCallback } from "react";
+import { useState, useCallback, useEffect } from "react";
 import { useRouter } from "next/navigation";
 import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
-import { createJob, createJobFromYouTube } from "@/lib/api";
+import { createJob, createJobFromYouTube, fetchPresets } from "@/lib/api";
+import type { Preset } from "@/lib/types";
 
 const YT_RE = /^(https?:\/\/)?(www\.)?(youtube\.com\/(watch\?v=|shorts\/)|youtu\.be\/)[\w-]{11}/;
 
@@ -15,10 +16,21 @@ export function UploadZone() {
   const [file, setFile] = useState<File | null>(null);
   const [youtubeUrl, setYoutubeUrl] = useState("");
   const [maxSpeakers, setMaxSpeakers] = useState(2);
+  const [presets, setPresets] = useState<Preset[]>([]);
+  const [preset, setPreset] = useState("");
   const [uploading, setUploading] = useState(false);
   const [dragOver, setDragOver] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
+  useEffect(() => {
+    fetchPresets()
+      .then((list) => {
+        setPresets(list);
+        setPreset(list.find((p) => p.default)?.name ?? "");
+      })
+      .catch(() => setPresets([]));
+  }, []);
+
   const isYouTubeValid = YT_RE.test(youtubeUrl);
   const canSubmit = mode === "file" ? !!file : isYouTubeValid;
 
@@ -49,8 +61,8 @@ export function UploadZone() {
     try {
       const job =
         mode === "youtube"
-          ? await createJobFromYouTube(youtubeUrl, maxSpeakers)
-          : await createJob(file!, maxSpeakers);
+          ? await createJobFromYouTube(youtubeUrl, maxSpeakers, preset)
+          : await createJob(file!, maxSpeakers, preset);
       router.push(`/jobs/${job.id}`);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Error al procesar la solicitud");
@@ -170,6 +182,25 @@ export function UploadZone() {
               className="w-20"
             />
           </div>
+          {presets.length > 0 && (
+            <div className="flex items-center gap-4">
+              <label className="text-sm font-medium text-gray-700 whitespace-nowrap">
+                Calidad:
+              </label>
+              <select
+                value={preset}
+                onChange={(e) => setPreset(e.target.value)}
+                className="h-9 flex-1 rounded-md border border-gray-300 bg-white px-2 text-sm"
+              >
+                {!presets.some((p) => p.default) && <option value="">Predeterminada</option>}
+                {presets.map((p) => (
+                  <option key={p.name} value={p.name} title={p.description}>
+                    {p.name}
+                  </option>
+                ))}
+              </select>
+            </div>
+          )}
           <Button onClick={handleSubmit} disabled={uploading} className="w-full">
             {uploading ? (
               <span className="flex items-center gap-2">
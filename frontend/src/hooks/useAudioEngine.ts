@@ -16,6 +16,7 @@ export function useAudioEngine(
   originalUrl: string | null,
   translatedUrl: string | null,
   segmentsRef: RefObject<Segment[]>,
+  mapOnServer?: (time: number, from: Language, to: Language) => Promise<number>,
 ) {
   const audioENRef = useRef<HTMLAudioElement | null>(null);
   const audioESRef = useRef<HTMLAudioElement | null>(null);
@@ -128,7 +129,7 @@ export function useAudioEngine(
     setState((s) => ({ ...s, currentTime: time }));
   }, []);
 
-  const switchLanguage = useCallback((lang: Language) => {
+  const switchLanguage = useCallback(async (lang: Language) => {
     const en = audioENRef.current;
     const es = audioESRef.current;
     if (!en || !es) return;
@@ -141,8 +142,16 @@ export function useAudioEngine(
     const newActive = lang === "en" ? en : es;
     const currentPos = active.currentTime;
 
-    // Map position to new timeline
-    const mappedPos = mapTime(currentPos, currentLang, lang, segments);
+    // Map position to new timeline: ask the server (full timeline index),
+    // fall back to the locally loaded segment window.
+    let mappedPos: number;
+    try {
+      if (!mapOnServer) throw new Error("no server mapping");
+      mappedPos = await mapOnServer(currentPos, currentLang, lang);
+    } catch {
+      mappedPos = mapTime(currentPos, currentLang, lang, segments);
+    }
+    if (langRef.current !== currentLang) return; // superseded by another switch
 
     // Switch tracks
     active.pause();
@@ -163,7 +172,7 @@ export function useAudioEngine(
       currentTime: mappedPos,
       duration: newDuration || s.duration,
     }));
-  }, [segmentsRef, state.volume, state.isPlaying]);
+  }, [segmentsRef, mapOnServer, state.volume, state.isPlaying]);
 
   const setVolume = useCallback((vol: number) => {
     const active = langRef.current === "en" ? audioENRef.current : audioESRef.current;
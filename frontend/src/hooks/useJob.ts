@@ -1,8 +1,9 @@
 "use client";
 
 import useSWR from "swr";
-import { API_URL } from "@/lib/constants";
-import type { Job, Segment } from "@/lib/types";
+import { API_URL, SEGMENT_WINDOW_SPAN, SEGMENT_WINDOW_STEP } from "@/lib/constants";
+import { getSegmentsUrl } from "@/lib/api";
+import type { Job, Language, Segment } from "@/lib/types";
 
 const fetcher = async (url: string) => {
   const r = await fetch(url);
@@ -51,3 +52,26 @@ export function useSegments(jobId: string | null) {
   );
   return { segments: data || [], error, isLoading: !data && !error };
 }
+
+/**
+ * Fetch only the segments around `time` on the `language` timeline.
+ *
+ * The window starts one step before the playhead and is snapped to
+ * SEGMENT_WINDOW_STEP, so the URL (and the HTTP cache entry) only changes
+ * when playback crosses a step boundary.
+ */
+export function useSegmentWindow(jobId: string | null, time: number, language: Language) {
+  const from = Math.max(0, (Math.floor(time / SEGMENT_WINDOW_STEP) - 1) * SEGMENT_WINDOW_STEP);
+  const to = from + SEGMENT_WINDOW_SPAN;
+  const { data, error } = useSWR<Segment[]>(
+    jobId ? getSegmentsUrl(jobId, { from, to, track: language }) : null,
+    fetcher,
+    {
+      keepPreviousData: true,
+      revalidateOnFocus: false,
+      errorRetryCount: 3,
+      shouldRetryOnError: true,
+    }
+  );
+  return { segments: data || [], error, isLoading: !data && !error };
+}
@@ -16,7 +16,11 @@ export function useWebSocket(jobId: string | null, enabled: boolean = true) {
     const ws = new WebSocket(getWebSocketUrl(jobId));
     wsRef.current = ws;
 
-    ws.onopen = () => setIsConnected(true);
+    ws.onopen = () => {
+      // The server replays the job's current state on every (re)connect
+      setMessages([]);
+      setIsConnected(true);
+    };
     ws.onclose = () => {
       setIsConnected(false);
       if (enabled) {
@@ -27,7 +31,15 @@ export function useWebSocket(jobId: string | null, enabled: boolean = true) {
     ws.onmessage = (event) => {
       try {
         const msg: WSMessage = JSON.parse(event.data);
-        setMessages((prev) => [...prev, msg]);
+        if (msg.type === "ping" || msg.type === "pong") return;
+        setMessages((prev) => {
+          // Only the latest progress of a step matters
+          const last = prev[prev.length - 1];
+          if (msg.type === "step_progress" && last?.type === "step_progress" && last.step === msg.step) {
+            return [...prev.slice(0, -1), msg];
+          }
+          return [...prev, msg];
+        });
       } catch {
         // ignore malformed messages
       }
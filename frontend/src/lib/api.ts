@@ -1,10 +1,15 @@
 import { API_URL } from "./constants";
-import type { Job, Segment } from "./types";
+import type { AudioVariant, Job, PeaksInfo, Preset, Segment, TimeMapping } from "./types";
 
-export async function createJob(file: File, maxSpeakers: number = 2): Promise<Job> {
+export async function createJob(
+  file: File,
+  maxSpeakers: number = 2,
+  preset?: string,
+): Promise<Job> {
   const formData = new FormData();
   formData.append("file", file);
   formData.append("max_speakers", String(maxSpeakers));
+  if (preset) formData.append("preset", preset);
 
   let res: Response;
   try {
@@ -25,13 +30,17 @@ export async function createJob(file: File, maxSpeakers: number = 2): Promise<Jo
   return res.json();
 }
 
-export async function createJobFromYouTube(url: string, maxSpeakers: number = 2): Promise<Job> {
+export async function createJobFromYouTube(
+  url: string,
+  maxSpeakers: number = 2,
+  preset?: string,
+): Promise<Job> {
   let res: Response;
   try {
     res = await fetch(`${API_URL}/api/jobs/youtube`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ url, max_speakers: maxSpeakers }),
+      body: JSON.stringify({ url, max_speakers: maxSpeakers, preset: preset || null }),
     });
   } catch {
     throw new Error(
@@ -75,8 +84,66 @@ export async function fetchSegments(id: string): Promise<Segment[]> {
   return res.json();
 }
 
-export function getAudioUrl(jobId: string, track: "original" | "translated"): string {
-  return `${API_URL}/api/jobs/${jobId}/audio/${track}`;
+export function getSegmentsUrl(
+  jobId: string,
+  window?: { from: number; to: number; track: "en" | "es" },
+): string {
+  const base = `${API_URL}/api/jobs/${jobId}/segments`;
+  if (!window) return base;
+  const params = new URLSearchParams({
+    from: String(window.from),
+    to: String(window.to),
+    track: window.track,
+  });
+  return `${base}?${params}`;
+}
+
+export async function mapTimeOnServer(
+  jobId: string,
+  time: number,
+  from: "en" | "es",
+  to: "en" | "es",
+): Promise<number> {
+  const params = new URLSearchParams({ t: String(time), from, to });
+  const res = await fetch(`${API_URL}/api/jobs/${jobId}/timeline/map?${params}`);
+  if (!res.ok) throw new Error("Failed to map time");
+  const data: TimeMapping = await res.json();
+  return data.times[0];
+}
+
+export async function fetchPresets(): Promise<Preset[]> {
+  const res = await fetch(`${API_URL}/api/presets`);
+  if (!res.ok) throw new Error("Failed to fetch presets");
+  return res.json();
+}
+
+export async function fetchPeaksInfo(
+  jobId: string,
+  track: "original" | "translated",
+): Promise<PeaksInfo> {
+  const res = await fetch(`${API_URL}/api/jobs/${jobId}/peaks/${track}`);
+  if (!res.ok) throw new Error("Failed to fetch peaks info");
+  return res.json();
+}
+
+/** Interleaved int8 (min, max) pairs per bin; 127 = full scale. */
+export async function fetchPeaks(
+  jobId: string,
+  track: "original" | "translated",
+  samplesPerBin: number,
+): Promise<Int8Array> {
+  const res = await fetch(`${API_URL}/api/jobs/${jobId}/peaks/${track}?zoom=${samplesPerBin}`);
+  if (!res.ok) throw new Error("Failed to fetch peaks");
+  return new Int8Array(await res.arrayBuffer());
+}
+
+export function getAudioUrl(
+  jobId: string,
+  track: "original" | "translated",
+  variant?: AudioVariant,
+): string {
+  const url = `${API_URL}/api/jobs/${jobId}/audio/${track}`;
+  return variant ? `${url}?variant=${variant}` : url;
 }
 
 export function getWebSocketUrl(jobId: string): string {
@@ -17,6 +17,11 @@ export const STEP_LABELS: Record<string, string> = {
   render: "Renderizado de audio",
 };
 
+// Subtitle window fetched around the playhead (seconds). Window bounds are
+// snapped to SEGMENT_WINDOW_STEP so nearby positions share one cached URL.
+export const SEGMENT_WINDOW_STEP = 300;
+export const SEGMENT_WINDOW_SPAN = 900;
+
 export const PIPELINE_STEPS = ["asr", "diarize", "merge", "translate", "tts", "render"];
 
 export function getSpeakerColor(speaker: string) {
@@ -7,6 +7,8 @@ export interface Job {
   current_step: string | null;
   created_at: string;
   error: string | null;
+  preset: string | null;
+  eta_seconds: number | null;
 }
 
 export interface Segment {
@@ -23,10 +25,43 @@ export interface Segment {
 
 export type Language = "en" | "es";
 
+export interface TimeMapping {
+  from_track: Language;
+  to_track: Language;
+  times: number[];
+  duration_en: number | null;
+  duration_es: number | null;
+}
+
+// "source" is the uploaded/rendered file; opusNN are low-bandwidth encodes.
+export type AudioVariant = "source" | "opus32" | "opus64";
+
+export interface Preset {
+  name: string;
+  description: string;
+  default: boolean;
+}
+
+export interface PeaksInfo {
+  track: "original" | "translated";
+  sample_rate: number;
+  samples: number;
+  levels: Record<string, number>; // samples per bin -> number of bins
+}
+
 export interface WSMessage {
-  type: "step_start" | "step_progress" | "step_complete" | "pipeline_complete" | "error";
+  type:
+    | "step_start"
+    | "step_progress"
+    | "step_complete"
+    | "step_skipped"
+    | "pipeline_complete"
+    | "error"
+    | "ping"
+    | "pong";
   step?: string;
   current?: number;
   total?: number;
   message?: string;
+  eta_seconds?: number | null;
 }
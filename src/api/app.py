@@ -7,15 +7,25 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from src.api.models import Job, JobStatus
+from src.api.offload import get_job, load_config
 from src.api.progress import progress_manager
-from src.api.routes import audio, jobs, segments
+from src.api.readiness import readiness, start_warmup
+from src.api.routes import audio, jobs, metrics, peaks, presets, segments, timeline
+from src.config import apply_preset
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Store the event loop so the worker thread can schedule coroutines."""
+    """Store the event loop for worker threads and start warming up the models.
+
+    The warm-up runs in the background; ``/api/ready`` reports when it is done.
+    """
     progress_manager.set_loop(asyncio.get_running_loop())
+    # Warm the models jobs without an explicit preset use
+    start_warmup(apply_preset(await load_config("configs/default.yaml")))
     yield
 
 
@@ -38,17 +48,36 @@ app.add_middleware(
 app.include_router(jobs.router)
 app.include_router(audio.router)
 app.include_router(segments.router)
+app.include_router(timeline.router)
+app.include_router(peaks.router)
+app.include_router(metrics.router)
+app.include_router(presets.router)
+
+
+def _snapshot_from_job(job: Job) -> list[dict]:
+    """Best-effort progress snapshot for jobs not seen by this process."""
+    if job.status == JobStatus.completed:
+        return [{"type": "pipeline_complete"}]
+    if job.status == JobStatus.failed:
+        return [{"type": "error", "message": (job.error or "").split("\n", 1)[0]}]
+    if job.status == JobStatus.processing and job.current_step:
+        return [{"type": "step_start", "step": job.current_step}]
+    return []
 
 
 # WebSocket for pipeline progress
 @app.websocket("/api/jobs/{job_id}/ws")
 async def websocket_progress(websocket: WebSocket, job_id: str):
+    if not progress_manager.has_snapshot(job_id):
+        job = await get_job(job_id)
+        if job is not None:
+            progress_manager.seed(job_id, _snapshot_from_job(job))
     await progress_manager.connect(job_id, websocket)
     try:
-        # Keep connection alive; client doesn't need to send anything,
-        # but we read to detect disconnects.
+        # Clients may send "ping" heartbeats; reading also detects disconnects.
         while True:
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            progress_manager.handle_client_message(job_id, websocket, text)
     except WebSocketDisconnect:
         pass
     finally:
@@ -58,3 +87,10 @@ async def websocket_progress(websocket: WebSocket, job_id: str):
 @app.get("/api/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/api/ready")
+async def ready():
+    """503 until the startup warm-up has loaded every configured model."""
+    snapshot = readiness.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
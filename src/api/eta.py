@@ -0,0 +1,311 @@
+"""Job duration estimates fitted on the timings of past runs.
+
+Each step's wall time is modelled as proportional to one input feature:
+
+    asr, diarize, render  ->  seconds of input audio
+    merge                 ->  ASR transcript segments
+    translate             ->  English characters
+    tts                   ->  Spanish characters
+
+The rate (seconds per unit) is the ratio of sums over the step's recent
+history on the same device, which is the least-squares fit of a line
+through the origin weighted by size.  Features not known yet (characters
+before ASR has run) are extrapolated from the audio duration with ratios
+learned the same way.  Steps without history fall back to rough CPU
+priors, so the first estimates are coarse and improve with every job.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.api import storage
+from src.utils.artifacts import artifact_exists, read_artifact
+
+STEP_FEATURE = {
+    "asr": "audio_seconds",
+    "diarize": "audio_seconds",
+    "merge": "segments",
+    "translate": "chars_en",
+    "tts": "chars_es",
+    "render": "audio_seconds",
+}
+
+# Device-bound component of each step (see src/device.py); others run on CPU.
+STEP_COMPONENT = {
+    "asr": "asr",
+    "diarize": "diarization",
+    "translate": "translation",
+    "tts": "tts",
+}
+
+# Cold-start seconds of work per feature unit on CPU, used until a step has
+# history.  Deliberately on the slow side.
+PRIOR_SECONDS_PER_UNIT = {
+    "asr": 0.5,
+    "diarize": 0.3,
+    "merge": 0.001,
+    "translate": 0.02,
+    "tts": 0.1,
+    "render": 0.05,
+}
+
+# Cold-start feature units per second of input audio.
+PRIOR_UNITS_PER_AUDIO_SECOND = {
+    "audio_seconds": 1.0,
+    "segments": 0.2,
+    "chars_en": 14.0,
+    "chars_es": 15.0,
+}
+
+# Past runs per step the model is fitted on.
+HISTORY_WINDOW = 50
+
+# Progress events persist the estimate on the job at most this often.
+PERSIST_INTERVAL = 15.0
+
+
+class EtaModel:
+    """Per-step throughput and feature ratios fitted on timing history."""
+
+    def __init__(self, rows: list[dict]):
+        self._rates: dict[tuple[str, str | None], list[float]] = {}
+        self._ratios: dict[str, list[float]] = {}
+        self.last_device: dict[str, str] = {}
+
+        for row in rows:
+            step, features = row["step"], row["features"]
+            units = features.get(STEP_FEATURE.get(step, ""))
+            if units:
+                for key in ((step, row["device"]), (step, None)):
+                    acc = self._rates.setdefault(key, [0.0, 0.0])
+                    acc[0] += row["seconds"]
+                    acc[1] += units
+            audio = features.get("audio_seconds")
+            if audio:
+                for feature, value in features.items():
+                    acc = self._ratios.setdefault(feature, [0.0, 0.0])
+                    acc[0] += value
+                    acc[1] += audio
+            self.last_device[step] = row["device"]
+
+    def seconds_per_unit(self, step: str, device: str | None = None) -> float:
+        for key in ((step, device), (step, None)):
+            acc = self._rates.get(key)
+            if acc and acc[1] > 0:
+                return acc[0] / acc[1]
+        return PRIOR_SECONDS_PER_UNIT[step]
+
+    def units_per_audio_second(self, feature: str) -> float:
+        acc = self._ratios.get(feature)
+        if acc and acc[1] > 0:
+            return acc[0] / acc[1]
+        return PRIOR_UNITS_PER_AUDIO_SECOND[feature]
+
+    def predict_step(self, step: str, features: dict, device: str | None = None) -> float | None:
+        """Predicted wall seconds of *step*, or None without enough input."""
+        feature = STEP_FEATURE[step]
+        units = features.get(feature)
+        if units is None:
+            audio = features.get("audio_seconds")
+            if audio is None:
+                return None
+            units = audio * self.units_per_audio_second(feature)
+        if device is None:
+            device = self.last_device.get(step)
+        return units * self.seconds_per_unit(step, device)
+
+    def predict(self, steps: list[str], features: dict,
+                devices: dict[str, str] | None = None) -> float | None:
+        """Predicted wall seconds of running all *steps*."""
+        total = 0.0
+        for step in steps:
+            seconds = self.predict_step(step, features, (devices or {}).get(step))
+            if seconds is None:
+                return None
+            total += seconds
+        return total
+
+
+_model: EtaModel | None = None
+_model_lock = threading.Lock()
+
+
+def get_model() -> EtaModel:
+    """The fitted model, refitted after new timings are recorded."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = EtaModel(storage.recent_step_timings(HISTORY_WINDOW))
+        return _model
+
+
+def record_timing(job_id: str, step: str, device: str, seconds: float, features: dict):
+    global _model
+    storage.record_step_timing(job_id, step, device, seconds, features)
+    with _model_lock:
+        _model = None
+
+
+def step_device(step: str, config: dict) -> str:
+    """Where *step* runs, qualified by the preset since presets swap models."""
+    component = STEP_COMPONENT.get(step)
+    if component is None:
+        return "cpu"
+    try:
+        from src.device import get_device_str
+
+        device = get_device_str(component, config.get("devices", {}).get(component, "auto"))
+    except Exception:
+        device = "unknown"
+    preset = config.get("preset")
+    return f"{device}/{preset}" if preset else device
+
+
+def _read(path: Path, bus) -> dict | None:
+    """*path*'s artifact, from the run's bus while its write may still be pending."""
+    if bus is not None:
+        data = bus.get(path)
+        if data is not None:
+            return data
+        bus.wait(path)
+    return read_artifact(path) if artifact_exists(path) else None
+
+
+def measure_features(workdir: Path, features: dict, bus=None) -> dict:
+    """Add transcript sizes from the artifacts present in *workdir* (or on *bus*).
+
+    Merge and translate are sized by the ASR transcript they consume, so
+    their features are known before they run.
+    """
+    if "segments" not in features:
+        asr = _read(workdir / "asr.json", bus)
+        if asr is not None:
+            features["segments"] = len(asr["segments"])
+            features["chars_en"] = sum(len(s.get("text", "")) for s in asr["segments"])
+    if "chars_es" not in features:
+        translations = _read(workdir / "translations.json", bus)
+        if translations is not None:
+            features["chars_es"] = sum(len(s.get("text_es", "")) for s in translations["segments"])
+    return features
+
+
+def eta_at(seconds: float | None) -> datetime | None:
+    if seconds is None:
+        return None
+    return datetime.utcnow() + timedelta(seconds=seconds)
+
+
+def eta_seconds(at: datetime | None) -> float | None:
+    """Seconds left until *at*; never negative."""
+    if at is None:
+        return None
+    return round(max(0.0, (at - datetime.utcnow()).total_seconds()))
+
+
+class JobEta:
+    """Tracks one pipeline run: records step timings and predicts the rest.
+
+    Fed every progress event of the run through :meth:`observe`; the
+    estimate combines the model's prediction for the steps still to run
+    with the observed rate of the current step once it reports progress.
+    """
+
+    def __init__(self, job_id: str, workdir: Path, config: dict, bus=None):
+        self.job_id = job_id
+        self.workdir = workdir
+        self.config = config
+        self.bus = bus
+        self.features: dict = {}
+        self.devices: dict[str, str] = {}
+        self.plan: list[str] = []
+        self._step: str | None = None
+        self._started = 0.0
+        self._progress: tuple[int, int] | None = None
+        self._persisted = 0.0
+
+    def set_audio(self, audio_seconds: float | None):
+        if audio_seconds is not None:
+            self.features["audio_seconds"] = audio_seconds
+
+    def set_plan(self, steps: list[str]):
+        """Steps that will actually execute (not skipped)."""
+        self.plan = list(steps)
+        self.devices = {step: step_device(step, self.config) for step in self.plan}
+        measure_features(self.workdir, self.features, self.bus)
+
+    def observe(self, event: dict):
+        etype, step = event.get("type"), event.get("step")
+        if step not in STEP_FEATURE:
+            return
+        if etype == "step_start":
+            self._step, self._started, self._progress = step, time.monotonic(), None
+        elif etype == "step_progress" and step == self._step:
+            self._progress = (event.get("current") or 0, event.get("total") or 0)
+        elif etype == "step_complete" and step == self._step:
+            seconds = time.monotonic() - self._started
+            # Measure first, so the row carries every feature known by now
+            measure_features(self.workdir, self.features, self.bus)
+            record_timing(self.job_id, step, self.devices.get(step, "cpu"), seconds,
+                          dict(self.features))
+            self._step = None
+            if step in self.plan:
+                self.plan.remove(step)
+        elif etype == "step_skipped" and step in self.plan:
+            self.plan.remove(step)
+
+    def remaining(self) -> float | None:
+        """Predicted seconds until the run finishes."""
+        model = get_model()
+        later = [s for s in self.plan if s != self._step]
+        total = model.predict(later, self.features, self.devices)
+        if total is None:
+            return None
+
+        if self._step is not None:
+            predicted = model.predict_step(self._step, self.features, self.devices.get(self._step))
+            elapsed = time.monotonic() - self._started
+            left = max(0.0, predicted - elapsed) if predicted is not None else None
+            if self._progress and self._progress[0] > 0 and self._progress[1] > 0:
+                current, n = self._progress
+                observed = elapsed * (n - current) / current
+                # Trust the observed rate more as the step advances
+                weight = current / n
+                left = observed if left is None else weight * observed + (1 - weight) * left
+            if left is None:
+                return None
+            total += left
+        return round(total)
+
+    def should_persist(self, event: dict) -> bool:
+        if event.get("type") != "step_progress":
+            return True
+        now = time.monotonic()
+        if now - self._persisted >= PERSIST_INTERVAL:
+            self._persisted = now
+            return True
+        return False
+
+
+def predict_job_seconds(audio_seconds: float | None) -> float | None:
+    """Predicted wall time of a full pipeline run for a fresh input."""
+    if audio_seconds is None:
+        return None
+    return get_model().predict(list(STEP_FEATURE), {"audio_seconds": audio_seconds})
+
+
+def backlog_seconds() -> float:
+    """Predicted work left across all pending and processing jobs."""
+    from src.api.models import JobStatus
+
+    total = 0.0
+    for status in (JobStatus.pending, JobStatus.processing):
+        for job in storage.list_jobs(status):
+            left = eta_seconds(job.eta_at)
+            if left is None:
+                left = predict_job_seconds(job.audio_seconds) or 0.0
+            total += left
+    return total
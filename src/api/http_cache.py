@@ -0,0 +1,105 @@
+"""HTTP caching and compression helpers shared by the artifact routes."""
+
+from __future__ import annotations
+
+import gzip
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request
+
+from src.api.metrics import registry
+
+# Bodies smaller than this are sent uncompressed.
+MIN_COMPRESS_BYTES = 1024
+
+
+def make_etag(*parts: object, weak: bool = True) -> str:
+    """Build an ETag from version parts such as mtime and size.
+
+    Use ``weak=False`` for byte-identical representations that must work
+    with ``If-Range`` (which only accepts strong validators).
+    """
+    tag = '"' + "-".join(format(p, "x") if isinstance(p, int) else str(p) for p in parts) + '"'
+    return f"W/{tag}" if weak else tag
+
+
+def cache_headers(etag: str, mtime: float, cache_control: str = "no-cache") -> dict[str, str]:
+    """Validator headers: clients revalidate cheaply with If-None-Match."""
+    return {
+        "ETag": etag,
+        "Last-Modified": formatdate(mtime, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since (RFC 7232 §6 precedence).
+
+    Conditional requests count as ``http_revalidation`` cache lookups.
+    """
+    result = _is_not_modified(request, etag, mtime)
+    if result is not None:
+        registry.cache("http_revalidation", hit=result)
+    return bool(result)
+
+
+def _is_not_modified(request: Request, etag: str, mtime: float) -> bool | None:
+    """None if the request carries no precondition."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: ignore W/ prefixes
+        wanted = etag.removeprefix("W/")
+        return any(t.strip().removeprefix("W/") == wanted for t in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since
+    return None
+
+
+def if_range_matches(request: Request, etag: str, mtime: float) -> bool:
+    """True unless an ``If-Range`` precondition says the client's copy is stale."""
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Strong comparison only
+        return not etag.startswith("W/") and if_range == etag
+    try:
+        return parsedate_to_datetime(if_range).timestamp() == int(mtime)
+    except (TypeError, ValueError):
+        return False
+
+
+def negotiate_encoding(request: Request) -> str | None:
+    """Pick ``br`` (if the optional brotli package is installed) or ``gzip``."""
+    accept = request.headers.get("accept-encoding", "")
+    offered = {
+        token.split(";")[0].strip().lower()
+        for token in accept.split(",")
+        if token.strip() and not token.strip().endswith("q=0")
+    }
+    if "br" in offered:
+        try:
+            import brotli  # noqa: F401
+            return "br"
+        except ImportError:
+            pass
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress *body* with *encoding* (``br`` or ``gzip``)."""
+    if encoding == "br":
+        import brotli
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
@@ -0,0 +1,95 @@
+"""In-process metrics registry rendered in the Prometheus text format.
+
+Counters and gauges are plain dicts keyed by label tuples behind one lock;
+there are only a few dozen series, so this avoids a client library.
+Values derived from state (jobs per status, WebSocket subscribers) are
+collected at scrape time by ``src.api.routes.metrics``.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+
+_METRICS: dict[str, tuple[str, str]] = {
+    "loro_step_runs_total": ("counter", "Pipeline steps executed"),
+    "loro_step_wall_seconds_total": ("counter", "Wall time spent in pipeline steps"),
+    "loro_step_cpu_seconds_total": ("counter", "Process CPU time spent in pipeline steps"),
+    "loro_step_phase_seconds_total": ("counter", "Wall time per pipeline step sub-phase"),
+    "loro_step_peak_rss_bytes": ("gauge", "Peak resident memory during the last run of a step"),
+    "loro_step_gpu_bytes": ("gauge", "GPU memory during the last run of a step"),
+    "loro_step_failures_total": ("counter", "Pipeline steps that raised"),
+    "loro_cache_requests_total": ("counter", "Cache lookups by cache and result (hit/miss)"),
+}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[str, dict[tuple, float]] = {name: {} for name in _METRICS}
+
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[name][key] = value
+
+    def observe_step(self, step: str, metrics: dict):
+        """Fold the ``metrics`` of a completed step into the step series."""
+        self.inc("loro_step_runs_total", step=step)
+        self.inc("loro_step_wall_seconds_total", metrics.get("wall_seconds", 0.0), step=step)
+        self.inc("loro_step_cpu_seconds_total", metrics.get("cpu_seconds", 0.0), step=step)
+        for phase, seconds in metrics.get("phases", {}).items():
+            self.inc("loro_step_phase_seconds_total", seconds, step=step, phase=phase)
+        if metrics.get("peak_rss_bytes") is not None:
+            self.set("loro_step_peak_rss_bytes", metrics["peak_rss_bytes"], step=step)
+        gpu = metrics.get("gpu")
+        if gpu:
+            value = gpu.get("peak_bytes", gpu.get("current_bytes"))
+            if value is not None:
+                self.set("loro_step_gpu_bytes", value, step=step, device=gpu["device"])
+
+    def cache(self, cache: str, hit: bool):
+        self.inc("loro_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    def render(self, extra: list[tuple[str, str, str, dict[tuple, float]]] = ()) -> str:
+        """Exposition text; *extra* adds ``(name, type, help, series)`` families."""
+        with self._lock:
+            families = [
+                (name, kind, help_, dict(self._values[name]))
+                for name, (kind, help_) in _METRICS.items()
+            ]
+        lines = []
+        for name, kind, help_, series in [*families, *extra]:
+            lines.append(f"# HELP {name} {help_}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in series.items():
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Singleton instance
+registry = MetricsRegistry()
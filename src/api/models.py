@@ -22,6 +22,7 @@ class JobCreate(BaseModel):
 class YouTubeJobCreate(BaseModel):
     url: str
     max_speakers: int = Field(default=2, ge=1, le=10)
+    preset: str | None = None  # speed/quality preset; None = config default
 
 
 class Job(BaseModel):
@@ -33,6 +34,12 @@ class Job(BaseModel):
     current_step: str | None = None
     error: str | None = None
     source_url: str | None = None
+    input_sha256: str | None = None
+    max_speakers: int | None = None
+    preset: str | None = None
+    audio_seconds: float | None = None
+    eta_at: datetime | None = None  # predicted completion time (UTC)
+    step_metrics: dict[str, dict] = Field(default_factory=dict)  # step -> wall/CPU/RSS/GPU/phases
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
@@ -42,6 +49,9 @@ class JobResponse(BaseModel):
     status: JobStatus
     current_step: str | None = None
     error: str | None = None
+    preset: str | None = None
+    eta_seconds: float | None = None
+    step_metrics: dict[str, dict] = Field(default_factory=dict)
     created_at: str
 
 
@@ -57,9 +67,31 @@ class Segment(BaseModel):
     duration_es: float | None = None
 
 
+class TimeMapping(BaseModel):
+    from_track: str
+    to_track: str
+    times: list[float]
+    duration_en: float | None = None
+    duration_es: float | None = None
+
+
+class PeaksInfo(BaseModel):
+    track: str
+    sample_rate: int
+    samples: int
+    levels: dict[int, int]  # samples per bin -> number of bins
+
+
+class PresetInfo(BaseModel):
+    name: str
+    description: str = ""
+    default: bool = False
+
+
 class WSMessage(BaseModel):
-    type: str  # step_start, step_progress, step_complete, pipeline_complete, error
+    type: str  # step_start, step_progress, step_complete, step_skipped, pipeline_complete, error, ping, pong
     step: str | None = None
     current: int | None = None
     total: int | None = None
     message: str | None = None
+    eta_seconds: float | None = None
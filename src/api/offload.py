@@ -0,0 +1,141 @@
+"""Async access to blocking storage, config and artifact I/O.
+
+Route handlers run on the event loop, so every disk read they make stalls
+all WebSockets and audio range requests served by the same process.  The
+helpers here run that work on a small bounded thread pool instead, and keep
+the pipeline config in memory until the YAML file changes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from src.api import storage
+from src.api.metrics import registry
+from src.api.models import Job, JobStatus
+from src.config import load_config as _load_config
+from src.config import validate_environment as _validate_environment
+from src.utils.io import read_json as _read_json
+
+T = TypeVar("T")
+
+# Upper bound on threads doing blocking I/O for request handlers.
+IO_THREADS = 8
+
+_executor = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="api-io")
+
+
+async def run_io(fn: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking callable on the I/O pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+# ── Job storage ─────────────────────────────────────────────────────────
+
+async def get_job(job_id: str) -> Job | None:
+    return await run_io(storage.get_job, job_id)
+
+
+async def list_jobs(status: JobStatus | None = None) -> list[Job]:
+    return await run_io(storage.list_jobs, status)
+
+
+async def create_job(job: Job) -> Job:
+    return await run_io(storage.create_job, job)
+
+
+async def update_job(job_id: str, **fields) -> Job | None:
+    return await run_io(storage.update_job, job_id, **fields)
+
+
+async def delete_job(job_id: str) -> bool:
+    return await run_io(storage.delete_job, job_id)
+
+
+async def find_completed_by_hash(sha256: str, max_speakers: int | None = None,
+                                 preset: str | None = None) -> Job | None:
+    return await run_io(storage.find_completed_by_hash, sha256, max_speakers, preset)
+
+
+# ── Artifacts ───────────────────────────────────────────────────────────
+
+# Derived artifacts kept hot in memory, keyed by their source files' mtimes.
+ARTIFACT_CACHE_SIZE = 32
+
+_artifact_lock = threading.Lock()
+_artifact_cache: OrderedDict[tuple, Any] = OrderedDict()
+
+
+def cached_artifact(name: str, sources: list[Path], build: Callable[[], T]) -> T:
+    """Return ``build()``, memoized under *name* until any of *sources* changes.
+
+    Blocking — call it from the I/O pool (``run_io``), never from the loop.
+    Missing sources are part of the key too, so a file appearing later
+    (e.g. ``timeline_map.json`` once render finishes) invalidates the entry.
+    """
+    key_parts = []
+    for path in sources:
+        try:
+            key_parts.append((str(path), path.stat().st_mtime_ns))
+        except FileNotFoundError:
+            key_parts.append((str(path), None))
+    key = (name, *key_parts)
+
+    with _artifact_lock:
+        if key in _artifact_cache:
+            _artifact_cache.move_to_end(key)
+            registry.cache("artifact", hit=True)
+            return _artifact_cache[key]
+
+    registry.cache("artifact", hit=False)
+    value = build()
+    with _artifact_lock:
+        _artifact_cache[key] = value
+        while len(_artifact_cache) > ARTIFACT_CACHE_SIZE:
+            _artifact_cache.popitem(last=False)
+    return value
+
+
+async def read_json(path: Path) -> Any:
+    return await run_io(_read_json, path)
+
+
+# ── Config / environment (cached in memory) ─────────────────────────────
+
+_config_lock = threading.Lock()
+_config_cache: dict[str, tuple[float, dict]] = {}
+_env_cache: dict | None = None
+
+
+def _load_config_cached(config_path: str) -> dict:
+    mtime = Path(config_path).stat().st_mtime if Path(config_path).exists() else -1.0
+    with _config_lock:
+        cached = _config_cache.get(config_path)
+    registry.cache("config", hit=cached is not None and cached[0] == mtime)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, _load_config(config_path))
+        with _config_lock:
+            _config_cache[config_path] = cached
+    # Handlers mutate the config per job, so hand out a private copy
+    return copy.deepcopy(cached[1])
+
+
+async def load_config(config_path: str = "configs/default.yaml") -> dict:
+    """Load the pipeline config, re-reading the YAML only when it changed."""
+    return await run_io(_load_config_cached, config_path)
+
+
+async def validate_environment() -> dict:
+    """Validate the environment once per process and reuse the result."""
+    global _env_cache
+    if _env_cache is None:
+        _env_cache = await run_io(_validate_environment)
+    return _env_cache
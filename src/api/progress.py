@@ -1,54 +1,259 @@
-"""WebSocket connection manager for broadcasting pipeline progress."""
+"""WebSocket connection manager for broadcasting pipeline progress.
+
+Every connection gets its own bounded send queue drained by its own task,
+so a slow client only ever delays itself.  ``step_progress`` events are
+coalesced per step: if a client has not caught up, the pending progress
+message is replaced by the newest one instead of queueing behind it.  A
+client whose queue still overflows is disconnected; on reconnect it gets
+the per-job snapshot (the last event of every step plus the terminal
+event), which is replayed to every new connection.
+
+The pipeline thread never schedules a coroutine per event: events go into
+a thread-safe inbox that the event loop drains in batches.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
-from collections import defaultdict
+import threading
+from collections import OrderedDict, deque
 
 from fastapi import WebSocket
 
+# Events that may still be waiting per connection before it is dropped.
+MAX_PENDING = 256
+
+# Idle seconds before the server sends an application-level ping.
+HEARTBEAT_INTERVAL = 20.0
+
+# A single send taking longer than this marks the client as dead.
+SEND_TIMEOUT = 10.0
+
+# Jobs whose snapshot is kept for replay (oldest are forgotten first).
+MAX_SNAPSHOTS = 512
+
+_PING = json.dumps({"type": "ping"})
+_PONG = json.dumps({"type": "pong"})
+
+
+class _Snapshot:
+    """Last known state of one job, replayed to new connections.
+
+    Per step it keeps the latest non-progress event (start, complete,
+    skipped, error) plus, while the step runs, its latest progress event.
+    """
+
+    def __init__(self):
+        self.steps: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self.terminal: str | None = None
+
+    def apply(self, message: dict, data: str):
+        step = message.get("step")
+        if step is not None:
+            if message.get("type") == "step_progress":
+                self.steps.setdefault(step, {})["progress"] = data
+            else:
+                self.steps[step] = {"event": data}
+        elif message.get("type") in ("pipeline_complete", "error"):
+            self.terminal = data
+
+    def messages(self) -> list[str]:
+        out = [data for events in self.steps.values() for data in events.values()]
+        if self.terminal is not None:
+            out.append(self.terminal)
+        return out
+
+
+class _Subscriber:
+    """One WebSocket with its own coalescing queue and sender task."""
+
+    def __init__(self, ws: WebSocket, on_dead):
+        self.ws = ws
+        self._on_dead = on_dead
+        self._pending: OrderedDict[object, str] = OrderedDict()
+        self._keys = itertools.count()
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.closed = False
+
+    def start(self):
+        self._task = asyncio.create_task(self._sender())
+
+    def enqueue(self, message: dict, data: str):
+        if self.closed:
+            return
+        if message.get("type") == "step_progress":
+            # Latest value wins; keeps the position of the first pending one
+            self._pending[("progress", message.get("step"))] = data
+        else:
+            self._pending[next(self._keys)] = data
+        if len(self._pending) > MAX_PENDING:
+            self.close(code=1013)  # try again later; reconnect replays the snapshot
+            return
+        self._ready.set()
+
+    def enqueue_raw(self, data: str):
+        if self.closed:
+            return
+        self._pending[next(self._keys)] = data
+        self._ready.set()
+
+    def close(self, code: int | None = 1000):
+        """Stop sending; also close the socket unless *code* is None."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._task is not None:
+            self._task.cancel()
+        self._on_dead(self)
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.ws.close(code=code)
+        except Exception:
+            pass
+
+    async def _sender(self):
+        try:
+            # Checking ``closed`` matters: wait_for() can swallow a cancel
+            # that races with its inner await completing.
+            while not self.closed:
+                try:
+                    await asyncio.wait_for(self._ready.wait(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    self._pending[next(self._keys)] = _PING
+                self._ready.clear()
+                while self._pending and not self.closed:
+                    _, data = self._pending.popitem(last=False)
+                    await asyncio.wait_for(self.ws.send_text(data), SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.close()
+
 
 class ProgressManager:
     """Manages WebSocket connections per job and broadcasts progress events."""
 
     def __init__(self):
-        # job_id -> set of active WebSocket connections
-        self._connections: dict[str, set[WebSocket]] = defaultdict(set)
+        # job_id -> active subscribers
+        self._connections: dict[str, dict[WebSocket, _Subscriber]] = {}
+        self._snapshots: OrderedDict[str, _Snapshot] = OrderedDict()
         self._loop: asyncio.AbstractEventLoop | None = None
+        # Events handed over from worker threads, drained on the loop
+        self._inbox: deque[tuple[str, dict | None]] = deque()
+        self._inbox_lock = threading.Lock()
+        self._drain_scheduled = False
 
     def set_loop(self, loop: asyncio.AbstractEventLoop):
         self._loop = loop
 
+    def has_snapshot(self, job_id: str) -> bool:
+        return job_id in self._snapshots
+
+    def seed(self, job_id: str, events: list[dict]):
+        """Initialise a missing snapshot, e.g. from the job store after a restart."""
+        if job_id not in self._snapshots:
+            for event in events:
+                self._apply(job_id, event)
+
     async def connect(self, job_id: str, ws: WebSocket):
+        """Accept *ws*, replay the job's snapshot, then stream live events."""
         await ws.accept()
-        self._connections[job_id].add(ws)
+        sub = _Subscriber(ws, on_dead=lambda s: self._remove(job_id, s))
+        snapshot = self._snapshots.get(job_id)
+        if snapshot is not None:
+            for data in snapshot.messages():
+                sub.enqueue_raw(data)
+        self._connections.setdefault(job_id, {})[ws] = sub
+        sub.start()
 
     def disconnect(self, job_id: str, ws: WebSocket):
-        self._connections[job_id].discard(ws)
-        if not self._connections[job_id]:
-            del self._connections[job_id]
+        sub = self._connections.get(job_id, {}).get(ws)
+        if sub is not None:
+            sub.close(code=None)
 
-    async def _broadcast(self, job_id: str, message: dict):
-        """Send a message to all WebSocket clients watching a job."""
+    def handle_client_message(self, job_id: str, ws: WebSocket, text: str):
+        """Answer client heartbeats (``ping`` or ``{"type": "ping"}``)."""
+        if text == "ping" or text == _PING:
+            sub = self._connections.get(job_id, {}).get(ws)
+            if sub is not None:
+                sub.enqueue_raw(_PONG)
+
+    def subscriber_count(self, job_id: str | None = None) -> int:
+        """Subscribers of *job_id*, or of all jobs when omitted."""
+        if job_id is None:
+            return sum(len(subs) for subs in self._connections.values())
+        return len(self._connections.get(job_id, {}))
+
+    def watched_jobs(self) -> int:
+        return len(self._connections)
+
+    def _remove(self, job_id: str, sub: _Subscriber):
+        subs = self._connections.get(job_id)
+        if subs is not None and subs.get(sub.ws) is sub:
+            del subs[sub.ws]
+            if not subs:
+                del self._connections[job_id]
+
+    def _apply(self, job_id: str, message: dict) -> str:
+        snapshot = self._snapshots.get(job_id)
+        if snapshot is None:
+            snapshot = self._snapshots[job_id] = _Snapshot()
+            while len(self._snapshots) > MAX_SNAPSHOTS:
+                self._snapshots.popitem(last=False)
+        else:
+            self._snapshots.move_to_end(job_id)
         data = json.dumps(message, default=str)
-        dead: list[WebSocket] = []
-        for ws in self._connections.get(job_id, set()):
-            try:
-                await ws.send_text(data)
-            except Exception:
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(job_id, ws)
+        snapshot.apply(message, data)
+        return data
+
+    def broadcast(self, job_id: str, message: dict):
+        """Record *message* in the snapshot and queue it for every subscriber.
+
+        Must be called on the event loop; never blocks on a client.
+        """
+        data = self._apply(job_id, message)
+        for sub in list(self._connections.get(job_id, {}).values()):
+            sub.enqueue(message, data)
+
+    def reset(self, job_id: str):
+        """Forget the snapshot of a job that is about to (re)run."""
+        self._post(job_id, None)
 
     def broadcast_sync(self, job_id: str, message: dict):
         """Thread-safe broadcast callable from the pipeline worker thread."""
+        self._post(job_id, message)
+
+    def _post(self, job_id: str, message: dict | None):
         if self._loop is None:
             return
-        asyncio.run_coroutine_threadsafe(
-            self._broadcast(job_id, message),
-            self._loop,
-        )
+        with self._inbox_lock:
+            self._inbox.append((job_id, message))
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._drain)
+        except RuntimeError:
+            # Loop already closed (shutdown); nothing left to deliver to
+            with self._inbox_lock:
+                self._drain_scheduled = False
+
+    def _drain(self):
+        with self._inbox_lock:
+            batch = list(self._inbox)
+            self._inbox.clear()
+            self._drain_scheduled = False
+        for job_id, message in batch:
+            if message is None:
+                self._snapshots.pop(job_id, None)
+            else:
+                self.broadcast(job_id, message)
 
 
 # Singleton instance
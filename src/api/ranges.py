@@ -0,0 +1,198 @@
+"""HTTP Range (RFC 7233) parsing and a ranged file response.
+
+Under uvicorn (the server this repo runs on) file bodies are read with
+``os.pread`` on a worker thread; zero-copy ``sendfile`` is used only
+under servers that offer the ASGI ``zerocopysend`` extension.
+"""
+
+from __future__ import annotations
+
+import os
+import secrets
+from pathlib import Path
+from typing import BinaryIO
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+# Read size of the pread path (every server without zerocopysend, uvicorn included).
+CHUNK_SIZE = 256 * 1024
+
+# Refuse pathological multi-range requests (RFC 7233 §6.1).
+MAX_RANGES = 16
+
+_ZEROCOPY = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(Exception):
+    """No requested range overlaps the file (→ 416)."""
+
+
+def parse_range_header(header: str, size: int) -> list[tuple[int, int]] | None:
+    """Parse a ``Range`` header into sorted, coalesced inclusive byte ranges.
+
+    Handles ``a-b``, open-ended ``a-`` and suffix ``-N`` specs, in any
+    number up to MAX_RANGES.  Returns None when the header is malformed or
+    uses another unit, in which case the caller must ignore it and send
+    the whole file.
+
+    Raises:
+        RangeNotSatisfiable: if the header is valid but no range overlaps
+            the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+
+    parts = [p.strip() for p in spec.split(",") if p.strip()]
+    if not parts or len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        first, sep, last = part.partition("-")
+        if not sep:
+            return None
+        try:
+            if first == "":
+                # Suffix range: the last N bytes
+                length = int(last)
+                if length < 0:
+                    return None
+                if length == 0:
+                    continue
+                ranges.append((max(0, size - length), size - 1))
+                continue
+            start = int(first)
+            end = int(last) if last else None
+        except ValueError:
+            return None
+        if start < 0 or (end is not None and end < start):
+            return None
+        if start >= size:
+            continue  # unsatisfiable on its own; others may still match
+        ranges.append((start, size - 1 if end is None else min(end, size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+
+    # Coalesce overlapping / adjacent ranges
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        prev_start, prev_end = merged[-1]
+        if start <= prev_end + 1:
+            merged[-1] = (prev_start, max(prev_end, end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class FileRangeResponse(Response):
+    """Serve a whole file, one byte range, or ``multipart/byteranges``.
+
+    File data is read with ``os.pread`` in CHUNK_SIZE pieces on a worker
+    thread, so the event loop never blocks on disk and each response holds
+    one chunk in memory.  Servers that advertise the ASGI ``zerocopysend``
+    extension get the file handed over for ``sendfile`` instead; uvicorn
+    does not, so there this is the pread path.
+
+    *file*, if given, is the already opened *path*: the response reads
+    from it (and closes it), so the file may be deleted in the meantime.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        media_type: str,
+        ranges: list[tuple[int, int]] | None = None,
+        headers: dict[str, str] | None = None,
+        send_body: bool = True,
+        file: BinaryIO | None = None,
+    ):
+        self.path = path
+        self.file = file
+        self.size = size
+        self.send_body = send_body
+        self.background = None
+        self.status_code = 200 if ranges is None else 206
+        self.media_type = media_type
+
+        # (preamble bytes, start, end) per part; a single part has no preamble
+        self._parts: list[tuple[bytes, int, int]] = []
+        self._epilogue = b""
+        headers = dict(headers or {})
+        headers["Accept-Ranges"] = "bytes"
+
+        if ranges is None:
+            self._parts.append((b"", 0, size - 1))
+            content_type = media_type
+            length = size
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            self._parts.append((b"", start, end))
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            content_type = media_type
+            length = end - start + 1
+        else:
+            boundary = secrets.token_hex(16)
+            length = 0
+            for i, (start, end) in enumerate(ranges):
+                separator = b"" if i == 0 else b"\r\n"
+                preamble = separator + (
+                    f"--{boundary}\r\n"
+                    f"Content-Type: {media_type}\r\n"
+                    f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+                ).encode("latin-1")
+                self._parts.append((preamble, start, end))
+                length += len(preamble) + end - start + 1
+            self._epilogue = f"\r\n--{boundary}--\r\n".encode("latin-1")
+            length += len(self._epilogue)
+            content_type = f"multipart/byteranges; boundary={boundary}"
+
+        headers["Content-Length"] = str(length)
+        headers["Content-Type"] = content_type
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if not self.send_body or self.size == 0:
+            if self.file is not None:
+                self.file.close()
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        zerocopy = _ZEROCOPY in scope.get("extensions", {})
+        f = self.file or await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            for preamble, start, end in self._parts:
+                if preamble:
+                    await send({"type": "http.response.body", "body": preamble, "more_body": True})
+                if zerocopy:
+                    await send({
+                        "type": _ZEROCOPY, "file": f,
+                        "offset": start, "count": end - start + 1, "more_body": True,
+                    })
+                else:
+                    await self._send_pread(send, f.fileno(), start, end)
+        finally:
+            f.close()
+
+        await send({"type": "http.response.body", "body": self._epilogue, "more_body": False})
+
+    @staticmethod
+    async def _send_pread(send: Send, fd: int, start: int, end: int):
+        offset = start
+        while offset <= end:
+            n = min(CHUNK_SIZE, end - offset + 1)
+            chunk = await anyio.to_thread.run_sync(os.pread, fd, n, offset)
+            if not chunk:
+                break
+            offset += len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
@@ -0,0 +1,101 @@
+"""Startup warm-up and the resident model pool of the API process.
+
+With ``warmup.enabled`` the lifespan hook starts :func:`start_warmup`: a
+background thread runs :func:`src.warmup.warm_up` into a process-wide
+:class:`~src.pipeline.models.ModelCache`, which every job's own cache
+falls back to, so the warmed models stay loaded between jobs while
+anything else a job loads is released after each step.  ``/api/health`` answers
+as soon as the server is up; ``/api/ready`` answers 503 until the
+warm-up has finished (and keeps doing so if it failed).  Model steps of
+concurrent jobs take turns on the shared models, one job per step.
+"""
+
+from __future__ import annotations
+
+import threading
+import traceback
+from datetime import datetime
+
+from src.pipeline.models import ModelCache
+
+
+class Readiness:
+    """Warm-up state: ``disabled``, ``warming``, ``ready`` or ``failed``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = "disabled"
+        self.steps: list[dict] = []
+        self.started_at: str | None = None
+        self.finished_at: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("disabled", "ready")
+
+    def start(self):
+        with self._lock:
+            self.state = "warming"
+            self.steps = []
+            self.started_at = datetime.now().isoformat(timespec="seconds")
+            self.finished_at = None
+
+    def add(self, result: dict):
+        with self._lock:
+            self.steps.append(result)
+
+    def finish(self, ok: bool):
+        with self._lock:
+            self.state = "ready" if ok else "failed"
+            self.finished_at = datetime.now().isoformat(timespec="seconds")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "state": self.state,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "steps": list(self.steps),
+            }
+
+
+readiness = Readiness()
+
+_resident_models: ModelCache | None = None
+_step_locks: dict[str, threading.Lock] = {}
+
+
+def resident_models() -> ModelCache | None:
+    """The API's resident model pool, or None when warm-up is disabled."""
+    return _resident_models
+
+
+def step_lock(name: str) -> threading.Lock:
+    """Lock held by a job while it runs model step *name* on the resident models."""
+    return _step_locks.setdefault(name, threading.Lock())
+
+
+def _warm(config: dict):
+    from src.warmup import warm_up
+
+    try:
+        results = warm_up(config, _resident_models, download=config["warmup"].get("download", False),
+                          on_result=readiness.add, guard=step_lock)
+        readiness.finish(all(r["ok"] for r in results))
+    except Exception:
+        traceback.print_exc()
+        readiness.finish(False)
+
+
+def start_warmup(config: dict) -> threading.Thread | None:
+    """Start warming the configured models in the background, if ``warmup.enabled``."""
+    global _resident_models
+
+    if not config.get("warmup", {}).get("enabled", False):
+        return None
+    _resident_models = ModelCache()
+    readiness.start()
+    t = threading.Thread(target=_warm, args=(config,), daemon=True, name="model-warmup")
+    t.start()
+    return t
@@ -1,107 +1,156 @@
-"""Audio streaming routes with Range header support."""
+"""Audio streaming routes with full HTTP Range (RFC 7233) support."""
 
 from __future__ import annotations
 
 import os
 from pathlib import Path
-
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import FileResponse, StreamingResponse
-
-from src.api.storage import get_job
+from typing import BinaryIO
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from src.api.http_cache import cache_headers, if_range_matches, is_not_modified, make_etag
+from src.api.metrics import registry
+from src.api.offload import get_job, load_config, run_io
+from src.api.ranges import FileRangeResponse, RangeNotSatisfiable, parse_range_header
+from src.api.transcodes import (
+    cached_variant,
+    select_bitrate,
+    submit_variant,
+    track_candidates,
+    variant_path,
+)
 
 router = APIRouter(prefix="/api/jobs", tags=["audio"])
 
-# Map track names to files
-TRACK_FILES = {
-    "original": None,  # Uses job.input_path
-    "translated": "rendered.mp3",
-}
-
 MIME_TYPES = {
     ".mp3": "audio/mpeg",
     ".wav": "audio/wav",
     ".m4a": "audio/mp4",
     ".ogg": "audio/ogg",
+    ".opus": "audio/ogg; codecs=opus",
     ".flac": "audio/flac",
 }
 
+# The uploaded original never changes for a job; the rendered track can be
+# regenerated by a re-run, so caches must revalidate it.
+CACHE_CONTROL = {
+    "original": "public, max-age=86400",
+    "translated": "public, no-cache",
+}
+
 
-def _get_audio_path(job_id: str, track: str) -> Path:
-    job = get_job(job_id)
+async def _get_audio_path(job_id: str, track: str) -> tuple[Path, os.stat_result]:
+    """Resolve the file for *track* and stat it without blocking the loop."""
+    job = await get_job(job_id)
     if not job:
         raise HTTPException(404, f"Job {job_id} not found")
 
-    if track == "original":
-        path = Path(job.input_path)
-    elif track == "translated":
-        # Try mp3 first, then wav
-        workdir = Path(job.workdir)
-        path = workdir / "rendered.mp3"
-        if not path.exists():
-            path = workdir / "rendered.wav"
-    else:
+    if track not in CACHE_CONTROL:
         raise HTTPException(400, f"Unknown track: {track}")
+    candidates = track_candidates(job.input_path, job.workdir, track)
 
-    if not path.exists():
+    found = await run_io(_first_existing, candidates)
+    if found is None:
         raise HTTPException(404, f"Audio file not found for track '{track}'")
 
-    return path
-
-
-@router.get("/{job_id}/audio/{track}")
-async def stream_audio(job_id: str, track: str, request: Request):
-    """Stream audio with HTTP Range support for seeking."""
-    path = _get_audio_path(job_id, track)
-    file_size = path.stat().st_size
-    suffix = path.suffix.lower()
-    content_type = MIME_TYPES.get(suffix, "application/octet-stream")
-
-    range_header = request.headers.get("range")
-
-    if not range_header:
-        return FileResponse(
-            str(path),
-            media_type=content_type,
-            headers={
-                "Accept-Ranges": "bytes",
-                "Content-Length": str(file_size),
-            },
-        )
-
-    # Parse Range: bytes=start-end
+    return found
+
+
+def _first_existing(candidates: list[Path]) -> tuple[Path, os.stat_result] | None:
+    for path in candidates:
+        try:
+            return path, path.stat()
+        except FileNotFoundError:
+            continue
+    return None
+
+
+async def _open_variant(job_id: str, track: str, source: Path, source_stat: os.stat_result,
+                        kbps: int, config: dict) -> tuple[Path, os.stat_result, BinaryIO] | None:
+    """The cached Opus variant, opened, or None if it is not encoded yet.
+
+    A missing variant is queued for encoding in the background and the
+    caller serves the source meanwhile.  The variant is opened here, so an
+    eviction once the response has started can no longer break it.
+    """
+    path = variant_path(job_id, track, source_stat, kbps)
+    f = None
+    if await run_io(cached_variant, path) is not None:
+        try:
+            f = await run_io(open, path, "rb")
+        except FileNotFoundError:
+            pass  # evicted since the stat
+    registry.cache("transcode", hit=f is not None)
+    if f is None:
+        submit_variant(job_id, track, source, source_stat, kbps, config)
+        return None
+    return path, os.fstat(f.fileno()), f
+
+
+@router.api_route("/{job_id}/audio/{track}", methods=["GET", "HEAD"])
+async def stream_audio(
+    job_id: str,
+    track: str,
+    request: Request,
+    variant: str | None = Query(
+        default=None,
+        description="``source``, or a low-bandwidth Opus variant such as ``opus32``/``opus64``",
+    ),
+):
+    """Stream audio with HTTP Range support for seeking.
+
+    Supports ``bytes=a-b``, ``a-``, ``-N`` and multi-range requests,
+    ``If-Range``, and conditional GETs via ETag/Last-Modified.  Opus
+    variants are chosen with ``?variant=`` or an ``Accept`` header naming
+    Opus; one not cached yet is encoded in the background while the
+    source is served, uncacheable, in its place.
+    """
+    path, st = await _get_audio_path(job_id, track)
+
+    config = await load_config()
     try:
-        range_spec = range_header.replace("bytes=", "")
-        parts = range_spec.split("-")
-        start = int(parts[0]) if parts[0] else 0
-        end = int(parts[1]) if parts[1] else file_size - 1
-    except (ValueError, IndexError):
-        raise HTTPException(416, "Invalid range header")
-
-    if start >= file_size or end >= file_size:
-        raise HTTPException(416, "Range not satisfiable")
-
-    chunk_size = end - start + 1
-
-    def iter_file():
-        with open(path, "rb") as f:
-            f.seek(start)
-            remaining = chunk_size
-            while remaining > 0:
-                read_size = min(remaining, 64 * 1024)
-                data = f.read(read_size)
-                if not data:
-                    break
-                remaining -= len(data)
-                yield data
-
-    return StreamingResponse(
-        iter_file(),
-        status_code=206,
-        media_type=content_type,
-        headers={
-            "Accept-Ranges": "bytes",
-            "Content-Range": f"bytes {start}-{end}/{file_size}",
-            "Content-Length": str(chunk_size),
-        },
+        kbps = select_bitrate(variant, request.headers.get("accept"), config)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
+    f = None
+    fallback = False
+    if kbps is not None:
+        opened = await _open_variant(job_id, track, path, st, kbps, config)
+        if opened is None:
+            fallback = True
+        else:
+            path, st, f = opened
+
+    file_size = st.st_size
+    content_type = MIME_TYPES.get(path.suffix.lower(), "application/octet-stream")
+
+    etag = make_etag(st.st_mtime_ns, file_size, weak=False)
+    headers = cache_headers(etag, st.st_mtime, cache_control=CACHE_CONTROL[track])
+    headers["Vary"] = "Accept"
+    if fallback:
+        # Stand-in for the variant: caches must not keep it under its URL
+        headers["Cache-Control"] = "no-store"
+    send_body = request.method != "HEAD"
+
+    if is_not_modified(request, etag, st.st_mtime):
+        if f is not None:
+            f.close()
+        return Response(status_code=304, headers=headers)
+
+    ranges = None
+    range_header = request.headers.get("range")
+    if range_header and if_range_matches(request, etag, st.st_mtime):
+        try:
+            ranges = parse_range_header(range_header, file_size)
+        except RangeNotSatisfiable:
+            if f is not None:
+                f.close()
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{file_size}"},
+            )
+
+    return FileRangeResponse(
+        path, file_size, content_type,
+        ranges=ranges, headers=headers, send_body=send_body, file=f,
     )
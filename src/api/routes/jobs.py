@@ -5,17 +5,35 @@ from __future__ import annotations
 import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Request
 
+from src.api.eta import backlog_seconds, eta_at, eta_seconds, predict_job_seconds
 from src.api.models import Job, JobResponse, JobStatus, YouTubeJobCreate
-from src.api.storage import create_job, delete_job, get_job, list_jobs, update_job, DATA_DIR
+from src.api.offload import (
+    create_job,
+    delete_job,
+    find_completed_by_hash,
+    get_job,
+    list_jobs,
+    load_config,
+    run_io,
+    update_job,
+    validate_environment,
+)
+from src.api.storage import DATA_DIR
+from src.api.transcodes import drop_variants
+from src.api.uploads import copy_artifacts, receive_upload
 from src.api.worker import start_pipeline
 from src.api.youtube import is_valid_youtube_url
-from src.config import ensure_workdir, load_config, validate_environment
+from src.config import apply_preset, ensure_workdir
+from src.utils.audio import probe_duration
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 
+_ACTIVE = (JobStatus.pending, JobStatus.processing)
+
+
 def _job_to_response(job: Job) -> JobResponse:
     return JobResponse(
         id=job.id,
@@ -23,33 +41,106 @@ def _job_to_response(job: Job) -> JobResponse:
         status=job.status,
         current_step=job.current_step,
         error=job.error,
+        preset=job.preset,
+        eta_seconds=eta_seconds(job.eta_at) if job.status in _ACTIVE else None,
+        step_metrics=job.step_metrics,
         created_at=str(job.created_at),
     )
 
 
-@router.post("", status_code=201)
-async def create(
-    file: UploadFile = File(...),
-    max_speakers: int = Form(default=2),
-) -> JobResponse:
-    """Upload an audio file and start the translation pipeline."""
-    if not file.filename:
-        raise HTTPException(400, "No filename provided")
-
+def _with_preset(config: dict, preset: str | None) -> dict:
+    try:
+        return apply_preset(config, preset)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+async def _admit(api_cfg: dict, new_seconds: float | None = None):
+    """Reject new work while the predicted backlog exceeds ``api.max_backlog_minutes``."""
+    limit = api_cfg.get("max_backlog_minutes")
+    if not limit:
+        return
+    excess = await run_io(backlog_seconds) + (new_seconds or 0) - limit * 60
+    if excess > 0:
+        raise HTTPException(
+            503,
+            "Hay demasiados trabajos en cola, intenta mas tarde",
+            headers={"Retry-After": str(max(60, int(excess)))},
+        )
+
+
+# The body is parsed by receive_upload, not by FastAPI; documented here
+_UPLOAD_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "max_speakers": {"type": "integer", "default": 2},
+                "preset": {"type": "string"},
+            },
+        }}},
+    },
+}
+
+
+@router.post("", status_code=201, openapi_extra=_UPLOAD_FORM)
+async def create(request: Request) -> JobResponse:
+    """Upload an audio file and start the translation pipeline.
+
+    The multipart body is streamed straight to disk, so an oversize or
+    non-audio upload is rejected while it arrives rather than after it
+    has been spooled in full.
+    """
     job_id = uuid.uuid4().hex[:12]
-    filename = file.filename
+    config = await load_config("configs/default.yaml")
+    api_cfg = config.get("api", {})
+    await _admit(api_cfg)
 
-    # Save uploaded file
+    # Stream uploaded file to disk, hashing as we go
     input_dir = DATA_DIR / "input"
-    input_dir.mkdir(parents=True, exist_ok=True)
-    input_path = input_dir / f"{job_id}_{filename}"
-
-    content = await file.read()
-    input_path.write_bytes(content)
-
-    # Setup workdir
+    upload = await receive_upload(
+        request,
+        lambda name: input_dir / f"{job_id}_{Path(name).name}",
+        max_bytes=api_cfg.get("max_upload_mb", 2048) * 1024 * 1024,
+        chunk_size=api_cfg.get("upload_chunk_kb", 1024) * 1024,
+    )
+    filename, input_path, sha256 = upload.filename, upload.path, upload.sha256
+
+    # Form fields may follow the file, so they are applied once it is in
+    try:
+        max_speakers = int(upload.fields.get("max_speakers") or 2)
+    except ValueError:
+        await run_io(input_path.unlink, missing_ok=True)
+        raise HTTPException(422, "max_speakers debe ser un entero")
+    try:
+        config = _with_preset(config, upload.fields.get("preset") or None)
+    except HTTPException:
+        await run_io(input_path.unlink, missing_ok=True)
+        raise
+    if max_speakers:
+        config["diarization"]["max_speakers"] = max_speakers
+    api_cfg = config.get("api", {})
+
+    # Admit against the predicted run time of this input
+    audio_seconds = await run_io(probe_duration, input_path)
+    predicted = await run_io(predict_job_seconds, audio_seconds)
+    try:
+        await _admit(api_cfg, predicted)
+    except HTTPException:
+        await run_io(input_path.unlink, missing_ok=True)
+        raise
+
+    # Setup workdir, seeded from a finished job with the same input if any
     workdir = DATA_DIR / "work" / job_id
-    ensure_workdir(str(workdir))
+    await run_io(ensure_workdir, str(workdir))
+    if api_cfg.get("reuse_completed_jobs", True):
+        previous = await find_completed_by_hash(sha256, max_speakers=max_speakers,
+                                                preset=config.get("preset"))
+        if previous is not None:
+            await run_io(copy_artifacts, Path(previous.workdir), workdir)
 
     # Create job record
     job = Job(
@@ -58,15 +149,15 @@ async def create(
         input_path=str(input_path),
         workdir=str(workdir),
         status=JobStatus.pending,
+        input_sha256=sha256,
+        max_speakers=max_speakers,
+        preset=config.get("preset"),
+        audio_seconds=audio_seconds,
+        eta_at=eta_at(predicted),
     )
-    create_job(job)
-
-    # Load config and start pipeline in background
-    config = load_config("configs/default.yaml")
-    if max_speakers:
-        config["diarization"]["max_speakers"] = max_speakers
+    await create_job(job)
 
-    validate_environment()
+    await validate_environment()
     start_pipeline(job_id, str(input_path), str(workdir), config)
 
     return _job_to_response(job)
@@ -78,15 +169,19 @@ async def create_from_youtube(body: YouTubeJobCreate) -> JobResponse:
     if not is_valid_youtube_url(body.url):
         raise HTTPException(400, "URL de YouTube no valida")
 
+    config = _with_preset(await load_config("configs/default.yaml"), body.preset)
+    # Duration is unknown until the download finishes; admit on the backlog alone
+    await _admit(config.get("api", {}))
+
     job_id = uuid.uuid4().hex[:12]
 
     input_dir = DATA_DIR / "input"
-    input_dir.mkdir(parents=True, exist_ok=True)
+    await run_io(input_dir.mkdir, parents=True, exist_ok=True)
     # yt-dlp will append .wav via postprocessor
     input_path = input_dir / f"{job_id}_youtube"
 
     workdir = DATA_DIR / "work" / job_id
-    ensure_workdir(str(workdir))
+    await run_io(ensure_workdir, str(workdir))
 
     job = Job(
         id=job_id,
@@ -95,14 +190,15 @@ async def create_from_youtube(body: YouTubeJobCreate) -> JobResponse:
         workdir=str(workdir),
         status=JobStatus.pending,
         source_url=body.url,
+        max_speakers=body.max_speakers,
+        preset=config.get("preset"),
     )
-    create_job(job)
+    await create_job(job)
 
-    config = load_config("configs/default.yaml")
     if body.max_speakers:
         config["diarization"]["max_speakers"] = body.max_speakers
 
-    validate_environment()
+    await validate_environment()
     start_pipeline(job_id, str(input_path), str(workdir), config, youtube_url=body.url)
 
     return _job_to_response(job)
@@ -111,13 +207,13 @@ async def create_from_youtube(body: YouTubeJobCreate) -> JobResponse:
 @router.get("")
 async def list_all() -> list[JobResponse]:
     """List all jobs."""
-    return [_job_to_response(j) for j in list_jobs()]
+    return [_job_to_response(j) for j in await list_jobs()]
 
 
 @router.get("/{job_id}")
 async def detail(job_id: str) -> JobResponse:
     """Get job details."""
-    job = get_job(job_id)
+    job = await get_job(job_id)
     if not job:
         raise HTTPException(404, f"Job {job_id} not found")
     return _job_to_response(job)
@@ -126,28 +222,30 @@ async def detail(job_id: str) -> JobResponse:
 @router.post("/{job_id}/retry")
 async def retry(job_id: str) -> JobResponse:
     """Retry a failed job by re-running the pipeline."""
-    job = get_job(job_id)
+    job = await get_job(job_id)
     if not job:
         raise HTTPException(404, f"Job {job_id} not found")
     if job.status != JobStatus.failed:
         raise HTTPException(400, "Solo se pueden reintentar trabajos con error")
 
-    # Reset job state
-    update_job(job_id, status=JobStatus.pending, error=None, current_step=None)
+    config = _with_preset(await load_config("configs/default.yaml"), job.preset)
+    await _admit(config.get("api", {}), await run_io(predict_job_seconds, job.audio_seconds))
 
-    config = load_config("configs/default.yaml")
-    validate_environment()
+    # Reset job state
+    await update_job(job_id, status=JobStatus.pending, error=None, current_step=None)
+    await validate_environment()
 
     youtube_url = job.source_url
     start_pipeline(job_id, job.input_path, job.workdir, config, youtube_url=youtube_url)
 
-    job = get_job(job_id)
+    job = await get_job(job_id)
     return _job_to_response(job)
 
 
 @router.delete("/{job_id}")
 async def remove(job_id: str):
     """Delete a job and its artifacts."""
-    if not delete_job(job_id):
+    if not await delete_job(job_id):
         raise HTTPException(404, f"Job {job_id} not found")
+    await run_io(drop_variants, job_id)
     return {"ok": True}
@@ -0,0 +1,35 @@
+"""Prometheus metrics endpoint."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Response
+
+from src.api import storage
+from src.api.metrics import registry
+from src.api.models import JobStatus
+from src.api.offload import run_io
+from src.api.progress import progress_manager
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+
+@router.get("/metrics", response_class=Response)
+async def metrics():
+    """Step timings, cache hit rates, job counts and WebSocket subscribers."""
+    counts = await run_io(storage.count_jobs_by_status)
+    extra = [
+        ("loro_jobs", "gauge", "Jobs by status",
+         {(("status", s.value),): counts.get(s.value, 0) for s in JobStatus}),
+        ("loro_queue_depth", "gauge", "Jobs waiting to start",
+         {(): counts.get(JobStatus.pending.value, 0)}),
+        ("loro_active_jobs", "gauge", "Jobs whose pipeline is running",
+         {(): counts.get(JobStatus.processing.value, 0)}),
+        ("loro_websocket_subscribers", "gauge", "Open progress WebSocket connections",
+         {(): progress_manager.subscriber_count()}),
+        ("loro_websocket_watched_jobs", "gauge", "Jobs with at least one progress subscriber",
+         {(): progress_manager.watched_jobs()}),
+    ]
+    return Response(
+        content=registry.render(extra),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
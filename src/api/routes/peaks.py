@@ -0,0 +1,100 @@
+"""Waveform peaks route: pre-computed min/max pyramids per track."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from src.api.http_cache import cache_headers, is_not_modified, make_etag
+from src.api.models import PeaksInfo
+from src.api.offload import get_job, load_config, run_io
+from src.utils.peaks import peaks_path, read_peaks_header, write_peaks
+
+router = APIRouter(prefix="/api/jobs", tags=["peaks"])
+
+# Sample rate used when peaks have to be computed on demand from a file
+_LAZY_SAMPLE_RATE = 16000
+
+_generate_lock = threading.Lock()
+
+
+def _ensure_peaks(workdir: Path, audio_path: Path | None, track: str,
+                  levels: list[int] | None) -> dict | None:
+    """Return the peaks header, computing it once for jobs that predate it."""
+    header = read_peaks_header(workdir, track)
+    if header is not None or audio_path is None or not audio_path.exists():
+        return header
+
+    from src.utils.audio import load_audio
+
+    with _generate_lock:
+        header = read_peaks_header(workdir, track)
+        if header is None:
+            audio = load_audio(audio_path, sr=_LAZY_SAMPLE_RATE)
+            write_peaks(workdir, track, audio, _LAZY_SAMPLE_RATE, levels)
+            header = read_peaks_header(workdir, track)
+    return header
+
+
+def _audio_source(job, track: str) -> Path | None:
+    if track == "original":
+        return Path(job.input_path)
+    for name in ("rendered.wav", "rendered.mp3"):
+        path = Path(job.workdir) / name
+        if path.exists():
+            return path
+    return None
+
+
+@router.get("/{job_id}/peaks/{track}", response_model=PeaksInfo)
+async def get_peaks(
+    job_id: str,
+    track: str,
+    request: Request,
+    zoom: int | None = Query(default=None, description="Samples per bin"),
+):
+    """Waveform peaks for ``original`` or ``translated``.
+
+    Without ``zoom`` returns the available levels as JSON.  With ``zoom``
+    (one of those samples-per-bin values) returns the raw level: interleaved
+    int8 ``(min, max)`` pairs, scaled so 127 is full scale.
+    """
+    if track not in ("original", "translated"):
+        raise HTTPException(400, f"Unknown track: {track}")
+
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(404, f"Job {job_id} not found")
+
+    workdir = Path(job.workdir)
+    levels = (await load_config()).get("peaks", {}).get("levels")
+    source = await run_io(_audio_source, job, track)
+    try:
+        header = await run_io(_ensure_peaks, workdir, source, track, levels)
+    except Exception as exc:
+        raise HTTPException(503, f"Could not compute peaks for track '{track}': {exc}")
+    if header is None:
+        raise HTTPException(404, f"No peaks available for track '{track}'")
+
+    if zoom is None:
+        return PeaksInfo(
+            track=track,
+            sample_rate=header["sample_rate"],
+            samples=header["samples"],
+            levels={int(k): v for k, v in header["levels"].items()},
+        )
+
+    if str(zoom) not in header["levels"]:
+        raise HTTPException(400, f"zoom must be one of {sorted(int(k) for k in header['levels'])}")
+
+    path = peaks_path(workdir, track, zoom)
+    st = await run_io(path.stat)
+    etag = make_etag(st.st_mtime_ns, st.st_size, weak=False)
+    headers = cache_headers(etag, st.st_mtime)
+    if is_not_modified(request, etag, st.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    body = await run_io(path.read_bytes)
+    return Response(content=body, media_type="application/octet-stream", headers=headers)
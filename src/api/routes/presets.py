@@ -0,0 +1,24 @@
+"""Speed/quality presets the pipeline can run with."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from src.api.models import PresetInfo
+from src.api.offload import load_config
+
+router = APIRouter(prefix="/api", tags=["presets"])
+
+
+@router.get("/presets")
+async def list_presets() -> list[PresetInfo]:
+    """Presets accepted by job creation, from the pipeline config."""
+    config = await load_config("configs/default.yaml")
+    return [
+        PresetInfo(
+            name=name,
+            description=(values or {}).get("description", ""),
+            default=name == config.get("preset"),
+        )
+        for name, values in (config.get("presets") or {}).items()
+    ]
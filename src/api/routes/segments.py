@@ -2,69 +2,116 @@
 
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
+from src.api.http_cache import (
+    MIN_COMPRESS_BYTES,
+    cache_headers,
+    compress,
+    is_not_modified,
+    make_etag,
+    negotiate_encoding,
+)
+from src.api.metrics import registry
 from src.api.models import Segment
-from src.api.storage import get_job
-from src.utils.io import read_json
+from src.api.offload import cached_artifact, get_job, run_io
+from src.utils.artifacts import artifact_files
+from src.utils.segments import SEGMENTS_FILE, SegmentIndex, load_segment_table, source_files
 
 router = APIRouter(prefix="/api/jobs", tags=["segments"])
 
 
-@router.get("/{job_id}/segments")
-async def get_segments(job_id: str) -> list[Segment]:
-    """Return translated segments for the player."""
-    job = get_job(job_id)
+class _SegmentsView:
+    """One version of a job's segment table, ready to serve.
+
+    Holds the window index plus the serialized (and lazily compressed)
+    full body, so repeat requests cost neither parsing nor encoding.
+    """
+
+    def __init__(self, rows: list[dict], etag: str, mtime: float):
+        self.index = SegmentIndex(rows)
+        self.etag = etag
+        self.mtime = mtime
+        self._full = _encode(rows)
+        self._compressed: dict[str, bytes] = {}
+
+    def full_body(self, encoding: str | None) -> tuple[bytes, str | None]:
+        """Return ``(body, applied_encoding)`` for the whole table."""
+        if encoding is None or len(self._full) < MIN_COMPRESS_BYTES:
+            return self._full, None
+        registry.cache("segments_compressed", hit=encoding in self._compressed)
+        if encoding not in self._compressed:
+            self._compressed[encoding] = compress(self._full, encoding)
+        return self._compressed[encoding], encoding
+
+
+def _encode(rows: list[dict]) -> bytes:
+    return json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _sources(workdir: Path) -> list[Path]:
+    return artifact_files(workdir / SEGMENTS_FILE) + source_files(workdir)
+
+
+def _build_view(workdir: Path) -> _SegmentsView | None:
+    rows = load_segment_table(workdir)
+    if rows is None:
+        return None
+    stats = [p.stat() for p in _sources(workdir) if p.exists()]
+    mtime_ns = max(s.st_mtime_ns for s in stats)
+    size = sum(s.st_size for s in stats)
+    return _SegmentsView(rows, make_etag(mtime_ns, size, len(rows)), mtime_ns / 1e9)
+
+
+def _window_body(view: _SegmentsView, t0: float | None, t1: float | None,
+                 track: str, encoding: str | None) -> tuple[bytes, str | None]:
+    body = _encode(view.index.window(t0, t1, track))
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    return compress(body, encoding), encoding
+
+
+@router.get("/{job_id}/segments", response_model=list[Segment])
+async def get_segments(
+    job_id: str,
+    request: Request,
+    from_: float | None = Query(default=None, alias="from", ge=0),
+    to: float | None = Query(default=None, ge=0),
+    track: Literal["en", "es"] = "en",
+) -> Response:
+    """Return translated segments for the player.
+
+    With ``from``/``to`` only segments overlapping that window (in seconds
+    on the ``track`` timeline) are returned.  Responses carry ETag and
+    Last-Modified validators and are gzip/brotli-compressed on request.
+    """
+    job = await get_job(job_id)
     if not job:
         raise HTTPException(404, f"Job {job_id} not found")
 
     workdir = Path(job.workdir)
+    view = await run_io(
+        cached_artifact, f"segments:{workdir}", _sources(workdir),
+        lambda: _build_view(workdir),
+    )
+    if view is None:
+        raise HTTPException(404, "No segments found. Pipeline may not have completed.")
 
-    # Try translations.json first (has text_es), fall back to merged_segments.json
-    translations_path = workdir / "translations.json"
-    merged_path = workdir / "merged_segments.json"
+    headers = cache_headers(view.etag, view.mtime)
+    headers["Vary"] = "Accept-Encoding"
+    if is_not_modified(request, view.etag, view.mtime):
+        return Response(status_code=304, headers=headers)
 
-    if translations_path.exists():
-        data = read_json(translations_path)
-    elif merged_path.exists():
-        data = read_json(merged_path)
+    encoding = negotiate_encoding(request)
+    if from_ is None and to is None:
+        body, applied = await run_io(view.full_body, encoding)
     else:
-        raise HTTPException(404, "No segments found. Pipeline may not have completed.")
+        body, applied = await run_io(_window_body, view, from_, to, track, encoding)
 
-    # Load timeline map if available (has start_es/end_es)
-    timeline_map = None
-    timeline_map_path = workdir / "timeline_map.json"
-    if timeline_map_path.exists():
-        timeline_map = read_json(timeline_map_path)
-
-    segments = []
-    for i, seg in enumerate(data.get("segments", [])):
-        start = seg.get("start", 0)
-        end = seg.get("end", 0)
-
-        # Merge ES timestamps from timeline map by index
-        start_es = None
-        end_es = None
-        duration_es = None
-        if timeline_map and i < len(timeline_map.get("segments", [])):
-            tm_seg = timeline_map["segments"][i]
-            start_es = tm_seg.get("start_es")
-            end_es = tm_seg.get("end_es")
-            if start_es is not None and end_es is not None:
-                duration_es = round(end_es - start_es, 3)
-
-        segments.append(Segment(
-            start=start,
-            end=end,
-            duration=seg.get("duration", end - start),
-            speaker=seg.get("speaker", "UNKNOWN"),
-            text_en=seg.get("text_en", ""),
-            text_es=seg.get("text_es", seg.get("text_en", "")),
-            start_es=start_es,
-            end_es=end_es,
-            duration_es=duration_es,
-        ))
-
-    return segments
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,54 @@
+"""Timeline route: map playback positions between EN and ES tracks."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+
+from src.api.models import TimeMapping
+from src.api.offload import cached_artifact, get_job, run_io
+from src.utils.artifacts import artifact_exists, artifact_files, read_artifact
+from src.utils.timeline import TimelineIndex
+
+router = APIRouter(prefix="/api/jobs", tags=["timeline"])
+
+# Upper bound on timestamps per request
+MAX_BATCH = 1000
+
+
+def _load_index(path: Path) -> TimelineIndex | None:
+    if not artifact_exists(path):
+        return None
+    return TimelineIndex(read_artifact(path))
+
+
+@router.get("/{job_id}/timeline/map")
+async def map_time(
+    job_id: str,
+    t: list[float] = Query(..., description="One or more positions in seconds"),
+    from_: Literal["en", "es"] = Query(default="en", alias="from"),
+    to: Literal["en", "es"] = "es",
+) -> TimeMapping:
+    """Map one or more positions from the ``from`` to the ``to`` timeline."""
+    if len(t) > MAX_BATCH:
+        raise HTTPException(400, f"At most {MAX_BATCH} timestamps per request")
+
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(404, f"Job {job_id} not found")
+
+    path = Path(job.workdir) / "timeline_map.json"
+    index = await run_io(cached_artifact, f"timeline:{path}", artifact_files(path),
+                         lambda: _load_index(path))
+    if index is None:
+        raise HTTPException(404, "No timeline map found. Pipeline may not have completed.")
+
+    return TimeMapping(
+        from_track=from_,
+        to_track=to,
+        times=index.map_many(t, from_, to),
+        duration_en=index.duration_en,
+        duration_es=index.duration_es,
+    )
@@ -1,77 +1,201 @@
-"""Lightweight JSON-file storage for jobs."""
+"""SQLite-backed storage for jobs and step timing history.
+
+Each job is one row keyed by id, with ``status`` and ``created_at`` promoted
+to indexed columns and the full record kept as JSON.  The database runs in
+WAL mode so readers never block the pipeline workers writing progress.
+A legacy ``jobs.json`` is imported once on first use.
+
+``step_timings`` keeps the wall time of every executed pipeline step with
+the input features it depended on; ``src.api.eta`` fits its estimates on it.
+"""
 
 from __future__ import annotations
 
 import json
 import shutil
+import sqlite3
 import threading
-from datetime import datetime
 from pathlib import Path
 
 from src.api.models import Job, JobStatus
 
 # Project-level data directory
 DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
-JOBS_FILE = DATA_DIR / "jobs.json"
-
-_lock = threading.Lock()
-
-
-def _read_all() -> dict[str, dict]:
-    if not JOBS_FILE.exists():
-        return {}
-    with open(JOBS_FILE, "r") as f:
-        return json.load(f)
-
-
-def _write_all(data: dict[str, dict]):
-    JOBS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(JOBS_FILE, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+DB_FILE = DATA_DIR / "jobs.db"
+LEGACY_JOBS_FILE = DATA_DIR / "jobs.json"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_sha256 ON jobs(json_extract(data, '$.input_sha256'));
+
+CREATE TABLE IF NOT EXISTS step_timings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    device TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    features TEXT NOT NULL,
+    recorded_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_step_timings_step ON step_timings(step, id);
+"""
+
+_init_lock = threading.Lock()
+_initialized = False
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """Return this thread's connection, creating the schema on first use."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        return conn
+
+    DB_FILE.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_FILE, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    _local.conn = conn
+
+    global _initialized
+    with _init_lock:
+        if not _initialized:
+            conn.executescript(_SCHEMA)
+            _migrate_legacy(conn)
+            _initialized = True
+    return conn
+
+
+def _migrate_legacy(conn: sqlite3.Connection):
+    """Import jobs from the old ``jobs.json`` file, then rename it."""
+    if not LEGACY_JOBS_FILE.exists():
+        return
+    with open(LEGACY_JOBS_FILE, "r") as f:
+        legacy = json.load(f)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for raw in legacy.values():
+            job = Job(**raw)
+            conn.execute(
+                "INSERT OR IGNORE INTO jobs (id, status, created_at, data) VALUES (?, ?, ?, ?)",
+                _row(job),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    LEGACY_JOBS_FILE.rename(LEGACY_JOBS_FILE.with_suffix(".json.migrated"))
+
+
+def _row(job: Job) -> tuple[str, str, str, str]:
+    data = job.model_dump(mode="json")
+    return (
+        job.id,
+        data["status"],
+        data["created_at"],
+        json.dumps(data, ensure_ascii=False, default=str),
+    )
 
 
 def create_job(job: Job) -> Job:
-    with _lock:
-        jobs = _read_all()
-        jobs[job.id] = job.model_dump(mode="json")
-        _write_all(jobs)
+    conn = _connect()
+    conn.execute(
+        "INSERT OR REPLACE INTO jobs (id, status, created_at, data) VALUES (?, ?, ?, ?)",
+        _row(job),
+    )
     return job
 
 
 def get_job(job_id: str) -> Job | None:
-    with _lock:
-        jobs = _read_all()
-    raw = jobs.get(job_id)
-    if raw is None:
+    row = _connect().execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
         return None
-    return Job(**raw)
-
-
-def list_jobs() -> list[Job]:
-    with _lock:
-        jobs = _read_all()
-    result = [Job(**v) for v in jobs.values()]
-    result.sort(key=lambda j: j.created_at, reverse=True)
-    return result
+    return Job(**json.loads(row[0]))
+
+
+def list_jobs(status: JobStatus | None = None) -> list[Job]:
+    """List jobs newest first, optionally filtered by status."""
+    conn = _connect()
+    if status is None:
+        rows = conn.execute("SELECT data FROM jobs ORDER BY created_at DESC").fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT data FROM jobs WHERE status = ? ORDER BY created_at DESC",
+            (JobStatus(status).value,),
+        ).fetchall()
+    return [Job(**json.loads(r[0])) for r in rows]
+
+
+def count_jobs_by_status() -> dict[str, int]:
+    rows = _connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+    return dict(rows)
+
+
+def find_completed_by_hash(sha256: str, max_speakers: int | None = None,
+                           preset: str | None = None) -> Job | None:
+    """Return the newest completed job whose input has the given SHA-256.
+
+    Only jobs run with the same speaker limit and preset qualify.
+    """
+    rows = _connect().execute(
+        "SELECT data FROM jobs WHERE json_extract(data, '$.input_sha256') = ? "
+        "AND status = ? ORDER BY created_at DESC",
+        (sha256, JobStatus.completed.value),
+    ).fetchall()
+    for (data,) in rows:
+        job = Job(**json.loads(data))
+        if (job.max_speakers == max_speakers and job.preset == preset
+                and Path(job.workdir).exists()):
+            return job
+    return None
 
 
 def update_job(job_id: str, **fields) -> Job | None:
-    with _lock:
-        jobs = _read_all()
-        if job_id not in jobs:
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            conn.execute("ROLLBACK")
             return None
-        jobs[job_id].update(fields)
-        _write_all(jobs)
-        return Job(**jobs[job_id])
+        raw = json.loads(row[0])
+        raw.update(fields)
+        job = Job(**raw)
+        _, status, created_at, data = _row(job)
+        conn.execute(
+            "UPDATE jobs SET status = ?, created_at = ?, data = ? WHERE id = ?",
+            (status, created_at, data, job_id),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return job
 
 
 def delete_job(job_id: str) -> bool:
-    with _lock:
-        jobs = _read_all()
-        if job_id not in jobs:
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            conn.execute("ROLLBACK")
             return False
-        job_data = jobs.pop(job_id)
-        _write_all(jobs)
+        conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    job_data = json.loads(row[0])
 
     # Clean up files
     input_path = Path(job_data.get("input_path", ""))
@@ -82,3 +206,25 @@ def delete_job(job_id: str) -> bool:
         shutil.rmtree(workdir, ignore_errors=True)
 
     return True
+
+
+def record_step_timing(job_id: str, step: str, device: str, seconds: float, features: dict):
+    _connect().execute(
+        "INSERT INTO step_timings (job_id, step, device, seconds, features) VALUES (?, ?, ?, ?, ?)",
+        (job_id, step, device, seconds, json.dumps(features)),
+    )
+
+
+def recent_step_timings(per_step: int = 50) -> list[dict]:
+    """The newest *per_step* timings of every step, oldest first."""
+    rows = _connect().execute(
+        "SELECT step, device, seconds, features FROM ("
+        "  SELECT *, ROW_NUMBER() OVER (PARTITION BY step ORDER BY id DESC) AS rn"
+        "  FROM step_timings"
+        ") WHERE rn <= ? ORDER BY id",
+        (per_step,),
+    ).fetchall()
+    return [
+        {"step": step, "device": device, "seconds": seconds, "features": json.loads(features)}
+        for step, device, seconds, features in rows
+    ]
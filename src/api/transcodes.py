@@ -0,0 +1,198 @@
+"""Low-bandwidth Opus variants of job audio in a size-bounded disk cache.
+
+Variants live under ``data/transcodes/{job_id}/`` and are named after the
+source file version (mtime + size), so a re-rendered track never serves a
+stale encode.  When the cache grows past ``transcode.cache_mb`` the least
+recently served variants are deleted; access time is stamped explicitly on
+every hit so this works on ``noatime`` mounts too.
+
+Encodes run on their own small pool so a long ffmpeg job never occupies
+the request I/O threads, and concurrent requests for the same variant
+share one encode.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from src.api import storage
+from src.utils.audio import transcode_opus
+
+DEFAULT_BITRATES = [32, 64]
+DEFAULT_CACHE_MB = 4096
+
+# Concurrent ffmpeg encodes (each one is single-threaded for libopus).
+TRANSCODE_THREADS = 2
+
+# Only restamp the access time of a hit once per this many seconds.
+_TOUCH_INTERVAL_NS = 60 * 1_000_000_000
+
+_pool = ThreadPoolExecutor(max_workers=TRANSCODE_THREADS, thread_name_prefix="transcode")
+_inflight: dict[Path, Future] = {}
+_inflight_lock = threading.Lock()
+_evict_lock = threading.Lock()
+
+
+def _cache_dir() -> Path:
+    return storage.DATA_DIR / "transcodes"
+
+
+def track_candidates(input_path: str | Path, workdir: str | Path, track: str) -> list[Path]:
+    """Files that may hold *track*, in the order the audio route serves them."""
+    if track == "original":
+        return [Path(input_path)]
+    workdir = Path(workdir)
+    return [workdir / "rendered.mp3", workdir / "rendered.wav"]
+
+
+def variant_bitrates(config: dict) -> list[int]:
+    """Opus bitrates (kbps) offered by the audio route."""
+    return sorted(config.get("transcode", {}).get("opus_bitrates") or DEFAULT_BITRATES)
+
+
+def select_bitrate(variant: str | None, accept: str | None, config: dict) -> int | None:
+    """Resolve the requested variant to a bitrate, or None for the source file.
+
+    An explicit ``?variant=opus32`` wins; ``?variant=source`` forces the
+    original.  Otherwise clients whose ``Accept`` names Opus explicitly
+    (``audio/opus`` or ``audio/ogg; codecs=opus``) get the configured
+    ``transcode.accept_bitrate``.  Wildcards never select a variant.
+
+    Raises:
+        ValueError: If *variant* is not one of the offered names.
+    """
+    bitrates = variant_bitrates(config)
+    if variant is not None:
+        if variant == "source":
+            return None
+        for kbps in bitrates:
+            if variant == f"opus{kbps}":
+                return kbps
+        offered = ", ".join(["source"] + [f"opus{k}" for k in bitrates])
+        raise ValueError(f"Unknown variant '{variant}'. Available: {offered}")
+
+    if accept and _accepts_opus(accept):
+        kbps = config.get("transcode", {}).get("accept_bitrate", bitrates[-1])
+        return kbps if kbps in bitrates else bitrates[-1]
+    return None
+
+
+def _accepts_opus(accept: str) -> bool:
+    for entry in accept.split(","):
+        media, *params = [p.strip().lower() for p in entry.split(";")]
+        params = dict(p.split("=", 1) for p in params if "=" in p)
+        if params.get("q", "1").strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if media == "audio/opus":
+            return True
+        if media == "audio/ogg" and params.get("codecs", "").strip('"') == "opus":
+            return True
+    return False
+
+
+def variant_path(job_id: str, track: str, source_stat: os.stat_result, kbps: int) -> Path:
+    version = f"{source_stat.st_mtime_ns:x}-{source_stat.st_size:x}"
+    return _cache_dir() / job_id / f"{track}.{kbps}k.{version}.opus"
+
+
+def cached_variant(path: Path) -> os.stat_result | None:
+    """Stat an existing variant and mark it as recently used."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    now = time.time_ns()
+    if now - st.st_atime_ns > _TOUCH_INTERVAL_NS:
+        try:
+            os.utime(path, ns=(now, st.st_mtime_ns))
+        except FileNotFoundError:
+            return None
+    return st
+
+
+def submit_variant(job_id: str, track: str, source: Path, source_stat: os.stat_result,
+                   kbps: int, config: dict) -> Future:
+    """Schedule (or join) the encode of one variant; the future yields its path."""
+    path = variant_path(job_id, track, source_stat, kbps)
+    cache_bytes = config.get("transcode", {}).get("cache_mb", DEFAULT_CACHE_MB) * 1024 * 1024
+    with _inflight_lock:
+        future = _inflight.get(path)
+        if future is None:
+            future = _pool.submit(_encode, source, path, kbps, cache_bytes)
+            _inflight[path] = future
+            future.add_done_callback(lambda _f: _forget(path))
+    return future
+
+
+def _forget(path: Path):
+    with _inflight_lock:
+        _inflight.pop(path, None)
+
+
+def _encode(source: Path, path: Path, kbps: int, cache_bytes: int) -> Path:
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Drop encodes of older versions of the same track and bitrate
+    track = path.name.split(".", 1)[0]
+    for stale in path.parent.glob(f"{track}.{kbps}k.*.opus"):
+        stale.unlink(missing_ok=True)
+
+    tmp = path.with_name(f".{path.name}.part")
+    try:
+        transcode_opus(source, tmp, kbps)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    _evict(cache_bytes, keep=path)
+    return path
+
+
+def _evict(cache_bytes: int, keep: Path):
+    """Delete least recently used variants until the cache fits *cache_bytes*."""
+    with _evict_lock:
+        entries = []
+        total = 0
+        for path in _cache_dir().glob("*/*.opus"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            total += st.st_size
+            entries.append((st.st_atime_ns, st.st_size, path))
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= cache_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def pregenerate(job_id: str, input_path: str, workdir: str, config: dict):
+    """Queue every configured variant of both tracks without waiting for them."""
+    if not config.get("transcode", {}).get("pregenerate", True):
+        return
+    for track in ("original", "translated"):
+        for source in track_candidates(input_path, workdir, track):
+            try:
+                st = source.stat()
+            except FileNotFoundError:
+                continue
+            for kbps in variant_bitrates(config):
+                submit_variant(job_id, track, source, st, kbps, config)
+            break
+
+
+def drop_variants(job_id: str):
+    """Remove all cached variants of a job."""
+    shutil.rmtree(_cache_dir() / job_id, ignore_errors=True)
@@ -0,0 +1,248 @@
+"""Streaming upload helpers: multipart parsing, chunked writes, SHA-256 and audio sniffing."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from fastapi import HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import python_multipart as multipart
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    import multipart
+    from multipart.multipart import parse_options_header
+
+# Magic numbers of the containers the pipeline can decode via ffmpeg.
+# Each entry is (offset, signature).
+_AUDIO_SIGNATURES: list[tuple[int, bytes]] = [
+    (0, b"RIFF"),              # WAV (checked together with "WAVE" below)
+    (0, b"ID3"),               # MP3 with ID3v2 tag
+    (0, b"fLaC"),              # FLAC
+    (0, b"OggS"),              # Ogg Vorbis / Opus
+    (4, b"ftyp"),              # MP4 / M4A
+    (0, b"\x1a\x45\xdf\xa3"),  # Matroska / WebM
+]
+
+SNIFF_BYTES = 12
+
+# Room for the boundaries, part headers and small fields around the file
+# when checking Content-Length against the upload limit
+MAX_FORM_OVERHEAD_BYTES = 64 * 1024
+MAX_FIELD_BYTES = 4 * 1024
+
+
+def is_audio_header(header: bytes) -> bool:
+    """Return True if *header* starts like an audio container we accept."""
+    if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0:
+        return True  # raw MPEG audio frame sync (MP3 / AAC ADTS)
+    for offset, sig in _AUDIO_SIGNATURES:
+        if header[offset:offset + len(sig)] == sig:
+            if sig == b"RIFF":
+                return header[8:12] == b"WAVE"
+            return True
+    return False
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(413, f"El archivo supera el maximo de {max_bytes // (1024 * 1024)} MB")
+
+
+class _FileSink:
+    """Writes the file part of an upload to a ``.part`` file as its bytes arrive.
+
+    The header is sniffed and the size checked before anything past the
+    first chunk is kept, so a non-audio or oversize upload is rejected
+    while it is still being received.
+    """
+
+    def __init__(self, dest: Path, max_bytes: int, chunk_size: int):
+        self.dest = dest
+        self.tmp_path = dest.with_name(f".{dest.name}.part")
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self._buffer = bytearray()
+        self._sniffed = False
+        self._out = None
+        self._done = False
+
+    async def open(self):
+        self.dest.parent.mkdir(parents=True, exist_ok=True)
+        self._out = await run_in_threadpool(open, self.tmp_path, "wb")
+
+    def _sniff(self):
+        if not is_audio_header(bytes(self._buffer[:SNIFF_BYTES])):
+            raise HTTPException(415, "El archivo no parece ser audio (.mp3, .wav, .flac, .ogg, .m4a)")
+        self._sniffed = True
+
+    async def _flush(self):
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        self.digest.update(chunk)
+        await run_in_threadpool(self._out.write, chunk)
+
+    async def write(self, data: bytes):
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise _too_large(self.max_bytes)
+        self._buffer += data
+        if not self._sniffed and len(self._buffer) >= SNIFF_BYTES:
+            self._sniff()
+        if self._sniffed and len(self._buffer) >= self.chunk_size:
+            await self._flush()
+
+    async def finish(self):
+        """Rename the complete file into place."""
+        if not self._sniffed:
+            self._sniff()  # shorter than the sniffed header
+        await self._flush()
+        await run_in_threadpool(self._out.close)
+        os.replace(self.tmp_path, self.dest)
+        self._done = True
+
+    def abort(self):
+        if self._out is not None:
+            self._out.close()
+        self.tmp_path.unlink(missing_ok=True)
+        if self._done:
+            self.dest.unlink(missing_ok=True)
+
+
+class ReceivedUpload(NamedTuple):
+    filename: str
+    path: Path
+    size: int
+    sha256: str
+    fields: dict[str, str]
+
+
+async def receive_upload(
+    request: Request,
+    dest_for: Callable[[str], Path],
+    max_bytes: int,
+    chunk_size: int = 1024 * 1024,
+    file_field: str = "file",
+) -> ReceivedUpload:
+    """Parse a ``multipart/form-data`` request body as it streams in.
+
+    The file part (*file_field*) is written straight to a hidden ``.part``
+    file next to ``dest_for(filename)`` in chunks of *chunk_size*, hashed on
+    the way, and renamed into place once complete, so a partially received
+    file is never picked up by the pipeline.  The other parts are returned
+    as ``fields``.  Nothing is spooled first: the size limit (and the
+    ``Content-Length``, when sent) and the audio sniffing are enforced as
+    the bytes arrive, and the rest of a rejected body is never read.
+
+    Raises:
+        HTTPException: 400 for a malformed form or a missing file,
+            413 if the upload exceeds *max_bytes*,
+            415 if the header does not look like audio.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(400, "Se esperaba un formulario multipart/form-data")
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > max_bytes + MAX_FORM_OVERHEAD_BYTES:
+        raise _too_large(max_bytes)
+
+    # The parser's callbacks are synchronous: they queue events, which are
+    # handled (with awaited writes) after each chunk is fed
+    events: list[tuple[str, object]] = []
+    header_field, header_value = bytearray(), bytearray()
+    headers: dict[bytes, bytes] = {}
+
+    def on_header_field(data: bytes, start: int, end: int):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        events.append(("part", dict(headers)))
+        headers.clear()
+
+    def on_part_data(data: bytes, start: int, end: int):
+        events.append(("data", bytes(data[start:end])))
+
+    def on_part_end():
+        events.append(("end", None))
+
+    parser = multipart.MultipartParser(boundary, {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    sink: _FileSink | None = None
+    filename = ""
+    fields: dict[str, str] = {}
+    name: str | None = None
+    in_file = False
+    value = bytearray()
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for kind, payload in events:
+                if kind == "part":
+                    _, options = parse_options_header(payload.get(b"content-disposition", b""))
+                    name = options.get(b"name", b"").decode("utf-8", "replace")
+                    in_file = name == file_field and b"filename" in options
+                    if in_file:
+                        if sink is not None:
+                            raise HTTPException(400, "Solo se acepta un archivo por job")
+                        filename = options[b"filename"].decode("utf-8", "replace")
+                        if not filename:
+                            raise HTTPException(400, "No filename provided")
+                        sink = _FileSink(dest_for(filename), max_bytes, chunk_size)
+                        await sink.open()
+                elif kind == "data":
+                    if in_file:
+                        await sink.write(payload)
+                    else:
+                        value += payload
+                        if len(value) > MAX_FIELD_BYTES:
+                            raise HTTPException(400, f"Campo demasiado largo: {name}")
+                elif in_file:
+                    await sink.finish()
+                    in_file = False
+                else:
+                    fields[name] = value.decode("utf-8", "replace")
+                    value.clear()
+            events.clear()
+        parser.finalize()
+        if sink is None:
+            raise HTTPException(400, "No file provided")
+        if in_file:
+            raise HTTPException(400, "Formulario incompleto")
+    except BaseException:
+        if sink is not None:
+            sink.abort()
+        raise
+
+    return ReceivedUpload(filename, sink.dest, sink.size, sink.digest.hexdigest(), fields)
+
+
+def copy_artifacts(src_workdir: Path, dst_workdir: Path):
+    """Populate *dst_workdir* with the artifacts of a previous job.
+
+    Steps then skip themselves because their outputs already exist.  Files
+    are copied rather than hard-linked so that a later ``--force`` re-run
+    of one job can never rewrite the other job's outputs in place.
+    """
+    shutil.copytree(src_workdir, dst_workdir, dirs_exist_ok=True)
@@ -4,14 +4,18 @@ from __future__ import annotations
 
 import threading
 import traceback
+from contextlib import nullcontext
 from pathlib import Path
 
+from src.api.eta import JobEta, eta_at
+from src.api.metrics import registry
 from src.api.models import JobStatus
 from src.api.progress import progress_manager
+from src.api.readiness import resident_models, step_lock
 from src.api.storage import update_job
-
-
-STEPS_ORDER = ["asr", "diarize", "merge", "translate", "tts", "render"]
+from src.pipeline.models import ModelCache
+from src.pipeline.registry import STEPS_ORDER, get_step
+from src.utils.audio import probe_duration
 
 
 def _run_pipeline(
@@ -25,36 +29,42 @@ def _run_pipeline(
 
     Updates job status and broadcasts progress via WebSocket.
     """
-    from src.pipeline.asr import ASRStep
-    from src.pipeline.diarize import DiarizeStep
-    from src.pipeline.merge import MergeStep
-    from src.pipeline.translate import TranslateStep
-    from src.pipeline.tts import TTSStep
-    from src.pipeline.render import RenderStep
-
-    step_map = {
-        "asr": ASRStep,
-        "diarize": DiarizeStep,
-        "merge": MergeStep,
-        "translate": TranslateStep,
-        "tts": TTSStep,
-        "render": RenderStep,
-    }
+    from src.pipeline.bus import create_bus
 
     work_path = Path(workdir)
+    # Steps hand their outputs to the next one in memory; files follow in the background
+    bus = create_bus(config)
+    eta = JobEta(job_id, work_path, config, bus)
+    step_metrics: dict[str, dict] = {}
 
     def make_callback(jid: str):
         """Create a progress_callback bound to this job_id."""
         def callback(event: dict):
-            progress_manager.broadcast_sync(jid, event)
-            # Also update current_step in storage
+            eta.observe(event)
+            remaining = eta.remaining()
+            progress_manager.broadcast_sync(jid, {**event, "eta_seconds": remaining})
+            # Also update current_step, the estimate and step metrics in storage
             if event.get("type") == "step_start":
-                update_job(jid, current_step=event.get("step"))
+                update_job(jid, current_step=event.get("step"), eta_at=eta_at(remaining))
+            elif event.get("type") == "step_complete" and "metrics" in event:
+                step_metrics[event["step"]] = event["metrics"]
+                registry.observe_step(event["step"], event["metrics"])
+                update_job(jid, step_metrics=step_metrics, eta_at=eta_at(remaining))
+            elif event.get("type") == "error" and event.get("step"):
+                registry.inc("loro_step_failures_total", step=event["step"])
+            elif eta.should_persist(event):
+                update_job(jid, eta_at=eta_at(remaining))
         return callback
 
     progress_callback = make_callback(job_id)
+    # Models warmed at startup stay resident; anything else a step of this
+    # job loads (other presets, ASR shard workers, extra diarization
+    # pipelines) is dropped after the step
+    resident = resident_models()
+    models = ModelCache(fallback=resident) if resident is not None else None
 
     try:
+        progress_manager.reset(job_id)
         update_job(job_id, status=JobStatus.processing)
 
         # YouTube download pre-step
@@ -71,22 +81,50 @@ def _run_pipeline(
             update_job(job_id, input_path=input_path, filename=video_title)
             progress_callback({"type": "step_complete", "step": "download"})
 
-        for step_name in STEPS_ORDER:
-            step_cls = step_map[step_name]
-            step = step_cls(workdir=work_path, config=config, force=False)
-            step.run(progress_callback=progress_callback, input_audio=input_path)
-
-        update_job(job_id, status=JobStatus.completed, current_step=None)
+        steps = [
+            get_step(name)(workdir=work_path, config=config, force=False,
+                           models=models, bus=bus)
+            for name in STEPS_ORDER
+        ]
+        audio_seconds = probe_duration(input_path)
+        eta.set_audio(audio_seconds)
+        eta.set_plan([s.name for s in steps if not s.outputs_exist()])
+        update_job(job_id, audio_seconds=audio_seconds, eta_at=eta_at(eta.remaining()))
+
+        for step in steps:
+            # Jobs take turns on the resident models, one per model step
+            with step_lock(step.name) if resident is not None and step.loads_models else nullcontext():
+                step.run(progress_callback=progress_callback, input_audio=input_path)
+            if models is not None:
+                models.clear()  # like a standalone step, free what it loaded besides the pool
+        if bus is not None:
+            bus.flush()
+
+        update_job(job_id, status=JobStatus.completed, current_step=None, eta_at=None)
         progress_manager.broadcast_sync(job_id, {"type": "pipeline_complete"})
 
+        # Low-bandwidth variants encode in the background after the job is done
+        try:
+            from src.api.transcodes import pregenerate
+
+            pregenerate(job_id, input_path, workdir, config)
+        except Exception:
+            traceback.print_exc()
+
     except Exception as exc:
         tb = traceback.format_exc()
         error_msg = f"{exc}\n{tb}"
-        update_job(job_id, status=JobStatus.failed, error=error_msg, current_step=None)
+        update_job(job_id, status=JobStatus.failed, error=error_msg, current_step=None,
+                   eta_at=None)
         progress_manager.broadcast_sync(job_id, {
             "type": "error",
             "message": str(exc),
         })
+    finally:
+        if bus is not None:
+            bus.shutdown()
+        if models is not None:
+            models.clear()
 
 
 def start_pipeline(
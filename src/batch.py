@@ -0,0 +1,254 @@
+"""Batch CLI — run many inputs through the pipeline in one process.
+
+Work is grouped by step: every input goes through ASR, then every input
+through diarization, and so on.  Each model is loaded once per step type
+and shared by all inputs (see :class:`src.pipeline.models.ModelCache`),
+then released before the next step type loads its own.  Steps without a
+model (merge, render) process ``--jobs`` inputs concurrently; model steps
+use ``batch.model_step_jobs`` (default 1, since one model instance is
+shared).  Inputs that fail drop out of the later steps.
+"""
+
+import glob
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from src.config import (
+    apply_cli_overrides,
+    apply_preset,
+    ensure_workdir,
+    load_config,
+    validate_environment,
+)
+from src.pipeline.registry import STEPS_ORDER, get_step
+from src.utils.io import write_json
+
+console = Console()
+
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".flac", ".ogg", ".opus", ".webm", ".mp4"}
+MANIFEST_EXTENSIONS = {".txt", ".lst", ".json"}
+
+
+class BatchItem:
+    """One input of the batch and what happened to it."""
+
+    def __init__(self, input_path: Path, workdir: Path):
+        self.input_path = input_path
+        self.workdir = workdir
+        self.steps: dict[str, dict | None] = {}  # step -> metrics (None = skipped)
+        self.failed_step: str | None = None
+        self.error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "input": str(self.input_path),
+            "workdir": str(self.workdir),
+            "status": "failed" if self.failed_step else "completed",
+            "failed_step": self.failed_step,
+            "error": self.error,
+            "wall_seconds": round(sum(m["wall_seconds"] for m in self.steps.values() if m), 3),
+            "steps": self.steps,
+        }
+
+
+def _read_manifest(path: Path) -> list[Path]:
+    """Paths listed in a manifest: a JSON list, or one path per line (``#`` comments)."""
+    if path.suffix == ".json":
+        entries = json.loads(path.read_text())
+    else:
+        entries = [line.strip() for line in path.read_text().splitlines()]
+        entries = [e for e in entries if e and not e.startswith("#")]
+    return [p if p.is_absolute() else path.parent / p for p in map(Path, entries)]
+
+
+def collect_inputs(specs: tuple[str, ...]) -> list[Path]:
+    """Expand directories, manifests and glob patterns into audio files, in order."""
+    found: list[Path] = []
+    for spec in specs:
+        path = Path(spec)
+        if path.is_dir():
+            found += sorted(p for p in path.iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS)
+        elif path.is_file() and path.suffix.lower() in MANIFEST_EXTENSIONS:
+            found += _read_manifest(path)
+        elif path.is_file():
+            found.append(path)
+        else:
+            matches = sorted(Path(p) for p in glob.glob(spec, recursive=True))
+            if not matches:
+                raise click.BadParameter(f"no input matches {spec!r}", param_hint="INPUTS")
+            found += [p for p in matches if p.suffix.lower() in AUDIO_EXTENSIONS]
+
+    unique, seen = [], set()
+    for path in found:
+        resolved = path.resolve()
+        if not resolved.is_file():
+            raise click.BadParameter(f"input not found: {path}", param_hint="INPUTS")
+        if resolved not in seen:
+            seen.add(resolved)
+            unique.append(resolved)
+    return unique
+
+
+def _workdir_names(inputs: list[Path]) -> list[str]:
+    """File stems, disambiguated with a hash of the path where they collide."""
+    stems = [p.stem for p in inputs]
+    return [
+        stem if stems.count(stem) == 1
+        else f"{stem}-{hashlib.sha1(str(path).encode()).hexdigest()[:6]}"
+        for stem, path in zip(stems, inputs)
+    ]
+
+
+def _run_step(step_cls, item: BatchItem, config: dict, force: bool, models):
+    step = step_cls(workdir=item.workdir, config=config, force=force, models=models)
+    try:
+        step.run(input_audio=str(item.input_path))
+    except Exception as e:
+        item.failed_step = step.name
+        item.error = str(e)
+        console.print(f"  [bold red]{item.input_path.name}: {step.name} failed:[/bold red] {e}")
+    finally:
+        item.steps[step.name] = step.metrics
+        if step.metrics is not None:
+            write_json({k: v for k, v in item.steps.items() if v},
+                       item.workdir / "step_metrics.json")
+
+
+@click.command()
+@click.argument("inputs", nargs=-1, required=True)
+@click.option("--workdir-root", required=True, type=click.Path(),
+              help="Each input gets its own workdir under this directory")
+@click.option("--config", "config_path", default="configs/default.yaml",
+              help="Path to YAML config file")
+@click.option("--max-speakers", type=int, default=None,
+              help="Max number of speakers (overrides config)")
+@click.option("--preset", default=None,
+              help="Speed/quality preset from the config (e.g. fast, balanced, quality)")
+@click.option("--force", is_flag=True, default=False,
+              help="Re-run all steps even if outputs exist")
+@click.option("--steps", multiple=True, type=click.Choice(STEPS_ORDER),
+              help="Run only specific steps (default: all)")
+@click.option("--jobs", type=int, default=None,
+              help="Inputs processed concurrently by steps without a model (default: batch.jobs)")
+@click.option("--report", "report_path", type=click.Path(), default=None,
+              help="Summary report path (default: <workdir-root>/batch_report.json)")
+def main(inputs: tuple[str, ...], workdir_root: str, config_path: str,
+         max_speakers: int | None, preset: str | None, force: bool, steps: tuple[str, ...],
+         jobs: int | None, report_path: str | None):
+    """Translate many interviews: INPUTS are audio files, directories, globs or manifests."""
+    console.print(Panel.fit(
+        "[bold]Interview Translator[/bold] — batch",
+        border_style="cyan",
+    ))
+
+    config = load_config(config_path)
+    try:
+        config = apply_preset(config, preset)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--preset")
+    config = apply_cli_overrides(config, max_speakers=max_speakers)
+    batch_cfg = config.get("batch", {})
+    jobs = max(1, jobs or batch_cfg.get("jobs", 2))
+    model_jobs = max(1, min(jobs, batch_cfg.get("model_step_jobs", 1)))
+
+    validate_environment()
+
+    input_paths = collect_inputs(inputs)
+    if not input_paths:
+        console.print("[yellow]No audio inputs found[/yellow]")
+        sys.exit(1)
+    root = Path(workdir_root)
+    items = [
+        BatchItem(path, ensure_workdir(str(root / name)))
+        for path, name in zip(input_paths, _workdir_names(input_paths))
+    ]
+    console.print(f"  Inputs:  {len(items)}")
+    console.print(f"  Workdir: {root}")
+    console.print(f"  Jobs:    {jobs} ({model_jobs} for model steps)")
+    if config.get("preset"):
+        console.print(f"  Preset:  {config['preset']}")
+    console.print()
+
+    from src.pipeline.models import ModelCache
+
+    active_steps = [s for s in STEPS_ORDER if s in steps] if steps else STEPS_ORDER
+    models = ModelCache()
+    started = datetime.now()
+    t0 = time.perf_counter()
+    step_wall: dict[str, float] = {}
+
+    for step_name in active_steps:
+        pending = [item for item in items if item.failed_step is None]
+        if not pending:
+            break
+        step_cls = get_step(step_name)
+        # Steps that load a model share one instance across inputs
+        workers = model_jobs if step_cls.loads_models else jobs
+        console.print(f"[bold]{step_name}[/bold] — {len(pending)} input(s), {workers} at a time")
+        t_step = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"batch-{step_name}") as pool:
+            list(pool.map(
+                lambda item: _run_step(step_cls, item, config, force, models),
+                pending,
+            ))
+        step_wall[step_name] = round(time.perf_counter() - t_step, 3)
+        models.clear()
+
+    report = {
+        "started_at": started.isoformat(timespec="seconds"),
+        "wall_seconds": round(time.perf_counter() - t0, 3),
+        "config": config_path,
+        "preset": config.get("preset"),
+        "steps": active_steps,
+        "jobs": jobs,
+        "model_step_jobs": model_jobs,
+        "step_wall_seconds": step_wall,
+        "model_load_seconds": models.load_seconds,
+        "completed": sum(1 for item in items if item.failed_step is None),
+        "failed": sum(1 for item in items if item.failed_step is not None),
+        "inputs": [item.to_dict() for item in items],
+    }
+    report_file = Path(report_path) if report_path else root / "batch_report.json"
+    write_json(report, report_file)
+
+    _print_summary(items, active_steps)
+    console.print(
+        f"\n  {report['completed']} completed, {report['failed']} failed "
+        f"in {report['wall_seconds']:.1f}s — report: {report_file}"
+    )
+    if report["failed"]:
+        sys.exit(1)
+
+
+def _print_summary(items: list[BatchItem], active_steps: list[str]):
+    table = Table(title="Batch summary (wall seconds per step)")
+    for col in ("input", "status", *active_steps, "total"):
+        table.add_column(col)
+    for item in items:
+        cells = []
+        for name in active_steps:
+            if name not in item.steps:
+                cells.append("-")
+            elif item.steps[name] is None:
+                cells.append("skip")
+            else:
+                cells.append(f"{item.steps[name]['wall_seconds']:.1f}")
+        status = (f"[red]failed ({item.failed_step})[/red]" if item.failed_step
+                  else "[green]ok[/green]")
+        total = sum(m["wall_seconds"] for m in item.steps.values() if m)
+        table.add_row(item.input_path.name, status, *cells, f"{total:.1f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,39 @@ def apply_cli_overrides(config: dict, **kwargs) -> dict:
         config["diarization"]["max_speakers"] = kwargs["max_speakers"]
     if kwargs.get("asr_model") is not None:
         config["asr"]["model_size"] = kwargs["asr_model"]
+    if kwargs.get("profile"):
+        config.setdefault("profiling", {})["steps"] = list(kwargs["profile"])
+    if kwargs.get("profile_memory"):
+        config.setdefault("profiling", {})["memory"] = True
+    return config
+
+
+def preset_names(config: dict) -> list[str]:
+    return list(config.get("presets") or {})
+
+
+def apply_preset(config: dict, name: str | None = None) -> dict:
+    """Overlay the keys of preset *name* (default: ``config["preset"]``) onto config.
+
+    The applied name is kept in ``config["preset"]``.  Raises ValueError for
+    an unknown preset.
+    """
+    name = name or config.get("preset")
+    if not name:
+        return config
+    presets = config.get("presets") or {}
+    if name not in presets:
+        raise ValueError(
+            f"Unknown preset '{name}'. Available: {', '.join(presets) or 'none'}"
+        )
+    for section, values in presets[name].items():
+        if section == "description":
+            continue
+        if isinstance(values, dict):
+            config.setdefault(section, {}).update(values)
+        else:
+            config[section] = values
+    config["preset"] = name
     return config
 
 
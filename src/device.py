@@ -5,8 +5,15 @@ Apple Silicon (MPS) compatibility:
 - pyannote.audio: Inestable en MPS → CPU
 - NLLB-200 (transformers): MPS funciona → MPS
 - Coqui XTTS v2: Se cuelga en MPS → CPU
+
+int8 on CPU (WhisperX via CTranslate2, NLLB via CTranslate2 or torch
+dynamic quantization) is only chosen when the CPU has fast int8 kernels;
+see :func:`cpu_int8_supported`.
 """
 
+import functools
+import platform
+
 import torch
 
 # MPS compatibility map per component
@@ -43,3 +50,96 @@ def get_device(component: str, config_override: str = "auto") -> torch.device:
 def get_device_str(component: str, config_override: str = "auto") -> str:
     """Get device as string — needed for WhisperX which uses strings, not torch.device."""
     return str(get_device(component, config_override))
+
+
+def _cpu_flags() -> set[str]:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    return set(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+
+def _is_x86() -> bool:
+    return platform.machine().lower() in ("x86_64", "amd64", "i686")
+
+
+@functools.cache
+def quantized_engine() -> str | None:
+    """torch quantized engine with fast kernels on this CPU, if any.
+
+    fbgemm/x86 needs AVX2 (without it torch falls back to slow reference
+    kernels); qnnpack covers ARM, including Apple Silicon.
+    """
+    engines = torch.backends.quantized.supported_engines
+    if _is_x86():
+        flags = _cpu_flags()
+        if flags and "avx2" not in flags:
+            return None
+        candidates = ("x86", "fbgemm")
+    else:
+        candidates = ("qnnpack",)
+    return next((e for e in candidates if e in engines), None)
+
+
+@functools.cache
+def cpu_int8_supported() -> bool:
+    """Whether int8 inference is fast and numerically safe on this CPU.
+
+    CTranslate2 reports what its kernels support; without it, fall back to
+    the torch quantized engines.
+    """
+    try:
+        import ctranslate2
+
+        return "int8" in ctranslate2.get_supported_compute_types("cpu")
+    except ImportError:
+        return quantized_engine() is not None
+
+
+def get_compute_type(device: str, requested: str = "auto") -> str:
+    """CTranslate2 compute type for WhisperX on *device*.
+
+    ``auto`` picks float16 on CUDA and int8 on CPUs that support it
+    (float32 otherwise); an explicit int8 type on a CPU without int8
+    kernels is downgraded to float32.
+    """
+    if device.startswith("cuda"):
+        return "float16" if requested == "auto" else requested
+    if requested == "auto":
+        return "int8" if cpu_int8_supported() else "float32"
+    if requested.startswith("int8") and not cpu_int8_supported():
+        return "float32"
+    return requested
+
+
+def get_int8_backend(device: torch.device, requested: str | bool = "auto") -> str | None:
+    """int8 backend for the translation model: "ctranslate2", "dynamic" or None.
+
+    Only used on CPU.  ``auto`` prefers a CTranslate2 conversion when the
+    package is installed, then torch dynamic quantization; ``none`` keeps
+    full precision.
+    """
+    if device.type != "cpu" or requested in (None, False, "none", "off"):
+        return None
+    if requested == "ctranslate2":
+        try:
+            import ctranslate2  # noqa: F401
+        except ImportError:
+            raise RuntimeError("translation.quantization=ctranslate2 requires the ctranslate2 package")
+        return requested
+    if requested == "dynamic":
+        return requested if quantized_engine() is not None else None
+    if requested != "auto":
+        raise ValueError(f"Unknown translation.quantization: {requested}")
+    if not cpu_int8_supported():
+        return None
+    try:
+        import ctranslate2  # noqa: F401
+
+        return "ctranslate2"
+    except ImportError:
+        return "dynamic" if quantized_engine() is not None else None
@@ -6,12 +6,31 @@ from pathlib import Path
 import click
 from rich.console import Console
 from rich.panel import Panel
-
-from src.config import apply_cli_overrides, ensure_workdir, load_config, validate_environment
+from rich.table import Table
+
+from src.config import (
+    apply_cli_overrides,
+    apply_preset,
+    ensure_workdir,
+    load_config,
+    validate_environment,
+)
+from src.pipeline.registry import STEPS_ORDER, get_step
+from src.utils.io import write_json
 
 console = Console()
 
-STEPS_ORDER = ["asr", "diarize", "merge", "translate", "tts", "render"]
+
+def _parse_profile(ctx, param, value: str | None) -> list[str] | None:
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in STEPS_ORDER]
+    if unknown:
+        raise click.BadParameter(
+            f"unknown step(s) {', '.join(unknown)}; choose from {', '.join(STEPS_ORDER)}"
+        )
+    return names
 
 
 @click.command()
@@ -23,12 +42,19 @@ STEPS_ORDER = ["asr", "diarize", "merge", "translate", "tts", "render"]
               help="Path to YAML config file")
 @click.option("--max-speakers", type=int, default=None,
               help="Max number of speakers (overrides config)")
+@click.option("--preset", default=None,
+              help="Speed/quality preset from the config (e.g. fast, balanced, quality)")
 @click.option("--force", is_flag=True, default=False,
               help="Re-run all steps even if outputs exist")
 @click.option("--steps", multiple=True, type=click.Choice(STEPS_ORDER),
               help="Run only specific steps (default: all)")
+@click.option("--profile", "profile", default=None, callback=_parse_profile,
+              help="Profile these steps, comma-separated (e.g. tts,render)")
+@click.option("--profile-memory", is_flag=True, default=False,
+              help="Also write a tracemalloc allocation diff of profiled steps")
 def main(input_audio: str, workdir: str, config_path: str,
-         max_speakers: int | None, force: bool, steps: tuple[str, ...]):
+         max_speakers: int | None, preset: str | None, force: bool, steps: tuple[str, ...],
+         profile: list[str] | None, profile_memory: bool):
     """Translate an English interview to Spanish with voice preservation."""
     console.print(Panel.fit(
         "[bold]Interview Translator[/bold] — EN → ES con preservación de voz",
@@ -37,7 +63,12 @@ def main(input_audio: str, workdir: str, config_path: str,
 
     # Load config
     config = load_config(config_path)
-    config = apply_cli_overrides(config, max_speakers=max_speakers)
+    try:
+        config = apply_preset(config, preset)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--preset")
+    config = apply_cli_overrides(config, max_speakers=max_speakers,
+                                 profile=profile, profile_memory=profile_memory)
 
     # Validate environment
     env = validate_environment()
@@ -48,37 +79,43 @@ def main(input_audio: str, workdir: str, config_path: str,
 
     console.print(f"  Input:   {input_path}")
     console.print(f"  Workdir: {work_path}")
+    if config.get("preset"):
+        console.print(f"  Preset:  {config['preset']}")
     console.print()
 
     # Determine which steps to run
     active_steps = list(steps) if steps else STEPS_ORDER
 
-    # Import and instantiate pipeline steps
-    from src.pipeline.asr import ASRStep
-    from src.pipeline.diarize import DiarizeStep
-    from src.pipeline.merge import MergeStep
-    from src.pipeline.translate import TranslateStep
-    from src.pipeline.tts import TTSStep
-    from src.pipeline.render import RenderStep
-
-    step_map = {
-        "asr": ASRStep,
-        "diarize": DiarizeStep,
-        "merge": MergeStep,
-        "translate": TranslateStep,
-        "tts": TTSStep,
-        "render": RenderStep,
-    }
-
-    # Run pipeline
-    for step_name in active_steps:
-        step_cls = step_map[step_name]
-        step = step_cls(workdir=work_path, config=config, force=force)
-        try:
-            step.run(input_audio=input_path)
-        except Exception as e:
-            console.print(f"\n[bold red]Pipeline failed at step '{step_name}':[/bold red] {e}")
-            sys.exit(1)
+    from src.pipeline.bus import create_bus
+
+    # Run pipeline; consecutive steps hand their outputs over in memory
+    bus = create_bus(config) if len(active_steps) > 1 else None
+    step_metrics = {}
+    try:
+        for step_name in active_steps:
+            # Each step's module (and torch etc.) is imported right before it runs
+            step_cls = get_step(step_name)
+            step = step_cls(workdir=work_path, config=config, force=force, bus=bus)
+            try:
+                step.run(input_audio=input_path)
+            except Exception as e:
+                console.print(f"\n[bold red]Pipeline failed at step '{step_name}':[/bold red] {e}")
+                sys.exit(1)
+            finally:
+                if step.metrics is not None:
+                    step_metrics[step_name] = step.metrics
+                    write_json(step_metrics, work_path / "step_metrics.json")
+
+        # Wait for the outputs still being written in the background
+        if bus is not None:
+            try:
+                bus.flush()
+            except Exception as e:
+                console.print(f"\n[bold red]Pipeline failed writing outputs:[/bold red] {e}")
+                sys.exit(1)
+    finally:
+        if bus is not None:
+            bus.shutdown()
 
     console.print()
     console.print(Panel.fit(
@@ -94,6 +131,27 @@ def main(input_audio: str, workdir: str, config_path: str,
     if rendered_mp3.exists():
         console.print(f"  MP3: {rendered_mp3}")
 
+    if step_metrics:
+        _print_step_metrics(step_metrics)
+
+    profiles = sorted(work_path.glob("profile_*"))
+    if profiles:
+        console.print("  Profiles:")
+        for path in profiles:
+            console.print(f"    {path}")
+
+
+def _print_step_metrics(step_metrics: dict):
+    table = Table(title="Step metrics")
+    for col in ("step", "wall s", "CPU s", "peak RSS MB", "phases"):
+        table.add_column(col)
+    for name, m in step_metrics.items():
+        rss = m.get("peak_rss_bytes")
+        phases = ", ".join(f"{k} {v:.1f}s" for k, v in m.get("phases", {}).items())
+        table.add_row(name, f"{m['wall_seconds']:.1f}", f"{m['cpu_seconds']:.1f}",
+                      f"{rss / 2**20:.0f}" if rss else "-", phases)
+    console.print(table)
+
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,22 @@
-from src.pipeline.asr import ASRStep
-from src.pipeline.diarize import DiarizeStep
-from src.pipeline.merge import MergeStep
-from src.pipeline.translate import TranslateStep
-from src.pipeline.tts import TTSStep
-from src.pipeline.render import RenderStep
+"""Pipeline steps, imported on first access (see :mod:`src.pipeline.registry`)."""
+
+from src.pipeline.registry import STEPS_ORDER, get_step, register_step
+
+_CLASSES = {
+    "ASRStep": "asr",
+    "DiarizeStep": "diarize",
+    "MergeStep": "merge",
+    "TranslateStep": "translate",
+    "TTSStep": "tts",
+    "RenderStep": "render",
+}
+
+
+def __getattr__(name: str):
+    if name in _CLASSES:
+        return get_step(_CLASSES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "ASRStep",
@@ -12,4 +25,7 @@ __all__ = [
     "TranslateStep",
     "TTSStep",
     "RenderStep",
+    "STEPS_ORDER",
+    "get_step",
+    "register_step",
 ]
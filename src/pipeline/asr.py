@@ -1,49 +1,130 @@
-"""ASR step: English transcription using WhisperX."""
+"""ASR step: English transcription using WhisperX.
+
+Long files on CPU can be transcribed in parallel shards, see
+:mod:`src.pipeline.asr_shards`.
+"""
 
 import gc
 from pathlib import Path
 
-from src.device import get_device_str
 from src.pipeline.base import PipelineStep, console
-from src.utils.io import write_json
+from src.utils.audio import split_on_pauses, synthetic_audio
+from src.utils.peaks import write_peaks
+
+# Below this the pause search has no room to place a cut
+MIN_SHARD_SECONDS = 1
 
 
 class ASRStep(PipelineStep):
     name = "asr"
     output_files = ["asr.json"]
+    loads_models = True
 
-    def execute(self, input_audio: str, **kwargs):
-        import whisperx
+    def _settings(self) -> tuple[dict, str, str, str]:
+        """(asr config, device, compute type, language)."""
+        from src.device import get_compute_type, get_device_str
 
         cfg = self.config["asr"]
         device = get_device_str("asr", self.config["devices"].get("asr", "auto"))
-        compute_type = cfg.get("compute_type", "float32")
+        compute_type = get_compute_type(device, cfg.get("compute_type", "auto"))
+        return cfg, device, compute_type, cfg.get("language", "en")
+
+    def _whisper_model(self, cfg: dict, device: str, compute_type: str, language: str):
+        import whisperx
+
+        return self.load_model(
+            ("whisperx", cfg["model_size"], device, compute_type, language),
+            lambda: whisperx.load_model(
+                cfg["model_size"],
+                device=device,
+                compute_type=compute_type,
+                language=language,
+            ),
+        )
+
+    def _align_model(self, language: str, device: str) -> tuple:
+        import whisperx
+
+        return self.load_model(
+            ("whisperx_align", language, device),
+            lambda: whisperx.load_align_model(language_code=language, device=device),
+        )
+
+    def check_models(self, download: bool = False) -> list[dict]:
+        from faster_whisper.utils import download_model
+
+        cfg, _, _, language = self._settings()
+        try:
+            download_model(cfg["model_size"], local_files_only=not download)
+            cached = True
+        except Exception:
+            cached = False
+        # The alignment model (torchaudio or Hugging Face, per language) is
+        # fetched by whisperx when loaded; warm-up loads it
+        return [{"model": cfg["model_size"], "cached": cached},
+                {"model": f"align-{language}", "cached": None}]
+
+    def warmup(self):
+        import whisperx
+
+        cfg, device, compute_type, language = self._settings()
+        audio = synthetic_audio(1.0, whisperx.audio.SAMPLE_RATE)
+        self._whisper_model(cfg, device, compute_type, language).transcribe(audio, batch_size=1)
+        align_model, align_metadata = self._align_model(language, device)
+        whisperx.align([{"start": 0.0, "end": 1.0, "text": "hello"}], align_model,
+                       align_metadata, audio, device=device, return_char_alignments=False)
+
+    def execute(self, input_audio: str, **kwargs):
+        import whisperx
+
+        cfg, device, compute_type, language = self._settings()
 
         console.print(f"    Model: {cfg['model_size']}, device: {device}, compute: {compute_type}")
 
+        self.phase("io")
+        audio = whisperx.load_audio(input_audio)
+        sr = whisperx.audio.SAMPLE_RATE
+
+        # Waveform peaks for the original track while the audio is in memory
+        self.phase("peaks")
+        try:
+            write_peaks(self.workdir, "original", audio, sr,
+                        self.config.get("peaks", {}).get("levels"))
+        except Exception as e:
+            console.print(f"    [yellow]Waveform peaks skipped: {e}[/yellow]")
+
+        shard_cfg = cfg.get("shards", {})
+        workers = shard_cfg.get("workers", 0)
+        if device == "cpu" and workers > 1:
+            shard_seconds = shard_cfg.get("shard_seconds", 300)
+            if shard_seconds < MIN_SHARD_SECONDS:
+                raise ValueError(f"asr.shards.shard_seconds must be at least {MIN_SHARD_SECONDS}s, "
+                                 f"got {shard_seconds}")
+            bounds = split_on_pauses(audio, sr, shard_seconds,
+                                     pause_seconds=shard_cfg.get("pause_seconds", 0.5))
+            if len(bounds) > 1:
+                result = self._transcribe_sharded(audio, sr, bounds, cfg, compute_type, language)
+                self._save(result, language)
+                return
+
         # Load model
-        model = whisperx.load_model(
-            cfg["model_size"],
-            device=device,
-            compute_type=compute_type,
-            language=cfg.get("language", "en"),
-        )
+        self.phase("load_model")
+        model = self._whisper_model(cfg, device, compute_type, language)
 
         # Transcribe
         console.print("    Transcribing...")
-        audio = whisperx.load_audio(input_audio)
+        self.phase("inference")
         result = model.transcribe(audio, batch_size=cfg.get("batch_size", 8))
 
-        # Free transcription model memory
+        # Free transcription model memory (a batch run keeps it in its ModelCache)
         del model
         gc.collect()
 
         # Align timestamps (word-level)
         console.print("    Aligning word timestamps...")
-        align_model, align_metadata = whisperx.load_align_model(
-            language_code=cfg.get("language", "en"),
-            device=device,
-        )
+        self.phase("load_model")
+        align_model, align_metadata = self._align_model(language, device)
+        self.phase("inference")
         result = whisperx.align(
             result["segments"],
             align_model,
@@ -53,18 +134,49 @@ class ASRStep(PipelineStep):
             return_char_alignments=False,
         )
 
-        # Free alignment model memory
+        # Free alignment model memory (unless shared)
         del align_model, align_metadata
         gc.collect()
 
-        # Save output
+        self._save(result, language)
+
+    def _transcribe_sharded(self, audio, sr: int, bounds: list[tuple[int, int]], cfg: dict,
+                            compute_type: str, language: str) -> dict:
+        """Transcribe and align *bounds* of *audio* in a pool of worker processes."""
+        from src.pipeline.asr_shards import ShardPool
+
+        shard_cfg = cfg["shards"]
+        # Processes start on demand, so fewer shards than workers start fewer
+        workers = shard_cfg["workers"]
+        threads = shard_cfg.get("threads_per_worker", 2)
+        console.print(f"    Transcribing {len(bounds)} shards with up to {workers} workers "
+                      f"x {threads} threads...")
+
+        self.phase("load_model")
+        pool = self.load_model(
+            ("whisperx_shards", cfg["model_size"], compute_type, language, workers, threads),
+            lambda: ShardPool(workers, cfg["model_size"], compute_type, language, threads),
+        )
+        self.phase("inference")
+        try:
+            return pool.transcribe(
+                audio, sr, bounds, cfg.get("batch_size", 8),
+                on_shard=lambda done, total: console.print(f"    Shard {done}/{total} done"),
+            )
+        finally:
+            # A batch run keeps the pool (and its loaded models) in its ModelCache
+            if self.models is None:
+                pool.shutdown()
+
+    def _save(self, result: dict, language: str):
+        self.phase("io")
         output_path = self.workdir / "asr.json"
         output_data = {
-            "language": cfg.get("language", "en"),
+            "language": language,
             "segments": result["segments"],
         }
         if "word_segments" in result:
             output_data["word_segments"] = result["word_segments"]
 
-        write_json(output_data, output_path)
+        self.save_artifact(output_data, output_path)
         console.print(f"    Saved {len(result['segments'])} segments to asr.json")
@@ -0,0 +1,114 @@
+"""Sharded ASR on CPU: transcribe and align pause-delimited shards in parallel.
+
+A single ``model.transcribe`` call keeps only a few cores busy on CPU.  In
+sharded mode (``asr.shards.workers`` > 1) the audio is cut at pauses into
+shards of about ``asr.shards.shard_seconds`` (see
+:func:`src.utils.audio.split_on_pauses`), and a pool of worker processes,
+each with ``threads_per_worker`` threads and its own WhisperX and alignment
+models, transcribes and aligns one shard at a time.  Shard results are
+shifted by the shard's start time and concatenated in time order, giving
+the same ``asr.json`` structure as the single-call path.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Models loaded once per worker process by _init_worker
+_worker: dict = {}
+
+
+def _init_worker(model_size: str, compute_type: str, language: str, threads: int):
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    import torch
+    import whisperx
+
+    torch.set_num_threads(threads)
+    _worker["model"] = whisperx.load_model(
+        model_size, device="cpu", compute_type=compute_type, language=language, threads=threads,
+    )
+    _worker["align"] = whisperx.load_align_model(language_code=language, device="cpu")
+
+
+def _transcribe_shard(audio: np.ndarray, offset: float, batch_size: int) -> dict:
+    import whisperx
+
+    result = _worker["model"].transcribe(audio, batch_size=batch_size)
+    align_model, align_metadata = _worker["align"]
+    result = whisperx.align(
+        result["segments"],
+        align_model,
+        align_metadata,
+        audio,
+        device="cpu",
+        return_char_alignments=False,
+    )
+    return shift_result(result, offset)
+
+
+def _shift(item: dict, offset: float) -> dict:
+    item = dict(item)
+    for key in ("start", "end"):
+        # Words WhisperX could not align have no timestamps
+        if item.get(key) is not None:
+            item[key] = round(item[key] + offset, 3)
+    return item
+
+
+def shift_result(result: dict, offset: float) -> dict:
+    """Move every segment and word timestamp of *result* by *offset* seconds."""
+    if not offset:
+        return result
+    segments = []
+    for seg in result["segments"]:
+        seg = _shift(seg, offset)
+        if "words" in seg:
+            seg["words"] = [_shift(w, offset) for w in seg["words"]]
+        segments.append(seg)
+    shifted = {**result, "segments": segments}
+    if "word_segments" in result:
+        shifted["word_segments"] = [_shift(w, offset) for w in result["word_segments"]]
+    return shifted
+
+
+def merge_results(results: list[dict]) -> dict:
+    """Concatenate shard results (already shifted, in time order)."""
+    merged = {"segments": [seg for r in results for seg in r["segments"]]}
+    if any("word_segments" in r for r in results):
+        merged["word_segments"] = [w for r in results for w in r.get("word_segments", [])]
+    return merged
+
+
+class ShardPool:
+    """Worker processes holding WhisperX + alignment models for one configuration."""
+
+    def __init__(self, workers: int, model_size: str, compute_type: str, language: str,
+                 threads: int):
+        self.workers = workers
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_size, compute_type, language, threads),
+        )
+
+    def transcribe(self, audio: np.ndarray, sr: int, bounds: list[tuple[int, int]],
+                   batch_size: int, on_shard=None) -> dict:
+        """Transcribe the ``(start, end)`` sample ranges of *audio* and merge them."""
+        futures = [
+            self._pool.submit(_transcribe_shard, audio[start:end], start / sr, batch_size)
+            for start, end in bounds
+        ]
+        results = []
+        for i, future in enumerate(futures):
+            results.append(future.result())
+            if on_shard is not None:
+                on_shard(i + 1, len(futures))
+        return merge_results(results)
+
+    def shutdown(self):
+        self._pool.shutdown(cancel_futures=True)
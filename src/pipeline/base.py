@@ -1,17 +1,33 @@
-"""Base class for pipeline steps with idempotency support."""
+"""Base class for pipeline steps with idempotency support.
+
+Imported with every step module, so it keeps to the standard library and
+rich at import time: numpy, soundfile and the artifact formats are
+imported by the methods that use them, once a step actually runs.
+"""
+
+from __future__ import annotations
 
 import abc
+import time
 from pathlib import Path
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
 from rich.console import Console
 
+from src.pipeline.models import ModelCache
+from src.utils.resources import ResourceTracker
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.pipeline.bus import ArtifactBus
+
 console = Console()
 
 # Type alias for progress callbacks.
 # Signature: callback(event: dict) -> None
 # Events have a "type" key: "step_start", "step_progress", "step_complete",
-# "step_skipped", "error".
+# "step_skipped", "error".  "step_complete" carries the step's "metrics".
 ProgressCallback = Callable[[dict[str, Any]], None]
 
 
@@ -22,30 +38,124 @@ class PipelineStep(abc.ABC):
     - Has a name and output file(s)
     - Checks if output already exists (idempotent)
     - Cleans up partial outputs on failure
+    - Records wall/CPU time, peak RSS and GPU memory of each run, split
+      into sub-phases marked with :meth:`phase`
+    - Runs under a profiler when listed in ``profiling.steps``
+    - Reuses models from a shared :class:`ModelCache` in batch runs
+    - Hands artifacts to the next step through an :class:`ArtifactBus` in
+      full-pipeline runs (``save_artifact``/``load_artifact``,
+      ``save_audio``/``load_audio``), writing files in the background
     """
 
     name: str = "base"
     output_files: list[str] = []
+    # Steps that load a model override check_models() and warmup()
+    loads_models: bool = False
 
-    def __init__(self, workdir: Path, config: dict, force: bool = False):
+    def __init__(self, workdir: Path, config: dict, force: bool = False,
+                 models: ModelCache | None = None, bus: ArtifactBus | None = None):
         self.workdir = workdir
         self.config = config
         self.force = force
+        self.models = models
+        self.bus = bus
+        self.metrics: dict[str, Any] | None = None
+        self._phases: dict[str, float] = {}
+        self._phase: str | None = None
+        self._phase_t0 = 0.0
 
     def outputs_exist(self) -> bool:
-        """Check if all expected outputs already exist."""
-        return all((self.workdir / f).exists() for f in self.output_files)
+        """Check if all expected outputs already exist (JSON artifacts in either format)."""
+        return all(self.has_artifact(self.workdir / f) for f in self.output_files)
 
     def clean_outputs(self):
         """Remove partial outputs on failure."""
+        from src.utils.artifacts import remove_artifact
+
         for f in self.output_files:
             path = self.workdir / f
-            if path.is_file():
+            if self.bus is not None:
+                self.bus.discard(path)
+            if path.suffix == ".json":
+                remove_artifact(path)
+            elif path.is_file():
                 path.unlink()
             elif path.is_dir():
                 import shutil
                 shutil.rmtree(path, ignore_errors=True)
 
+    def has_artifact(self, path: Path) -> bool:
+        from src.utils.artifacts import artifact_exists
+
+        return (self.bus is not None and self.bus.has(path)) or artifact_exists(path)
+
+    def save_artifact(self, data: dict, path: Path):
+        """Write a step artifact, in the background when running on a bus.
+
+        *data* is handed as is to later steps and must not be modified afterwards.
+        """
+        from src.utils.artifacts import write_artifact
+
+        if self.bus is None:
+            write_artifact(data, path, self.config)
+        else:
+            self.bus.put(path, data, lambda: write_artifact(data, path, self.config))
+
+    def load_artifact(self, path: Path) -> dict:
+        """Read a step artifact, from the bus when an earlier step of this run wrote it."""
+        from src.utils.artifacts import read_artifact
+
+        if self.bus is not None:
+            data = self.bus.get(path)
+            if data is not None:
+                return data
+            self.bus.wait(path)
+        return read_artifact(path)
+
+    def save_audio(self, audio: np.ndarray, path: Path, sr: int):
+        """Write a WAV file, in the background when running on a bus."""
+        from src.utils.audio import save_wav
+
+        if self.bus is None:
+            save_wav(audio, path, sr)
+        else:
+            self.bus.put_audio(path, audio, sr, lambda: save_wav(audio, path, sr))
+
+    def load_audio(self, path: Path) -> tuple[np.ndarray, int] | None:
+        """``(audio, sample_rate)`` of a WAV file (a copy when from the bus), or None if missing."""
+        if self.bus is not None:
+            cached = self.bus.get_audio(path)
+            if cached is not None:
+                return cached
+            self.bus.wait(path)
+        if not path.exists():
+            return None
+        import soundfile as sf
+
+        return sf.read(str(path), dtype="float32")
+
+    def check_models(self, download: bool = False) -> list[dict]:
+        """Models this step loads and whether each is in the local cache.
+
+        Entries are ``{"model": name, "cached": bool | None}`` (None: not
+        checkable up front, fetched when loaded).  With *download*, missing
+        models are fetched first.
+        """
+        return []
+
+    def warmup(self):
+        """Load this step's models through :meth:`load_model` and run a tiny inference."""
+
+    def load_model(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        """Load a model with *loader*, or reuse it from the shared cache.
+
+        *key* must identify the model completely (family, name, device...).
+        Without a :class:`ModelCache` the model is loaded for this run only.
+        """
+        if self.models is None:
+            return loader()
+        return self.models.get(key, loader)
+
     def _emit(self, callback: ProgressCallback | None, event: dict[str, Any]):
         """Safely emit a progress event if callback is provided."""
         if callback is not None:
@@ -54,6 +164,35 @@ class PipelineStep(abc.ABC):
             except Exception:
                 pass  # Never let callback errors break the pipeline
 
+    def phase(self, name: str):
+        """Start sub-phase *name* (e.g. "load_model", "inference", "io").
+
+        Ends the previous phase; time spent in a name accumulates across
+        repeated calls.  The last phase runs until ``execute`` returns.
+        """
+        now = time.perf_counter()
+        if self._phase is not None:
+            self._phases[self._phase] = self._phases.get(self._phase, 0.0) + now - self._phase_t0
+        self._phase, self._phase_t0 = name, now
+
+    def _finish_metrics(self, tracker: ResourceTracker) -> dict[str, Any]:
+        self.phase("")
+        phases = {k: round(v, 3) for k, v in self._phases.items() if k and round(v, 3)}
+        self._phases, self._phase = {}, None
+        self.metrics = {**tracker.stop(), "phases": phases}
+        return self.metrics
+
+    def _execute(self, **kwargs):
+        """Call :meth:`execute`, under a profiler if ``profiling.steps`` names this step."""
+        profiling = self.config.get("profiling") or {}
+        if self.name not in (profiling.get("steps") or ()):
+            return self.execute(**kwargs)
+
+        from src.utils.profiling import StepProfiler
+
+        with StepProfiler(self.name, self.workdir, profiling):
+            return self.execute(**kwargs)
+
     def run(self, progress_callback: ProgressCallback | None = None, **kwargs):
         """Execute the step with idempotency check."""
         if not self.force and self.outputs_exist():
@@ -65,13 +204,20 @@ class PipelineStep(abc.ABC):
 
         console.print(f"  [bold cyan]Running {self.name}...[/bold cyan]")
         self._emit(progress_callback, {"type": "step_start", "step": self.name})
+        tracker = ResourceTracker()
+        self.phase("setup")
         try:
-            self.execute(progress_callback=progress_callback, **kwargs)
-            console.print(f"  [bold green]{self.name} complete[/bold green]")
+            self._execute(progress_callback=progress_callback, **kwargs)
+            metrics = self._finish_metrics(tracker)
+            console.print(
+                f"  [bold green]{self.name} complete[/bold green] "
+                f"[dim]({metrics['wall_seconds']:.1f}s wall, {metrics['cpu_seconds']:.1f}s CPU)[/dim]"
+            )
             self._emit(progress_callback, {
-                "type": "step_complete", "step": self.name,
+                "type": "step_complete", "step": self.name, "metrics": metrics,
             })
         except Exception as exc:
+            self._finish_metrics(tracker)
             console.print(f"  [bold red]{self.name} failed — cleaning partial outputs[/bold red]")
             self._emit(progress_callback, {
                 "type": "error", "step": self.name,
@@ -0,0 +1,145 @@
+"""In-process artifact bus for full-pipeline runs.
+
+When several steps run in one process, each step's results are handed to
+the next step from memory instead of being re-read from disk: JSON-like
+artifacts (``asr.json`` → merge, ``merged_segments.json`` → translate, ...)
+and TTS audio (``tts_segments/*.wav`` → render).  Files are still written,
+for idempotent re-runs and for the API, but by a background writer thread,
+so serialization is off the critical path.  :meth:`ArtifactBus.flush`
+waits for every pending write; callers must flush before they report a
+run as finished.
+
+Objects put on the bus are shared with the steps that read them and must
+be treated as read-only.  Audio arrays are returned as copies (render
+mixes into them in place); ``bus.max_audio_mb`` caps how much audio is
+kept in memory, beyond which audio is written only.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class ArtifactBus:
+    """Latest artifact per path, plus one background writer that persists them in order."""
+
+    def __init__(self, max_audio_mb: float = 512):
+        self._data: dict[Path, Any] = {}
+        self._audio: dict[Path, tuple[np.ndarray, int]] = {}
+        self._audio_bytes = 0
+        self._max_audio_bytes = int(max_audio_mb * 1024 * 1024)
+        self._pending: dict[Path, Future] = {}
+        self._lock = threading.Lock()
+        # One writer keeps writes of a path in submission order
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-bus")
+
+    @staticmethod
+    def _key(path: Path) -> Path:
+        return Path(path).resolve()
+
+    def _submit(self, key: Path, write: Callable[[], None]):
+        future = self._writer.submit(write)
+        with self._lock:
+            self._pending[key] = future
+        future.add_done_callback(lambda f: self._done(key, f))
+
+    def _done(self, key: Path, future: Future):
+        with self._lock:
+            if self._pending.get(key) is future and future.exception() is None:
+                del self._pending[key]
+
+    def put(self, path: Path, data: Any, write: Callable[[], None]):
+        """Publish *data* for *path* now; persist it with *write* in the background."""
+        key = self._key(path)
+        with self._lock:
+            self._data[key] = data
+        self._submit(key, write)
+
+    def get(self, path: Path) -> Any | None:
+        with self._lock:
+            return self._data.get(self._key(path))
+
+    def put_audio(self, path: Path, audio: np.ndarray, sr: int, write: Callable[[], None]):
+        """Publish an audio array (kept only while under ``max_audio_mb``) and persist it."""
+        key = self._key(path)
+        with self._lock:
+            previous = self._audio.pop(key, None)
+            if previous is not None:
+                self._audio_bytes -= previous[0].nbytes
+            if self._audio_bytes + audio.nbytes <= self._max_audio_bytes:
+                self._audio[key] = (audio, sr)
+                self._audio_bytes += audio.nbytes
+        self._submit(key, write)
+
+    def get_audio(self, path: Path) -> tuple[np.ndarray, int] | None:
+        """A copy of the audio published for *path* and its sample rate, if kept."""
+        with self._lock:
+            entry = self._audio.get(self._key(path))
+        if entry is None:
+            return None
+        return entry[0].copy(), entry[1]
+
+    def has(self, path: Path) -> bool:
+        key = self._key(path)
+        with self._lock:
+            return key in self._data or key in self._audio or key in self._pending
+
+    def wait(self, path: Path):
+        """Wait until the pending write of *path*, if any, is on disk."""
+        with self._lock:
+            future = self._pending.get(self._key(path))
+        if future is not None:
+            future.result()
+
+    def discard(self, path: Path):
+        """Forget *path* and everything under it, once their pending writes are done.
+
+        Called before the caller deletes the files, so no write lands after.
+        """
+        key = self._key(path)
+        with self._lock:
+            keys = [k for k in {*self._data, *self._audio, *self._pending}
+                    if k == key or key in k.parents]
+            futures = [self._pending.pop(k) for k in keys if k in self._pending]
+            for k in keys:
+                self._data.pop(k, None)
+                audio = self._audio.pop(k, None)
+                if audio is not None:
+                    self._audio_bytes -= audio[0].nbytes
+        for future in futures:
+            future.exception()  # wait; a failed write no longer matters
+
+    def flush(self):
+        """Wait for every pending write; re-raise the first failure."""
+        while True:
+            with self._lock:
+                pending = list(self._pending.values())
+            if not pending:
+                return
+            for future in pending:
+                future.result()
+
+    def shutdown(self):
+        """Let queued writes finish, then stop the writer and drop what is held in memory.
+
+        Write failures are not raised here; :meth:`flush` first to see them.
+        """
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._data.clear()
+            self._audio.clear()
+            self._audio_bytes = 0
+
+
+def create_bus(config: dict) -> ArtifactBus | None:
+    """The bus configured under ``bus``, or None if disabled."""
+    cfg = config.get("bus", {})
+    if not cfg.get("enabled", True):
+        return None
+    return ArtifactBus(max_audio_mb=cfg.get("max_audio_mb", 512))
@@ -1,48 +1,105 @@
-"""Diarization step: speaker segmentation using pyannote.audio."""
+"""Diarization step: speaker segmentation using pyannote.audio.
+
+Long recordings can be diarized in overlapping windows, see
+:mod:`src.pipeline.diarize_windows`.
+"""
 
 import gc
+import inspect
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-import torch
+import numpy as np
 import soundfile as sf
 
-from src.device import get_device
 from src.pipeline.base import PipelineStep, console
+from src.pipeline.diarize_windows import cluster_speakers, stitch_turns, window_bounds, write_rttm
+from src.pipeline.models import hf_model_cached
+from src.utils.audio import synthetic_audio
 from src.utils.io import write_json
+from src.voices import get_library
 
 
 class DiarizeStep(PipelineStep):
     name = "diarize"
     output_files = ["diarization.rttm", "diarization.json"]
+    # Written only when the pipeline returns speaker embeddings, so not
+    # required outputs; removed before every run so none is left from a
+    # previous one (TTS would reuse a stale library voice)
+    speaker_files = ["speaker_embeddings.json", "speaker_voices.json"]
+    loads_models = True
 
-    def execute(self, input_audio: str, **kwargs):
-        from pyannote.audio import Pipeline
-
-        cfg = self.config["diarization"]
-
-        # Get HF token
+    @staticmethod
+    def _hf_token() -> str:
         hf_token = os.environ.get("HF_TOKEN")
         if not hf_token:
             raise RuntimeError("HF_TOKEN not set. Required for pyannote models.")
+        return hf_token
+
+    def _pipeline_loader(self, cfg: dict, hf_token: str):
+        """(device, cache key, loader) of the pyannote pipeline."""
+        from pyannote.audio import Pipeline
+
+        from src.device import get_device
 
         device = get_device("diarization", self.config["devices"].get("diarization", "auto"))
-        console.print(f"    Model: {cfg['model']}, device: {device}")
 
-        # Login globally so sub-dependencies also get the token
-        from huggingface_hub import login
-        login(token=hf_token, add_to_git_credential=False)
+        def load_pipeline():
+            # Login globally so sub-dependencies also get the token
+            from huggingface_hub import login
+            login(token=hf_token, add_to_git_credential=False)
+
+            pipeline = Pipeline.from_pretrained(
+                cfg["model"],
+                token=hf_token,
+            )
+            pipeline.to(device)
+            return pipeline
+
+        return device, ("pyannote", cfg["model"], str(device)), load_pipeline
+
+    def check_models(self, download: bool = False) -> list[dict]:
+        model = self.config["diarization"]["model"]
+        # Sub-models (segmentation, embedding) are fetched by the pipeline when loaded
+        return [{"model": model,
+                 "cached": hf_model_cached(model, download, os.environ.get("HF_TOKEN"))}]
+
+    def warmup(self):
+        import torch
+
+        cfg = self.config["diarization"]
+        _, model_key, load_pipeline = self._pipeline_loader(cfg, self._hf_token())
+        pipeline = self.load_model(model_key, load_pipeline)
+        waveform = torch.from_numpy(synthetic_audio(5.0, 16000)).unsqueeze(0)
+        pipeline({"waveform": waveform, "sample_rate": 16000})
+
+    def execute(self, input_audio: str, progress_callback=None, **kwargs):
+        import torch
+
+        cfg = self.config["diarization"]
+        window_cfg = cfg.get("windows", {})
+        window, overlap = window_cfg.get("window_seconds"), window_cfg.get("overlap_seconds", 30)
+        # Check before loading anything: windows that do not advance never end
+        if window and not 0 <= overlap < window:
+            raise ValueError(f"diarization.windows.overlap_seconds ({overlap}) must be at least 0 "
+                             f"and shorter than window_seconds ({window})")
+        self._remove_speaker_files()
+
+        # Get HF token
+        hf_token = self._hf_token()
+        device, model_key, load_pipeline = self._pipeline_loader(cfg, hf_token)
+        console.print(f"    Model: {cfg['model']}, device: {device}")
 
         # Load pipeline
         console.print("    Loading diarization pipeline...")
-        pipeline = Pipeline.from_pretrained(
-            cfg["model"],
-            token=hf_token,
-        )
-        pipeline.to(device)
+        self.phase("load_model")
+        pipeline = self.load_model(model_key, load_pipeline)
 
         # Pre-load audio as waveform tensor (torchcodec is broken with torch 2.8.0)
         console.print("    Loading audio waveform...")
+        self.phase("io")
         # Convert to WAV if needed (soundfile can't read MP3)
         audio_path = input_audio
         if input_audio.lower().endswith(".mp3"):
@@ -53,6 +110,25 @@ class DiarizeStep(PipelineStep):
                 capture_output=True, check=True,
             )
             audio_path = wav_path
+
+        info = sf.info(audio_path)
+        duration = info.frames / info.samplerate
+        if window_cfg.get("window_seconds") and duration > window_cfg["window_seconds"]:
+            turns, embeddings = self._diarize_windowed(
+                pipeline, model_key, load_pipeline, audio_path, duration, cfg, progress_callback,
+            )
+            self.phase("io")
+            write_rttm(turns, self.workdir / "diarization.rttm", Path(input_audio).stem)
+            self.save_artifact({"turns": turns}, self.workdir / "diarization.json")
+            self._save_speaker_embeddings(embeddings, cfg)
+            del pipeline
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            console.print(f"    Found {len({t['speaker'] for t in turns})} speakers, {len(turns)} turns")
+            console.print(f"    Saved to diarization.rttm and diarization.json")
+            return
+
         waveform, sample_rate = sf.read(audio_path, dtype="float32")
         # soundfile returns (samples, channels) or (samples,) for mono
         waveform_tensor = torch.from_numpy(waveform)
@@ -64,21 +140,21 @@ class DiarizeStep(PipelineStep):
 
         # Run diarization with progress
         console.print("    Running diarization...")
+        self.phase("inference")
         params = {}
         if cfg.get("max_speakers"):
             params["max_speakers"] = cfg["max_speakers"]
         if cfg.get("min_speakers"):
             params["min_speakers"] = cfg["min_speakers"]
+        # Speaker embeddings feed the voice library
+        if get_library(self.config) is not None:
+            params.update(self._embedding_params(pipeline))
 
         result = pipeline(audio_input, **params)
-
-        # pyannote 4.x returns DiarizeOutput; extract the Annotation object
-        if hasattr(result, "speaker_diarization"):
-            diarization = result.speaker_diarization
-        else:
-            diarization = result
+        diarization, embeddings = self._unpack(result)
 
         # Export RTTM
+        self.phase("io")
         rttm_path = self.workdir / "diarization.rttm"
         with open(rttm_path, "w") as f:
             diarization.write_rttm(f)
@@ -94,9 +170,11 @@ class DiarizeStep(PipelineStep):
             })
 
         json_path = self.workdir / "diarization.json"
-        write_json({"turns": turns}, json_path)
+        self.save_artifact({"turns": turns}, json_path)
+        if embeddings is not None:
+            self._save_speaker_embeddings(dict(zip(diarization.labels(), embeddings)), cfg)
 
-        # Free memory
+        # Free memory (models shared by a batch run stay in its ModelCache)
         del pipeline, diarization, result
         gc.collect()
         if torch.cuda.is_available():
@@ -105,3 +183,129 @@ class DiarizeStep(PipelineStep):
         speakers = set(t["speaker"] for t in turns)
         console.print(f"    Found {len(speakers)} speakers, {len(turns)} turns")
         console.print(f"    Saved to diarization.rttm and diarization.json")
+
+    def _remove_speaker_files(self):
+        for name in self.speaker_files:
+            (self.workdir / name).unlink(missing_ok=True)
+
+    def clean_outputs(self):
+        super().clean_outputs()
+        self._remove_speaker_files()
+
+    @staticmethod
+    def _unpack(result):
+        """(annotation, embeddings or None) from pyannote 3.x or 4.x output."""
+        # pyannote 4.x returns DiarizeOutput; extract the Annotation object
+        if hasattr(result, "speaker_diarization"):
+            return result.speaker_diarization, getattr(result, "speaker_embeddings", None)
+        if isinstance(result, tuple):
+            return result
+        return result, None
+
+    @staticmethod
+    def _embedding_params(pipeline) -> dict:
+        # pyannote 3.x only returns embeddings when asked; 4.x always does
+        if "return_embeddings" in inspect.signature(pipeline.apply).parameters:
+            return {"return_embeddings": True}
+        return {}
+
+    def _save_speaker_embeddings(self, embeddings: dict[str, np.ndarray], cfg: dict):
+        """Write speaker_embeddings.json and match speakers against the voice library."""
+        speakers = {
+            label: np.asarray(vec, dtype=np.float64).round(6).tolist()
+            for label, vec in embeddings.items()
+            if np.all(np.isfinite(vec))
+        }
+        write_json({"model": cfg["model"], "speakers": speakers},
+                   self.workdir / "speaker_embeddings.json", indent=None)
+        library = get_library(self.config)
+        if library is None:
+            return
+        voices_cfg = self.config.get("voices", {})
+        matches = library.match(speakers, cfg["model"], voices_cfg.get("match_threshold", 0.75))
+        write_json(matches, self.workdir / "speaker_voices.json")
+        for speaker, match in matches.items():
+            console.print(f"    {speaker} is [bold]{match['name']}[/bold] "
+                          f"(similarity {match['similarity']:.2f})")
+
+    def _diarize_windowed(self, pipeline, model_key: tuple, load_pipeline, audio_path: str,
+                          duration: float, cfg: dict,
+                          progress_callback) -> tuple[list[dict], dict[str, np.ndarray]]:
+        """Diarize overlapping windows in parallel and stitch them with global labels.
+
+        Returns the turns and each global speaker's duration-weighted mean embedding.
+        """
+        import torch
+
+        window_cfg = cfg["windows"]
+        bounds = window_bounds(duration, window_cfg["window_seconds"],
+                               window_cfg.get("overlap_seconds", 30))
+        workers = max(1, min(window_cfg.get("workers", 1), len(bounds)))
+        rate = sf.info(audio_path).samplerate
+        console.print(f"    Diarizing {len(bounds)} windows, {workers} at a time...")
+
+        # One pipeline per worker; the first is the one already loaded
+        pipelines = queue.Queue()
+        pipelines.put(pipeline)
+        for i in range(1, workers):
+            pipelines.put(self.load_model(model_key + (i,), load_pipeline))
+        params = self._embedding_params(pipeline)
+        # A window may hold fewer speakers than the recording: only cap it
+        if cfg.get("max_speakers"):
+            params["max_speakers"] = cfg["max_speakers"]
+
+        def run_window(start: float, end: float) -> tuple[list[dict], list[str], np.ndarray, list[float]]:
+            waveform, sample_rate = sf.read(
+                audio_path, start=int(start * rate), stop=int(end * rate),
+                dtype="float32", always_2d=True,
+            )
+            audio_input = {"waveform": torch.from_numpy(waveform.T), "sample_rate": sample_rate}
+            worker_pipeline = pipelines.get()
+            try:
+                diarization, embeddings = self._unpack(worker_pipeline(audio_input, **params))
+            finally:
+                pipelines.put(worker_pipeline)
+            if embeddings is None:
+                raise RuntimeError("Windowed diarization needs a pyannote pipeline that returns speaker embeddings")
+            labels = diarization.labels()
+            turns = [{"start": turn.start, "end": turn.end, "speaker": speaker}
+                     for turn, _, speaker in diarization.itertracks(yield_label=True)]
+            return turns, labels, np.asarray(embeddings)[:len(labels)], [
+                diarization.label_duration(label) for label in labels
+            ]
+
+        self.phase("inference")
+        results = [None] * len(bounds)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="diarize-window") as pool:
+            futures = {pool.submit(run_window, *b): i for i, b in enumerate(bounds)}
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                self._emit(progress_callback, {
+                    "type": "step_progress",
+                    "step": self.name,
+                    "current": done,
+                    "total": len(bounds),
+                })
+
+        # Global speaker labels from the embeddings of every window
+        self.phase("clustering")
+        flat_embeddings, windows, weights, keys = [], [], [], []
+        for w, (_, labels, embeddings, durations) in enumerate(results):
+            for label, embedding, weight in zip(labels, embeddings, durations):
+                flat_embeddings.append(embedding)
+                windows.append(w)
+                weights.append(weight)
+                keys.append((w, label))
+        assignment = cluster_speakers(
+            np.asarray(flat_embeddings, dtype=np.float64).reshape(len(keys), -1), windows, weights,
+            threshold=window_cfg.get("clustering_threshold", 0.7),
+            min_speakers=cfg.get("min_speakers"), max_speakers=cfg.get("max_speakers"),
+        )
+        global_labels = [{} for _ in bounds]
+        sums: dict[int, np.ndarray] = {}
+        for (w, label), k, embedding, weight in zip(keys, assignment, flat_embeddings, weights):
+            global_labels[w][label] = k
+            if np.all(np.isfinite(embedding)):
+                sums[k] = sums.get(k, 0.0) + np.asarray(embedding, dtype=np.float64) * weight
+        turns, names = stitch_turns([r[0] for r in results], bounds, global_labels)
+        return turns, {names[k]: vec for k, vec in sums.items() if k in names}
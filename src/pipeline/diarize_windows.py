@@ -0,0 +1,159 @@
+"""Windowed diarization: pyannote on overlapping windows, stitched globally.
+
+Running pyannote on a whole multi-hour recording needs the full waveform
+in memory and grows super-linearly.  In windowed mode
+(``diarization.windows.window_seconds`` > 0) each window of audio is read
+from disk on its own and diarized with ``return_embeddings=True``; windows
+run ``workers`` at a time, one pipeline instance per worker.  Each
+window's local speakers are then clustered across windows by their
+embeddings (:func:`cluster_speakers`) into global labels, and the turns
+are stitched: each window keeps the part of its span nearest its centre
+(half of every overlap), so overlapping regions are never reported twice.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def window_bounds(duration: float, window: float, overlap: float) -> list[tuple[float, float]]:
+    """``(start, end)`` seconds of overlapping windows covering *duration*.
+
+    *overlap* must be shorter than *window*, or the windows would not advance.
+    """
+    if not 0 <= overlap < window:
+        raise ValueError(f"window overlap must be at least 0 and shorter than the window "
+                         f"({window:g}s), got {overlap:g}s")
+    if duration <= window:
+        return [(0.0, duration)]
+    step = window - overlap
+    bounds = []
+    start = 0.0
+    while True:
+        end = min(duration, start + window)
+        bounds.append((start, end))
+        if end >= duration:
+            return bounds
+        start += step
+
+
+def owned_spans(bounds: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """The part of each window whose turns are kept: up to the middle of each overlap."""
+    spans = []
+    for i, (start, end) in enumerate(bounds):
+        lo = start if i == 0 else (start + bounds[i - 1][1]) / 2
+        hi = end if i == len(bounds) - 1 else (end + bounds[i + 1][0]) / 2
+        spans.append((lo, hi))
+    return spans
+
+
+def cluster_speakers(embeddings: np.ndarray, windows: list[int], weights: list[float],
+                     threshold: float, min_speakers: int | None = None,
+                     max_speakers: int | None = None) -> list[int]:
+    """Global speaker index for each (window, local speaker) embedding.
+
+    Average-linkage agglomerative clustering on cosine distance between
+    duration-weighted centroids.  Two speakers from the same window are
+    never merged (pyannote already told them apart).  Merging stops at
+    *threshold*, but continues past it while there are more than
+    *max_speakers* clusters, and never goes below *min_speakers*.
+    Embeddings that are NaN (speakers with too little clean speech) join
+    the heaviest cluster absent from their window afterwards.
+    """
+    n = len(windows)
+    valid = [i for i in range(n) if np.all(np.isfinite(embeddings[i]))]
+    clusters: list[dict] = []
+    for i in valid:
+        vec = embeddings[i] / (np.linalg.norm(embeddings[i]) or 1.0)
+        clusters.append({"members": [i], "windows": {windows[i]},
+                         "sum": vec * weights[i], "weight": weights[i]})
+
+    def centroid(c: dict) -> np.ndarray:
+        return c["sum"] / (np.linalg.norm(c["sum"]) or 1.0)
+
+    while len(clusters) > max(1, min_speakers or 1):
+        best, best_pair = None, None
+        cents = [centroid(c) for c in clusters]
+        for a in range(len(clusters)):
+            for b in range(a + 1, len(clusters)):
+                if clusters[a]["windows"] & clusters[b]["windows"]:
+                    continue
+                distance = 1.0 - float(cents[a] @ cents[b])
+                if best is None or distance < best:
+                    best, best_pair = distance, (a, b)
+        if best_pair is None:
+            break
+        if best > threshold and (max_speakers is None or len(clusters) <= max_speakers):
+            break
+        a, b = best_pair
+        merged = clusters[a]
+        other = clusters.pop(b)
+        merged["members"] += other["members"]
+        merged["windows"] |= other["windows"]
+        merged["sum"] = merged["sum"] + other["sum"]
+        merged["weight"] += other["weight"]
+
+    labels = [-1] * n
+    for k, c in enumerate(clusters):
+        for i in c["members"]:
+            labels[i] = k
+    for i in range(n):
+        if labels[i] >= 0:
+            continue
+        free = [k for k, c in enumerate(clusters) if windows[i] not in c["windows"]]
+        if free:
+            k = max(free, key=lambda k: clusters[k]["weight"])
+        else:
+            clusters.append({"members": [], "windows": set(), "weight": 0.0})
+            k = len(clusters) - 1
+        clusters[k]["windows"].add(windows[i])
+        labels[i] = k
+    return labels
+
+
+def stitch_turns(window_turns: list[list[dict]], bounds: list[tuple[float, float]],
+                 global_labels: list[dict[str, int]]) -> tuple[list[dict], dict[int, str]]:
+    """Merge per-window turns (window-relative times) into global turns.
+
+    *global_labels* maps each window's local labels to global speaker
+    indices.  Turns are clipped to the window's owned span; a speaker's
+    turns that touch across a window boundary are joined.  Speakers are
+    named ``SPEAKER_00``, ``SPEAKER_01``... in order of first appearance;
+    the mapping from global index to name is returned with the turns.
+    """
+    turns: list[dict] = []
+    for turns_w, (start, _), (lo, hi), labels in zip(
+        window_turns, bounds, owned_spans(bounds), global_labels,
+    ):
+        for turn in turns_w:
+            t0, t1 = max(lo, start + turn["start"]), min(hi, start + turn["end"])
+            if t1 - t0 <= 0:
+                continue
+            turns.append({"start": t0, "end": t1, "speaker": labels[turn["speaker"]]})
+    turns.sort(key=lambda t: (t["start"], t["end"]))
+    names: dict[int, str] = {}
+    for turn in turns:
+        turn["speaker"] = names.setdefault(turn["speaker"], f"SPEAKER_{len(names):02d}")
+
+    stitched: list[dict] = []
+    last_by_speaker: dict[str, dict] = {}
+    for turn in turns:
+        previous = last_by_speaker.get(turn["speaker"])
+        if previous is not None and turn["start"] - previous["end"] < 1e-3:
+            previous["end"] = max(previous["end"], turn["end"])
+            continue
+        stitched.append(turn)
+        last_by_speaker[turn["speaker"]] = turn
+    return [
+        {"start": round(t["start"], 3), "end": round(t["end"], 3),
+         "duration": round(t["end"] - t["start"], 3), "speaker": t["speaker"]}
+        for t in stitched
+    ], names
+
+
+def write_rttm(turns: list[dict], path, uri: str):
+    """Write turns in the RTTM format pyannote's ``write_rttm`` uses."""
+    with open(path, "w") as f:
+        for turn in turns:
+            f.write(f"SPEAKER {uri} 1 {turn['start']:.3f} {turn['duration']:.3f} "
+                    f"<NA> <NA> {turn['speaker']} <NA> <NA>\n")
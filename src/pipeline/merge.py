@@ -3,7 +3,6 @@
 from pathlib import Path
 
 from src.pipeline.base import PipelineStep, console
-from src.utils.io import read_json, write_json
 
 
 class MergeStep(PipelineStep):
@@ -14,13 +13,15 @@ class MergeStep(PipelineStep):
         cfg = self.config["merge"]
 
         # Load ASR and diarization results
-        asr_data = read_json(self.workdir / "asr.json")
-        diar_data = read_json(self.workdir / "diarization.json")
+        self.phase("io")
+        asr_data = self.load_artifact(self.workdir / "asr.json")
+        diar_data = self.load_artifact(self.workdir / "diarization.json")
 
         asr_segments = asr_data["segments"]
         diar_turns = diar_data["turns"]
 
         # Try whisperx.assign_word_speakers if word-level data available
+        self.phase("compute")
         merged = self._assign_speakers(asr_segments, diar_turns)
 
         # Post-process: merge tiny segments from same speaker
@@ -33,8 +34,9 @@ class MergeStep(PipelineStep):
             merged = self._smooth_speakers(merged, window)
 
         # Save
+        self.phase("io")
         output_path = self.workdir / "merged_segments.json"
-        write_json({"segments": merged}, output_path)
+        self.save_artifact({"segments": merged}, output_path)
         console.print(f"    Merged {len(merged)} segments")
 
     def _assign_speakers(self, asr_segments: list, diar_turns: list) -> list:
@@ -0,0 +1,81 @@
+"""Models shared between runs of a step over several inputs.
+
+A step run on its own loads its model and frees it when done.  Batch
+runs (``src.batch``) pass a :class:`ModelCache` to every step instead, so
+each model is loaded once per step type and reused for every file, then
+released with :meth:`ModelCache.clear` before the next step type loads
+its own.  The API keeps the models it warmed at startup in a resident
+cache; each job gets its own cache on top of it (``fallback``), which
+holds whatever else the job loads and is cleared after every step.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+
+class ModelCache:
+    """Loaded models keyed by everything that identifies them.
+
+    Keys are tuples starting with the model family (``("whisperx",
+    model_size, device, compute_type, language)``); loads are serialized so
+    concurrent steps asking for the same model wait for one load.  Models
+    already in *fallback* are used from there instead of being loaded.
+    """
+
+    def __init__(self, fallback: ModelCache | None = None):
+        self._models: dict[tuple, Any] = {}
+        self._fallback = fallback
+        self._lock = threading.Lock()
+        # Seconds spent loading, per model family
+        self.load_seconds: dict[str, float] = {}
+
+    def lookup(self, key: tuple) -> Any | None:
+        """The model loaded under *key*, or None; does not wait for loads in progress."""
+        return self._models.get(key)
+
+    def get(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        if self._fallback is not None:
+            model = self._fallback.lookup(key)
+            if model is not None:
+                return model
+        with self._lock:
+            if key not in self._models:
+                t0 = time.perf_counter()
+                self._models[key] = loader()
+                family = key[0]
+                self.load_seconds[family] = round(
+                    self.load_seconds.get(family, 0.0) + time.perf_counter() - t0, 3
+                )
+            return self._models[key]
+
+    def clear(self):
+        """Drop every model and give the memory back (including CUDA's cache).
+
+        Entries with a ``shutdown()`` method (worker pools) are shut down.
+        The fallback cache is left alone.
+        """
+        with self._lock:
+            for model in self._models.values():
+                if hasattr(model, "shutdown"):
+                    model.shutdown()
+            self._models.clear()
+        gc.collect()
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+def hf_model_cached(repo_id: str, download: bool = False, token: str | None = None) -> bool:
+    """Whether *repo_id* is in the local Hugging Face cache (fetched first with *download*)."""
+    from huggingface_hub import snapshot_download
+
+    try:
+        snapshot_download(repo_id, local_files_only=not download, token=token)
+    except Exception:
+        return False
+    return True
@@ -0,0 +1,54 @@
+"""Pipeline steps by name, imported only when a step is used.
+
+Steps are registered entry-point style, as ``"module:Class"`` strings,
+so listing them (``--help``, ``--steps`` choices, the API) imports none
+of their modules.  :func:`get_step` imports a step's module the first
+time it is asked for, right before the step runs; the heavy libraries
+(torch, whisperx, pyannote, transformers, TTS) are imported inside the
+steps' ``execute``.  ``benchmarks/startup.py`` checks that startup stays
+within its import-time budget.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.pipeline.base import PipelineStep
+
+_STEPS: dict[str, str] = {
+    "asr": "src.pipeline.asr:ASRStep",
+    "diarize": "src.pipeline.diarize:DiarizeStep",
+    "merge": "src.pipeline.merge:MergeStep",
+    "translate": "src.pipeline.translate:TranslateStep",
+    "tts": "src.pipeline.tts:TTSStep",
+    "render": "src.pipeline.render:RenderStep",
+}
+
+# Run order of a full pipeline; register_step() keeps it in sync
+STEPS_ORDER: list[str] = list(_STEPS)
+
+
+def register_step(name: str, target: str, after: str | None = None):
+    """Register step *name* as ``"module:Class"``, run after *after* (default: last).
+
+    Re-registering a name replaces its class and keeps its position.
+    """
+    if ":" not in target:
+        raise ValueError(f"step target must be 'module:Class', got {target!r}")
+    if after is not None and after not in _STEPS:
+        raise ValueError(f"unknown step: {after}")
+    _STEPS[name] = target
+    if name not in STEPS_ORDER:
+        STEPS_ORDER.insert(STEPS_ORDER.index(after) + 1 if after else len(STEPS_ORDER), name)
+
+
+def get_step(name: str) -> type[PipelineStep]:
+    """The step class registered as *name*, importing its module now."""
+    try:
+        target = _STEPS[name]
+    except KeyError:
+        raise ValueError(f"unknown step: {name}; choose from {', '.join(STEPS_ORDER)}") from None
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module), attr)
@@ -3,7 +3,6 @@
 from pathlib import Path
 
 import numpy as np
-import soundfile as sf
 
 from src.pipeline.base import PipelineStep, console
 from src.utils.audio import (
@@ -13,7 +12,8 @@ from src.utils.audio import (
     save_wav,
     time_stretch,
 )
-from src.utils.io import read_json, write_json
+from src.utils.peaks import write_peaks
+from src.utils.segments import SEGMENTS_FILE, build_segment_table
 
 
 class RenderStep(PipelineStep):
@@ -30,7 +30,8 @@ class RenderStep(PipelineStep):
         stretch_max = cfg.get("stretch_max", 1.15)
 
         # Load TTS manifest
-        manifest = read_json(self.workdir / "tts_manifest.json")
+        self.phase("io")
+        manifest = self.load_artifact(self.workdir / "tts_manifest.json")
         segments = manifest["segments"]
 
         if not segments:
@@ -38,6 +39,7 @@ class RenderStep(PipelineStep):
             return
 
         # ── Phase 1: compute ES durations with soft stretch ──────────────
+        self.phase("stretch")
         seg_audio = []  # list of (np.ndarray, float) = (audio_at_sr, dur_es)
         for seg in segments:
             tts_file = seg.get("tts_file")
@@ -45,14 +47,13 @@ class RenderStep(PipelineStep):
                 seg_audio.append(None)
                 continue
 
-            tts_path = self.workdir / tts_file
-            if not tts_path.exists():
+            # Load & resample
+            loaded = self.load_audio(self.workdir / tts_file)
+            if loaded is None:
                 console.print(f"    [yellow]Missing TTS file: {tts_file}[/yellow]")
                 seg_audio.append(None)
                 continue
-
-            # Load & resample
-            tts_data, file_sr = sf.read(str(tts_path), dtype="float32")
+            tts_data, file_sr = loaded
             if file_sr != sr:
                 tts_data = resample(tts_data, file_sr, sr)
 
@@ -85,6 +86,7 @@ class RenderStep(PipelineStep):
             seg_audio.append((tts_data, dur_es))
 
         # ── Phase 2: build ES timeline with sequential placement ─────────
+        self.phase("mix")
         timeline_map_segments = []
         cursor_es = segments[0]["start"]  # same initial offset
 
@@ -168,6 +170,7 @@ class RenderStep(PipelineStep):
         timeline = timeline[: last_nonzero + sr]  # Keep 1s trailing
 
         # Normalize LUFS
+        self.phase("loudness")
         target_lufs = cfg.get("target_lufs", -16.0)
         try:
             timeline = normalize_lufs(timeline, sr, target_lufs)
@@ -177,7 +180,16 @@ class RenderStep(PipelineStep):
         # Clip to prevent distortion
         timeline = np.clip(timeline, -1.0, 1.0)
 
+        # Waveform peaks for the translated track
+        self.phase("peaks")
+        try:
+            write_peaks(self.workdir, "translated", timeline, sr,
+                        self.config.get("peaks", {}).get("levels"))
+        except Exception as e:
+            console.print(f"    [yellow]Waveform peaks skipped: {e}[/yellow]")
+
         # Save WAV
+        self.phase("io")
         wav_path = self.workdir / "rendered.wav"
         save_wav(timeline, wav_path, sr)
         console.print(f"    Saved rendered.wav ({len(timeline) / sr:.1f}s, {sr}Hz)")
@@ -197,7 +209,13 @@ class RenderStep(PipelineStep):
             "duration_en": round(max_end_en, 3),
             "duration_es": round(max_end_es, 3),
         }
-        write_json(timeline_map, self.workdir / "timeline_map.json")
+        self.save_artifact(timeline_map, self.workdir / "timeline_map.json")
         console.print(f"    Saved timeline_map.json ({len(timeline_map_segments)} segments)")
 
+        # Materialize the joined segment table served by the API
+        rows = build_segment_table(self.workdir, load=self.load_artifact, exists=self.has_artifact)
+        if rows is not None:
+            self.save_artifact({"segments": rows}, self.workdir / SEGMENTS_FILE)
+            console.print("    Saved segments.json")
+
         console.print(f"    Rendered {rendered_count}/{len(segments)} segments")
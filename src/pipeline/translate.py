@@ -1,30 +1,92 @@
-"""Translation step: EN→ES using NLLB-200 distilled."""
+"""Translation step: EN→ES using NLLB-200 distilled.
+
+On CPU the model runs in int8 when the CPU supports it (see
+``translation.quantization``): either a CTranslate2 conversion cached in
+``translation.ct2_dir`` or torch dynamic quantization of the Linear layers.
+"""
+
+from __future__ import annotations
 
 import gc
+import shutil
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import torch
-
-from src.device import get_device
 from src.pipeline.base import PipelineStep, console
+from src.pipeline.models import hf_model_cached
 from src.utils.io import read_json, write_json
 from src.utils.text import clean_text, text_hash
 
+if TYPE_CHECKING:
+    import torch
+
 
 class TranslateStep(PipelineStep):
     name = "translate"
     output_files = ["translations.json"]
+    loads_models = True
 
-    def execute(self, progress_callback=None, **kwargs):
-        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+    def _settings(self) -> tuple[dict, torch.device, str | None]:
+        """(translation config, device, int8 backend)."""
+        from src.device import get_device, get_int8_backend
 
         cfg = self.config["translation"]
         device = get_device("translation", self.config["devices"].get("translation", "auto"))
+        return cfg, device, get_int8_backend(device, cfg.get("quantization", "auto"))
+
+    def _model(self, cfg: dict, device: torch.device, int8: str | None) -> tuple:
+        """(tokenizer, model or CTranslate2 translator), shared through the model cache."""
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+        from src.device import quantized_engine
+
+        def load_nllb():
+            tokenizer = AutoTokenizer.from_pretrained(cfg["model"])
+            if int8 == "ctranslate2":
+                return tokenizer, self._load_ct2(cfg["model"], Path(cfg.get("ct2_dir", "data/models/ct2")))
+            model = AutoModelForSeq2SeqLM.from_pretrained(cfg["model"]).to(device)
+            model.eval()
+            if int8 == "dynamic":
+                torch.backends.quantized.engine = quantized_engine()
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            return tokenizer, model
+
+        return self.load_model(("nllb", cfg["model"], str(device), int8), load_nllb)
+
+    def _translate(self, text: str, cfg: dict, device: torch.device, int8: str | None,
+                   tokenizer, model) -> str:
+        tgt_lang = cfg.get("tgt_lang", "spa_Latn")
+        max_length = cfg.get("max_length", 512)
+        if int8 == "ctranslate2":
+            return self._translate_text_ct2(text, tokenizer, model, tgt_lang, max_length)
+        return self._translate_text(
+            text, tokenizer, model, device,
+            tokenizer.convert_tokens_to_ids(tgt_lang), max_length,
+        )
+
+    def check_models(self, download: bool = False) -> list[dict]:
+        model = self.config["translation"]["model"]
+        return [{"model": model, "cached": hf_model_cached(model, download)}]
+
+    def warmup(self):
+        cfg, device, int8 = self._settings()
+        tokenizer, model = self._model(cfg, device, int8)
+        tokenizer.src_lang = cfg.get("src_lang", "eng_Latn")
+        self._translate("Hello, how are you?", cfg, device, int8, tokenizer, model)
+
+    def execute(self, progress_callback=None, **kwargs):
+        import torch
+
+        cfg, device, int8 = self._settings()
 
-        console.print(f"    Model: {cfg['model']}, device: {device}")
+        console.print(f"    Model: {cfg['model']}, device: {device}, int8: {int8 or 'no'}")
 
         # Load merged segments
-        merged_data = read_json(self.workdir / "merged_segments.json")
+        self.phase("io")
+        merged_data = self.load_artifact(self.workdir / "merged_segments.json")
         segments = merged_data["segments"]
 
         # Load translation cache if exists
@@ -38,16 +100,14 @@ class TranslateStep(PipelineStep):
 
         # Load model
         console.print("    Loading NLLB-200 model...")
-        tokenizer = AutoTokenizer.from_pretrained(cfg["model"])
-        model = AutoModelForSeq2SeqLM.from_pretrained(cfg["model"]).to(device)
-        model.eval()
+        self.phase("load_model")
+        tokenizer, model = self._model(cfg, device, int8)
 
         # Set source language
         tokenizer.src_lang = cfg.get("src_lang", "eng_Latn")
-        tgt_lang = cfg.get("tgt_lang", "spa_Latn")
-        forced_bos_token_id = tokenizer.convert_tokens_to_ids(tgt_lang)
 
         # Translate each segment
+        self.phase("inference")
         translated_segments = []
         total = len(segments)
 
@@ -61,10 +121,7 @@ class TranslateStep(PipelineStep):
                 console.print(f"    [{i+1}/{total}] (cached) {text_en[:50]}...")
             else:
                 try:
-                    text_es = self._translate_text(
-                        text_en, tokenizer, model, device,
-                        forced_bos_token_id, cfg.get("max_length", 512),
-                    )
+                    text_es = self._translate(text_en, cfg, device, int8, tokenizer, model)
                     cache[t_hash] = text_es
                     console.print(f"    [{i+1}/{total}] {text_en[:40]}... → {text_es[:40]}...")
                 except Exception as e:
@@ -85,12 +142,13 @@ class TranslateStep(PipelineStep):
             })
 
         # Save results
-        write_json({"segments": translated_segments}, self.workdir / "translations.json")
+        self.phase("io")
+        self.save_artifact({"segments": translated_segments}, self.workdir / "translations.json")
 
         # Save cache
         write_json(cache, cache_path)
 
-        # Free memory
+        # Free memory (models shared by a batch run stay in its ModelCache)
         del model, tokenizer
         gc.collect()
         if torch.cuda.is_available():
@@ -98,6 +156,43 @@ class TranslateStep(PipelineStep):
 
         console.print(f"    Translated {total} segments → translations.json")
 
+    @staticmethod
+    def _load_ct2(model_name: str, ct2_dir: Path):
+        """CTranslate2 int8 translator, converting the HF model on first use."""
+        import ctranslate2
+
+        model_dir = ct2_dir / f"{model_name.replace('/', '--')}-int8"
+        if not (model_dir / "model.bin").exists():
+            from ctranslate2.converters import TransformersConverter
+
+            console.print(f"    Converting {model_name} to CTranslate2 int8 → {model_dir}")
+            # Convert next to the target and rename, so an interrupted
+            # conversion never leaves a half-written model behind
+            partial = model_dir.with_name(model_dir.name + ".partial")
+            shutil.rmtree(partial, ignore_errors=True)
+            partial.parent.mkdir(parents=True, exist_ok=True)
+            TransformersConverter(model_name).convert(str(partial), quantization="int8")
+            partial.rename(model_dir)
+        return ctranslate2.Translator(str(model_dir), device="cpu", compute_type="int8")
+
+    @staticmethod
+    def _translate_text_ct2(
+        text: str,
+        tokenizer,
+        translator,
+        tgt_lang: str,
+        max_length: int,
+    ) -> str:
+        """Translate a single text string EN→ES with a CTranslate2 translator."""
+        source = tokenizer.convert_ids_to_tokens(
+            tokenizer.encode(text, truncation=True, max_length=max_length)
+        )
+        result = translator.translate_batch(
+            [source], target_prefix=[[tgt_lang]], max_decoding_length=max_length,
+        )
+        target = result[0].hypotheses[0][1:]  # drop the target language token
+        return tokenizer.decode(tokenizer.convert_tokens_to_ids(target), skip_special_tokens=True)
+
     @staticmethod
     def _translate_text(
         text: str,
@@ -108,6 +203,8 @@ class TranslateStep(PipelineStep):
         max_length: int,
     ) -> str:
         """Translate a single text string EN→ES."""
+        import torch
+
         inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=max_length)
         inputs = {k: v.to(device) for k, v in inputs.items()}
 
@@ -1,4 +1,10 @@
-"""TTS step: voice cloning with Coqui XTTS v2."""
+"""TTS step: voice cloning with Coqui XTTS v2.
+
+XTTS conditioning latents are computed once per speaker and kept in
+``speaker_refs/``.  Speakers the diarize step matched to a voice of the
+library (:mod:`src.voices`) take the library's reference clip and cached
+conditioning instead.
+"""
 
 import gc
 from collections import defaultdict
@@ -6,18 +12,17 @@ from pathlib import Path
 
 import numpy as np
 import soundfile as sf
-import torch
 
-from src.device import get_device
 from src.pipeline.base import PipelineStep, console
-from src.utils.audio import extract_segment, load_audio, save_wav
-from src.utils.io import read_json, write_json
+from src.utils.audio import load_audio_range, save_wav, synthetic_audio
 from src.utils.text import segment_cache_key, split_text_for_tts
+from src.voices import get_library, read_speaker_voices
 
 
 class TTSStep(PipelineStep):
     name = "tts"
     output_files = ["tts_segments"]
+    loads_models = True
 
     def outputs_exist(self) -> bool:
         """TTS outputs exist if the directory has .wav files."""
@@ -26,20 +31,59 @@ class TTSStep(PipelineStep):
             return False
         return any(tts_dir.rglob("*.wav"))
 
-    def execute(self, input_audio: str, progress_callback=None, **kwargs):
+    def _device(self) -> str:
+        from src.device import get_device
+
+        return str(get_device("tts", self.config["devices"].get("tts", "auto")))
+
+    def _tts_model(self, cfg: dict, device_str: str):
+        """The Coqui TTS API object, shared through the model cache."""
         from TTS.api import TTS
 
+        return self.load_model(("xtts", cfg["model"], device_str),
+                               lambda: TTS(cfg["model"]).to(device_str))
+
+    def check_models(self, download: bool = False) -> list[dict]:
+        from TTS.utils.manage import ModelManager
+
+        model = self.config["tts"]["model"]
+        manager = ModelManager(progress_bar=False)
+        model_dir = Path(manager.output_prefix) / model.replace("/", "--")
+        if download and not model_dir.exists():
+            manager.download_model(model)
+        return [{"model": model, "cached": model_dir.exists() and any(model_dir.iterdir())}]
+
+    def warmup(self):
         cfg = self.config["tts"]
-        device_str = str(get_device("tts", self.config["devices"].get("tts", "auto")))
+        tts = self._tts_model(cfg, self._device())
+        ref_wav = self.workdir / "warmup_ref.wav"
+        save_wav(synthetic_audio(3.0, 22050), ref_wav, 22050)
+        xtts = getattr(getattr(tts, "synthesizer", None), "tts_model", None)
+        if hasattr(xtts, "get_conditioning_latents"):
+            gpt_cond_latent, speaker_embedding = xtts.get_conditioning_latents(audio_path=[str(ref_wav)])
+            xtts.inference("Hola.", cfg.get("language", "es"), gpt_cond_latent, speaker_embedding)
+        else:
+            tts.tts_to_file(text="Hola.", speaker_wav=str(ref_wav), language=cfg.get("language", "es"),
+                            file_path=str(self.workdir / "warmup.wav"))
+
+    def execute(self, input_audio: str, progress_callback=None, **kwargs):
+        import torch
+
+        cfg = self.config["tts"]
+        device_str = self._device()
 
         console.print(f"    Model: {cfg['model']}, device: {device_str}")
 
         # Load translations
-        trans_data = read_json(self.workdir / "translations.json")
+        self.phase("io")
+        trans_data = self.load_artifact(self.workdir / "translations.json")
         segments = trans_data["segments"]
 
-        # Extract reference clips per speaker
-        refs = self._extract_reference_clips(segments, input_audio, cfg)
+        # Reference clips per speaker: library voices first, then extracted
+        self.phase("reference_clips")
+        library_refs = self._library_voices(cfg)
+        refs = self._extract_reference_clips(segments, input_audio, cfg, skip=set(library_refs))
+        refs.update({spk: ref for spk, (ref, _) in library_refs.items()})
 
         # Ensure output dirs
         tts_dir = self.workdir / "tts_segments"
@@ -49,9 +93,16 @@ class TTSStep(PipelineStep):
 
         # Load TTS model
         console.print("    Loading XTTS v2...")
-        tts = TTS(cfg["model"]).to(device_str)
+        self.phase("load_model")
+        tts = self._tts_model(cfg, device_str)
+        # The XTTS model behind the API, to condition once per speaker
+        xtts = getattr(getattr(tts, "synthesizer", None), "tts_model", None)
+        if not hasattr(xtts, "get_conditioning_latents"):
+            xtts = None
+        conditioning: dict[str, tuple] = {}
 
         # Generate TTS for each segment
+        self.phase("inference")
         total = len(segments)
         max_chars = cfg.get("max_chars_per_chunk", 350)
         manifest = []
@@ -83,20 +134,36 @@ class TTSStep(PipelineStep):
                 chunks = split_text_for_tts(text_es, max_chars)
                 all_audio = []
 
-                for chunk in chunks:
-                    tts.tts_to_file(
-                        text=chunk,
-                        speaker_wav=str(ref_wav),
-                        language=cfg.get("language", "es"),
-                        file_path=str(out_file),
-                    )
-                    chunk_audio, chunk_sr = sf.read(str(out_file), dtype="float32")
-                    all_audio.append(chunk_audio)
-
-                # Concatenate chunks
-                if len(all_audio) > 1:
-                    combined = np.concatenate(all_audio)
-                    save_wav(combined, out_file, chunk_sr)
+                if xtts is not None:
+                    if speaker not in conditioning:
+                        conditioning[speaker] = self._conditioning(
+                            xtts, speaker, ref_wav, cfg["model"], library_refs.get(speaker),
+                        )
+                    gpt_cond_latent, speaker_embedding = conditioning[speaker]
+                    for chunk in chunks:
+                        out = xtts.inference(chunk, cfg.get("language", "es"),
+                                             gpt_cond_latent, speaker_embedding)
+                        wav = out["wav"]
+                        if torch.is_tensor(wav):
+                            wav = wav.cpu().numpy()
+                        all_audio.append(np.asarray(wav, dtype=np.float32).reshape(-1))
+                    self.save_audio(np.concatenate(all_audio), out_file,
+                                    tts.synthesizer.output_sample_rate)
+                else:
+                    for chunk in chunks:
+                        tts.tts_to_file(
+                            text=chunk,
+                            speaker_wav=str(ref_wav),
+                            language=cfg.get("language", "es"),
+                            file_path=str(out_file),
+                        )
+                        chunk_audio, chunk_sr = sf.read(str(out_file), dtype="float32")
+                        all_audio.append(chunk_audio)
+
+                    # Concatenate chunks
+                    if len(all_audio) > 1:
+                        combined = np.concatenate(all_audio)
+                        self.save_audio(combined, out_file, chunk_sr)
 
                 console.print(f"    [{i+1}/{total}] {speaker}: {text_es[:40]}...")
                 manifest.append({**seg, "tts_file": str(out_file.relative_to(self.workdir))})
@@ -115,22 +182,61 @@ class TTSStep(PipelineStep):
             })
 
         # Save manifest
-        write_json({"segments": manifest}, self.workdir / "tts_manifest.json")
+        self.phase("io")
+        self.save_artifact({"segments": manifest}, self.workdir / "tts_manifest.json")
 
-        # Free memory
-        del tts
+        # Free memory (models shared by a batch run stay in its ModelCache)
+        del tts, xtts, conditioning
         gc.collect()
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
 
         console.print(f"    Generated TTS for {total} segments")
 
+    def _library_voices(self, cfg: dict) -> dict[str, tuple[Path, Path | None]]:
+        """(reference clip, cached conditioning) of speakers matched to library voices."""
+        library = get_library(self.config)
+        if library is None:
+            return {}
+        voices = {}
+        for speaker, match in read_speaker_voices(self.workdir).items():
+            ref = library.reference(match["voice"])
+            if ref is None:
+                continue
+            voices[speaker] = (ref, library.conditioning(match["voice"], cfg["model"]))
+            console.print(f"    {speaker}: using library voice {match['name']}")
+        return voices
+
+    def _conditioning(self, xtts, speaker: str, ref_wav: Path, model_name: str,
+                      library_voice: tuple[Path, Path | None] | None) -> tuple:
+        """XTTS (gpt_cond_latent, speaker_embedding) for *speaker*, computed at most once.
+
+        Comes from the library, else from ``speaker_refs/<speaker>_conditioning.pt``
+        of an earlier run with the same model, else from the reference clip.
+        """
+        import torch
+
+        cached = self.workdir / "speaker_refs" / f"{speaker}_conditioning.pt"
+        for path in ((library_voice or (None, None))[1], cached):
+            if path is not None and path.exists():
+                data = torch.load(path, map_location="cpu")
+                if data.get("model") == model_name:
+                    device = next(xtts.parameters()).device
+                    return data["gpt_cond_latent"].to(device), data["speaker_embedding"].to(device)
+
+        gpt_cond_latent, speaker_embedding = xtts.get_conditioning_latents(audio_path=[str(ref_wav)])
+        torch.save({"model": model_name, "gpt_cond_latent": gpt_cond_latent.cpu(),
+                    "speaker_embedding": speaker_embedding.cpu()}, cached)
+        return gpt_cond_latent, speaker_embedding
+
     def _extract_reference_clips(
-        self, segments: list, input_audio: str, cfg: dict
+        self, segments: list, input_audio: str, cfg: dict, skip: set[str] = frozenset()
     ) -> dict[str, Path]:
         """Extract the best reference clip per speaker from original audio.
 
         Picks the longest clean segments within ref_min/max_duration.
+        Speakers in *skip* (library voices) are left out.  Only the picked
+        time ranges are decoded, and nothing is when every clip exists.
         """
         ref_dir = self.workdir / "speaker_refs"
         ref_dir.mkdir(exist_ok=True)
@@ -142,15 +248,13 @@ class TTSStep(PipelineStep):
         by_speaker = defaultdict(list)
         for seg in segments:
             dur = seg["end"] - seg["start"]
-            if dur >= min_dur:
+            if dur >= min_dur and seg["speaker"] not in skip:
                 by_speaker[seg["speaker"]].append(seg)
 
         for spk in by_speaker:
             by_speaker[spk].sort(key=lambda s: s["end"] - s["start"], reverse=True)
 
         refs = {}
-        audio_data = load_audio(input_audio, sr=22050)  # XTTS expects 22050
-
         for speaker, speaker_segs in by_speaker.items():
             ref_path = ref_dir / f"{speaker}_ref.wav"
             if ref_path.exists():
@@ -166,7 +270,8 @@ class TTSStep(PipelineStep):
                 take_dur = min(seg_dur, max_dur - collected_duration)
                 if take_dur <= 0:
                     break
-                clip = extract_segment(audio_data, 22050, seg["start"], seg["start"] + take_dur)
+                # XTTS expects 22050
+                clip = load_audio_range(input_audio, seg["start"], seg["start"] + take_dur, sr=22050)
                 clips.append(clip)
                 collected_duration += take_dur
 
@@ -178,8 +283,7 @@ class TTSStep(PipelineStep):
 
         return refs
 
-    @staticmethod
-    def _write_silence(path: Path, duration: float, sr: int = 22050):
+    def _write_silence(self, path: Path, duration: float, sr: int = 22050):
         """Write a silence WAV file as fallback."""
         silence = np.zeros(int(duration * sr), dtype=np.float32)
-        save_wav(silence, path, sr)
+        self.save_audio(silence, path, sr)
@@ -0,0 +1,244 @@
+"""Step artifacts in a compact columnar format, with JSON as interchange.
+
+Tabular artifacts (``asr.json``, ``diarization.json``, ``merged_segments.json``,
+``translations.json``, ``tts_manifest.json``, ``timeline_map.json``,
+``segments.json``) are still addressed by their ``.json`` path, but with
+``artifacts.format: columnar`` they are stored next to it as a directory
+of NumPy arrays::
+
+    asr.cols/
+      schema.json                        # tables, column kinds, top-level scalars
+      segments.start.npy                 # float64
+      segments.text.codes.npy            # int32 index into the string table
+      segments.text.blob.npy             # uint8, UTF-8 of the distinct strings
+      segments.text.offsets.npy          # int64, string boundaries in the blob
+      segments.words.offsets.npy         # int64, rows of the nested table
+      segments.words.start.npy
+      segments.words.state.npy           # int8: 0 missing, 1 value, 2 null
+
+Every list of objects becomes a table (nested lists become child tables
+with row offsets); arrays are read memory-mapped.  :func:`read_artifact`
+returns the same dicts and lists whichever format is on disk (the newer
+one wins if both are), so steps and routes never care.
+``artifacts.json_export`` (on by default) also writes the plain JSON
+file, so tools reading the ``.json`` outputs keep working.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.utils.io import read_json, write_json
+
+COLUMNAR_SUFFIX = ".cols"
+SCHEMA_FILE = "schema.json"
+
+# Value states, stored only for columns that have missing or null values
+_MISSING, _VALUE, _NULL = 0, 1, 2
+
+
+def columnar_path(path: Path) -> Path:
+    """``asr.json`` → ``asr.cols``."""
+    return path.with_suffix(COLUMNAR_SUFFIX)
+
+
+def artifact_files(path: Path) -> list[Path]:
+    """Files whose mtime changes when the artifact at *path* is rewritten."""
+    return [path, columnar_path(path) / SCHEMA_FILE]
+
+
+def artifact_exists(path: Path) -> bool:
+    return any(p.exists() for p in artifact_files(path))
+
+
+def remove_artifact(path: Path):
+    path.unlink(missing_ok=True)
+    shutil.rmtree(columnar_path(path), ignore_errors=True)
+
+
+# ── Encoding ────────────────────────────────────────────────────────────
+
+def _kind(values: list) -> str:
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, bool) for v in present):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return "int"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "float"
+    if all(isinstance(v, str) for v in present):
+        return "str"
+    if all(isinstance(v, list) and all(isinstance(x, dict) for x in v) for v in present):
+        return "table"
+    return "json"
+
+
+def _is_table(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(row, dict) for row in value)
+
+
+def _save(out_dir: Path, name: str, array: np.ndarray):
+    np.save(out_dir / f"{name}.npy", array, allow_pickle=False)
+
+
+def _encode_strings(out_dir: Path, prefix: str, values: list[str]):
+    codes: dict[str, int] = {}
+    column = np.fromiter((codes.setdefault(v, len(codes)) for v in values),
+                         dtype=np.int32, count=len(values))
+    encoded = [s.encode("utf-8") for s in codes]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    _save(out_dir, f"{prefix}.codes", column)
+    _save(out_dir, f"{prefix}.blob", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    _save(out_dir, f"{prefix}.offsets", offsets)
+
+
+def _encode_table(out_dir: Path, name: str, rows: list[dict], tables: dict):
+    keys: dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    columns = {}
+    for key in keys:
+        prefix = f"{name}.{key}"
+        raw = [row.get(key) for row in rows]
+        state = np.fromiter(
+            (_VALUE if key in row and row[key] is not None else _NULL if key in row else _MISSING
+             for row in rows),
+            dtype=np.int8, count=len(rows),
+        )
+        if not np.all(state == _VALUE):
+            _save(out_dir, f"{prefix}.state", state)
+        kind = _kind(raw)
+        if kind == "bool":
+            _save(out_dir, prefix, np.array([bool(v) for v in raw], dtype=bool))
+        elif kind == "int":
+            _save(out_dir, prefix, np.array([v or 0 for v in raw], dtype=np.int64))
+        elif kind == "float":
+            _save(out_dir, prefix, np.array([np.nan if v is None else v for v in raw],
+                                            dtype=np.float64))
+        elif kind == "str":
+            _encode_strings(out_dir, prefix, [v or "" for v in raw])
+        elif kind == "table":
+            child_rows = [r for v in raw for r in (v or [])]
+            offsets = np.zeros(len(raw) + 1, dtype=np.int64)
+            np.cumsum([len(v or []) for v in raw], out=offsets[1:])
+            _save(out_dir, f"{prefix}.offsets", offsets)
+            _encode_table(out_dir, prefix, child_rows, tables)
+        else:
+            _encode_strings(out_dir, prefix, [json.dumps(v, ensure_ascii=False) for v in raw])
+        columns[key] = kind
+    tables[name] = {"rows": len(rows), "columns": columns}
+
+
+def write_columnar(data: dict, path: Path):
+    """Store *data* as ``<path>.cols``; lists of objects become tables."""
+    final = columnar_path(path)
+    tmp = final.with_name(f"{final.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    tables: dict[str, dict] = {}
+    scalars = {}
+    for key, value in data.items():
+        if _is_table(value):
+            _encode_table(tmp, key, value, tables)
+        else:
+            scalars[key] = value
+    write_json({"version": 1, "keys": list(data), "scalars": scalars, "tables": tables},
+               tmp / SCHEMA_FILE, indent=None)
+
+    # Swap directories; the old copy is only removed once the new one is in place
+    old = final.with_name(f"{final.name}.old-{os.getpid()}")
+    if final.exists():
+        final.rename(old)
+    tmp.rename(final)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+# ── Decoding ────────────────────────────────────────────────────────────
+
+def _load(in_dir: Path, name: str) -> np.ndarray:
+    return np.load(in_dir / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+
+
+def _decode_strings(in_dir: Path, prefix: str) -> list[str]:
+    blob = _load(in_dir, f"{prefix}.blob")
+    offsets = _load(in_dir, f"{prefix}.offsets").tolist()
+    data = blob.tobytes()
+    distinct = [data[a:b].decode("utf-8") for a, b in zip(offsets[:-1], offsets[1:])]
+    return [distinct[c] for c in _load(in_dir, f"{prefix}.codes").tolist()]
+
+
+def _decode_table(in_dir: Path, name: str, tables: dict) -> list[dict]:
+    spec = tables[name]
+    n = spec["rows"]
+    rows: list[dict] = [{} for _ in range(n)]
+    for key, kind in spec["columns"].items():
+        prefix = f"{name}.{key}"
+        if kind == "str":
+            values = _decode_strings(in_dir, prefix)
+        elif kind == "json":
+            values = [json.loads(v) for v in _decode_strings(in_dir, prefix)]
+        elif kind == "table":
+            children = _decode_table(in_dir, prefix, tables)
+            offsets = _load(in_dir, f"{prefix}.offsets").tolist()
+            values = [children[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+        else:
+            values = _load(in_dir, prefix).tolist()
+
+        state_file = in_dir / f"{prefix}.state.npy"
+        if state_file.exists():
+            state = np.load(state_file).tolist()
+            for row, s, v in zip(rows, state, values):
+                if s == _VALUE:
+                    row[key] = v
+                elif s == _NULL:
+                    row[key] = None
+        else:
+            for row, v in zip(rows, values):
+                row[key] = v
+    return rows
+
+
+def read_columnar(path: Path) -> dict:
+    in_dir = columnar_path(path)
+    schema = read_json(in_dir / SCHEMA_FILE)
+    data = {}
+    for key in schema["keys"]:
+        if key in schema["tables"]:
+            data[key] = _decode_table(in_dir, key, schema["tables"])
+        else:
+            data[key] = schema["scalars"][key]
+    return data
+
+
+# ── Public API ──────────────────────────────────────────────────────────
+
+def write_artifact(data: dict, path: Path, config: dict | None = None):
+    """Write a step artifact in the format chosen by ``artifacts`` in *config*."""
+    cfg = (config or {}).get("artifacts", {})
+    if cfg.get("format", "columnar") == "columnar":
+        # The JSON export goes first so the columnar copy is the newer one
+        if cfg.get("json_export", True):
+            write_json(data, path, indent=None)
+        else:
+            path.unlink(missing_ok=True)
+        write_columnar(data, path)
+    else:
+        write_json(data, path)
+        shutil.rmtree(columnar_path(path), ignore_errors=True)
+
+
+def read_artifact(path: Path) -> dict:
+    """Read an artifact written by :func:`write_artifact` (or any plain JSON file)."""
+    schema = columnar_path(path) / SCHEMA_FILE
+    if schema.exists() and (not path.exists()
+                            or schema.stat().st_mtime_ns >= path.stat().st_mtime_ns):
+        return read_columnar(path)
+    return read_json(path)
@@ -37,6 +37,38 @@ def load_audio(path: str | Path, sr: int = 16000) -> np.ndarray:
     return audio
 
 
+def load_audio_range(path: str | Path, start: float, end: float, sr: int = 16000) -> np.ndarray:
+    """Decode only ``[start, end)`` seconds of an audio file, mono float32 at *sr*.
+
+    Files libsndfile reads at the target rate are read with a frame-level
+    seek; anything else goes through ffmpeg with input seeking (``-ss``
+    before ``-i``), decoded straight to a pipe.  Neither decodes the rest
+    of the file.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Audio file not found: {path}")
+
+    try:
+        native_sr = sf.info(str(path)).samplerate
+    except RuntimeError:  # format libsndfile can't read (mp3 on old builds, m4a...)
+        native_sr = None
+    if native_sr == sr:
+        audio, _ = sf.read(str(path), start=int(start * sr), stop=int(end * sr),
+                           dtype="float32", always_2d=True)
+        return audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+
+    result = subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}",
+            "-i", str(path), "-ar", str(sr), "-ac", "1", "-f", "f32le", "pipe:1",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(result.stdout, dtype=np.float32).copy()
+
+
 def normalize_lufs(audio: np.ndarray, sr: int, target_lufs: float = -16.0) -> np.ndarray:
     """Normalize audio to target LUFS loudness."""
     import pyloudnorm as pyln
@@ -57,6 +89,42 @@ def extract_segment(audio: np.ndarray, sr: int, start: float, end: float) -> np.
     return audio[start_sample:end_sample]
 
 
+def split_on_pauses(audio: np.ndarray, sr: int, target_seconds: float,
+                    search_seconds: float = 30.0, pause_seconds: float = 0.5,
+                    frame_seconds: float = 0.03) -> list[tuple[int, int]]:
+    """Split audio into ~target_seconds shards, cutting in the quietest pause.
+
+    Each cut is placed where the frame energy, averaged over *pause_seconds*,
+    is lowest within ``±search_seconds`` of the target length, so shards end
+    between words rather than inside them.  Returns ``(start, end)`` sample
+    ranges covering the whole array in order; the last shard absorbs a
+    remainder shorter than the search window.  *target_seconds* must span
+    at least two frames, or no cut could advance.
+    """
+    if target_seconds < 2 * frame_seconds:
+        raise ValueError(f"target_seconds must be at least {2 * frame_seconds:g}s, "
+                         f"got {target_seconds:g}")
+    frame = max(1, int(sr * frame_seconds))
+    n_frames = len(audio) // frame
+    target = int(target_seconds / frame_seconds)
+    search = max(1, min(int(search_seconds / frame_seconds), target // 2))
+    if n_frames <= target + search:
+        return [(0, len(audio))]
+
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy = np.einsum("ij,ij->i", frames, frames) / frame
+    window = max(1, int(pause_seconds / frame_seconds))
+    energy = np.convolve(energy, np.ones(window) / window, mode="same")
+
+    cuts = [0]
+    while n_frames - cuts[-1] > target + search:
+        lo = cuts[-1] + target - search
+        hi = cuts[-1] + target + search
+        cuts.append(lo + int(np.argmin(energy[lo:hi])))
+    bounds = [c * frame for c in cuts] + [len(audio)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
 def time_stretch(audio: np.ndarray, sr: int, target_duration: float,
                  min_rate: float = 0.7, max_rate: float = 1.5) -> np.ndarray:
     """Time-stretch audio to fit a target duration.
@@ -99,6 +167,14 @@ def resample(audio: np.ndarray, sr_orig: int, sr_target: int) -> np.ndarray:
     return librosa.resample(audio, orig_sr=sr_orig, target_sr=sr_target)
 
 
+def synthetic_audio(seconds: float, sr: int, seed: int = 0) -> np.ndarray:
+    """A quiet voiced-like signal (harmonics plus noise), for warm-up inference."""
+    t = np.arange(int(seconds * sr)) / sr
+    tone = sum(np.sin(2 * np.pi * f * t) / k for k, f in enumerate((140, 280, 420, 560), 1))
+    noise = np.random.default_rng(seed).normal(0.0, 0.01, len(t))
+    return (0.05 * tone * (1 + np.sin(2 * np.pi * 3 * t)) / 2 + noise).astype(np.float32)
+
+
 def save_wav(audio: np.ndarray, path: str | Path, sr: int):
     """Save numpy array as WAV file."""
     sf.write(str(path), audio, sr)
@@ -115,3 +191,43 @@ def export_mp3(wav_path: str | Path, mp3_path: str | Path, quality: int = 2):
         capture_output=True,
         check=True,
     )
+
+
+def transcode_opus(src_path: str | Path, dst_path: str | Path, bitrate_kbps: int):
+    """Encode any ffmpeg-readable file as mono Ogg/Opus tuned for speech."""
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-i", str(src_path),
+            "-vn", "-ac", "1",
+            "-codec:a", "libopus", "-b:a", f"{bitrate_kbps}k",
+            "-vbr", "on", "-application", "voip",
+            "-f", "ogg", str(dst_path),
+        ],
+        capture_output=True,
+        check=True,
+    )
+
+
+def probe_duration(path: str | Path) -> float | None:
+    """Duration of an audio file in seconds, or None if it can't be read.
+
+    Reads the header with soundfile; falls back to ffprobe for containers
+    libsndfile doesn't handle (m4a, older mp3 builds).
+    """
+    try:
+        return float(sf.info(str(path)).duration)
+    except Exception:
+        pass
+    try:
+        out = subprocess.run(
+            [
+                "ffprobe", "-v", "error", "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1", str(path),
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        return float(out.stdout.strip())
+    except Exception:
+        return None
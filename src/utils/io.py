@@ -4,10 +4,11 @@ import json
 from pathlib import Path
 
 
-def write_json(data: dict | list, path: Path):
-    """Write data to JSON file with pretty formatting."""
+def write_json(data: dict | list, path: Path, indent: int | None = 2):
+    """Write data to JSON file, pretty-printed unless *indent* is None."""
+    separators = (",", ":") if indent is None else None
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        json.dump(data, f, ensure_ascii=False, indent=indent, separators=separators)
 
 
 def read_json(path: Path) -> dict | list:
@@ -0,0 +1,91 @@
+"""Multi-resolution min/max waveform peaks for drawing long tracks.
+
+Each level stores one (min, max) pair per bin of ``samples_per_bin`` input
+samples as interleaved signed 8-bit values in a raw ``.bin`` file, next to
+a small JSON header describing all levels of the track.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.io import read_json, write_json
+
+PEAKS_DIR = "peaks"
+DEFAULT_LEVELS = [256, 2048, 16384]
+
+
+def _bin_minmax(values: np.ndarray, factor: int) -> tuple[np.ndarray, np.ndarray]:
+    """Min and max over consecutive groups of *factor* values (last may be short)."""
+    n_full = len(values) // factor
+    head = values[: n_full * factor].reshape(n_full, factor)
+    mins, maxs = head.min(axis=1), head.max(axis=1)
+    if len(values) > n_full * factor:
+        tail = values[n_full * factor:]
+        mins = np.append(mins, tail.min())
+        maxs = np.append(maxs, tail.max())
+    return mins, maxs
+
+
+def compute_peaks(audio: np.ndarray, levels: list[int]) -> dict[int, np.ndarray]:
+    """Compute a min/max pyramid in one vectorized pass per level.
+
+    The finest level is reduced from the samples; each coarser level is
+    reduced from the previous one when its bin size is a multiple of it.
+
+    Returns:
+        ``{samples_per_bin: int8 array of shape (n_bins, 2)}``
+    """
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    levels = sorted(levels)
+    pyramid: dict[int, np.ndarray] = {}
+
+    prev_spb = None
+    prev_min = prev_max = None
+    for spb in levels:
+        if len(audio) == 0:
+            mins = maxs = np.zeros(0, dtype=np.float32)
+        elif prev_spb is not None and spb % prev_spb == 0:
+            factor = spb // prev_spb
+            mins, _ = _bin_minmax(prev_min, factor)
+            _, maxs = _bin_minmax(prev_max, factor)
+        else:
+            mins, maxs = _bin_minmax(audio, spb)
+        prev_spb, prev_min, prev_max = spb, mins, maxs
+
+        pairs = np.stack([mins, maxs], axis=1)
+        pyramid[spb] = np.clip(np.round(pairs * 127.0), -128, 127).astype(np.int8)
+
+    return pyramid
+
+
+def write_peaks(workdir: Path, track: str, audio: np.ndarray, sample_rate: int,
+                levels: list[int] | None = None):
+    """Compute and store the peak pyramid for *track* under ``peaks/``."""
+    levels = levels or DEFAULT_LEVELS
+    out_dir = workdir / PEAKS_DIR
+    out_dir.mkdir(exist_ok=True)
+
+    pyramid = compute_peaks(audio, levels)
+    for spb, pairs in pyramid.items():
+        (out_dir / f"{track}_{spb}.bin").write_bytes(pairs.tobytes())
+
+    write_json({
+        "sample_rate": sample_rate,
+        "samples": int(len(audio)),
+        "levels": {str(spb): int(len(pairs)) for spb, pairs in pyramid.items()},
+    }, out_dir / f"{track}.json")
+
+
+def read_peaks_header(workdir: Path, track: str) -> dict | None:
+    path = workdir / PEAKS_DIR / f"{track}.json"
+    if not path.exists():
+        return None
+    return read_json(path)
+
+
+def peaks_path(workdir: Path, track: str, samples_per_bin: int) -> Path:
+    return workdir / PEAKS_DIR / f"{track}_{samples_per_bin}.bin"
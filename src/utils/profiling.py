@@ -0,0 +1,130 @@
+"""Opt-in profiling of pipeline steps.
+
+Enabled per step through ``profiling.steps`` in the config (or
+``--profile tts,render`` on the CLI).  A profiled step writes into its
+workdir:
+
+- ``profile_<step>.pstats``: deterministic cProfile data
+  (``python -m pstats``, snakeviz, ...);
+- ``profile_<step>.collapsed``: stacks sampled from the step's thread, one
+  ``frame;frame;frame count`` line per stack, ready for ``flamegraph.pl``
+  or speedscope;
+- ``profile_<step>_alloc.txt`` with ``profiling.memory: true``: the
+  tracemalloc snapshot diff of the step, top allocation sites first.
+
+This module is only imported when a step is profiled, so disabled
+profiling costs nothing.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+DEFAULT_SAMPLE_INTERVAL_MS = 5
+DEFAULT_TOP_ALLOCATIONS = 30
+# Frames kept per tracemalloc traceback (more = slower, finer attribution)
+TRACEMALLOC_FRAMES = 10
+
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="stack-sampler")
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def write(self, path: Path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class StepProfiler:
+    """Context manager profiling the block that runs one step."""
+
+    def __init__(self, step: str, workdir: Path, cfg: dict):
+        self.step = step
+        self.workdir = workdir
+        self.memory = cfg.get("memory", False)
+        self.interval = cfg.get("sample_interval_ms", DEFAULT_SAMPLE_INTERVAL_MS) / 1000
+        self.top = cfg.get("top_allocations", DEFAULT_TOP_ALLOCATIONS)
+
+    def __enter__(self) -> "StepProfiler":
+        self._started_tracemalloc = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._before = tracemalloc.take_snapshot()
+        self._sampler = StackSampler(threading.get_ident(), self.interval).start()
+        self._profile: cProfile.Profile | None = cProfile.Profile()
+        try:
+            self._profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one cProfile per process: another step
+            # running concurrently is already profiled.  Keep the samples.
+            self._profile = None
+        return self
+
+    def __exit__(self, *exc):
+        if self._profile is not None:
+            self._profile.disable()
+        self._sampler.stop()
+        if self.memory:
+            # Snapshot before writing the reports so they don't show up in it.
+            # Only what the step kept alive appears in the diff; temporaries
+            # are reflected in the peak.
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            self._write_alloc_diff(after, peak)
+
+        if self._profile is not None:
+            self._profile.dump_stats(self.workdir / f"profile_{self.step}.pstats")
+        self._sampler.write(self.workdir / f"profile_{self.step}.collapsed")
+        return False
+
+    def _write_alloc_diff(self, after: tracemalloc.Snapshot, peak: int):
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diff = after.filter_traces(ignore).compare_to(
+            self._before.filter_traces(ignore), "traceback",
+        )
+        with open(self.workdir / f"profile_{self.step}_alloc.txt", "w") as f:
+            f.write(f"Peak traced memory: {peak / 2**20:.1f} MiB\n")
+            f.write(f"Top {self.top} allocation sites by size delta:\n\n")
+            for stat in diff[: self.top]:
+                f.write(f"{stat.size_diff / 2**20:+.2f} MiB "
+                        f"({stat.count_diff:+d} blocks, now {stat.size / 2**20:.2f} MiB)\n")
+                for line in stat.traceback.format(most_recent_first=True):
+                    f.write(f"    {line}\n")
+                f.write("\n")
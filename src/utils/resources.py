@@ -0,0 +1,123 @@
+"""Process resource measurements for per-step instrumentation.
+
+RSS is sampled from a background thread (psutil if installed, otherwise
+``/proc/self/statm``) so a step's peak is its own, not the lifetime peak
+that ``getrusage`` reports.  GPU memory is only queried when torch is
+already imported; measuring never pulls it in.
+"""
+
+from __future__ import annotations
+
+import os
+import resource
+import sys
+import threading
+import time
+
+# Seconds between RSS samples while a step runs.
+RSS_SAMPLE_INTERVAL = 0.25
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> int | None:
+    """Resident set size of this process in bytes, or None if unavailable."""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def lifetime_peak_rss() -> int:
+    """Peak RSS since process start (``ru_maxrss`` is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Track the peak RSS between :meth:`start` and :meth:`stop`."""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = current_rss()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "RssSampler":
+        if self.peak is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True, name="rss-sampler")
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def stop(self) -> int | None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
+        return self.peak
+
+
+def reset_gpu_peak():
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.reset_peak_memory_stats()
+
+
+def gpu_memory() -> dict | None:
+    """GPU memory of this process in bytes, if torch is loaded and has a GPU.
+
+    CUDA reports the peak allocated since :func:`reset_gpu_peak`; MPS only
+    exposes the current driver allocation.
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return None
+    try:
+        if torch.cuda.is_available():
+            return {"device": "cuda", "peak_bytes": int(torch.cuda.max_memory_allocated())}
+        if torch.backends.mps.is_available():
+            return {"device": "mps", "current_bytes": int(torch.mps.driver_allocated_memory())}
+    except Exception:
+        return None
+    return None
+
+
+class ResourceTracker:
+    """Wall time, CPU time, peak RSS and GPU memory over one block of work.
+
+    CPU time is process-wide: it includes torch's native threads but not
+    ffmpeg subprocesses, and concurrent jobs inflate each other's numbers.
+    """
+
+    def __init__(self):
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        reset_gpu_peak()
+        self._rss = RssSampler().start()
+
+    def stop(self) -> dict:
+        metrics = {
+            "wall_seconds": round(time.perf_counter() - self._wall0, 3),
+            "cpu_seconds": round(time.process_time() - self._cpu0, 3),
+            "peak_rss_bytes": self._rss.stop(),
+        }
+        gpu = gpu_memory()
+        if gpu is not None:
+            metrics["gpu"] = gpu
+        return metrics
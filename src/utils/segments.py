@@ -0,0 +1,144 @@
+"""Joined segment table (text + EN/ES timestamps) and a time-window index."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable
+
+from src.utils.artifacts import artifact_exists, artifact_files, read_artifact, write_artifact
+
+SEGMENTS_FILE = "segments.json"
+
+# Files the table is derived from, in order of preference for the text.
+SOURCE_FILES = ["translations.json", "merged_segments.json", "timeline_map.json"]
+
+
+def join_segments(segments: list[dict], timeline_segments: list[dict] | None) -> list[dict]:
+    """Join text segments with timeline-map entries by index.
+
+    Rows have the same fields as the API ``Segment`` model.
+    """
+    timeline_segments = timeline_segments or []
+    rows = []
+    for i, seg in enumerate(segments):
+        start = seg.get("start", 0)
+        end = seg.get("end", 0)
+
+        start_es = end_es = duration_es = None
+        if i < len(timeline_segments):
+            tm_seg = timeline_segments[i]
+            start_es = tm_seg.get("start_es")
+            end_es = tm_seg.get("end_es")
+            if start_es is not None and end_es is not None:
+                duration_es = round(end_es - start_es, 3)
+
+        rows.append({
+            "start": start,
+            "end": end,
+            "duration": seg.get("duration", end - start),
+            "speaker": seg.get("speaker", "UNKNOWN"),
+            "text_en": seg.get("text_en", ""),
+            "text_es": seg.get("text_es", seg.get("text_en", "")),
+            "start_es": start_es,
+            "end_es": end_es,
+            "duration_es": duration_es,
+        })
+    return rows
+
+
+def build_segment_table(
+    workdir: Path,
+    load: Callable[[Path], dict] = read_artifact,
+    exists: Callable[[Path], bool] = artifact_exists,
+) -> list[dict] | None:
+    """Build the joined table from the step outputs in *workdir*.
+
+    Uses translations.json (falling back to merged_segments.json) plus
+    timeline_map.json when present.  Returns None if no segments exist yet.
+    Artifacts are read with *load* and *exists* (a step's, to read from the bus).
+    """
+    translations_path = workdir / "translations.json"
+    merged_path = workdir / "merged_segments.json"
+    if exists(translations_path):
+        data = load(translations_path)
+    elif exists(merged_path):
+        data = load(merged_path)
+    else:
+        return None
+
+    timeline_segments = None
+    timeline_map_path = workdir / "timeline_map.json"
+    if exists(timeline_map_path):
+        timeline_segments = load(timeline_map_path).get("segments", [])
+
+    return join_segments(data.get("segments", []), timeline_segments)
+
+
+def write_segment_table(workdir: Path, config: dict | None = None) -> Path | None:
+    """Materialize the joined table as the ``segments.json`` artifact."""
+    rows = build_segment_table(workdir)
+    if rows is None:
+        return None
+    path = workdir / SEGMENTS_FILE
+    write_artifact({"segments": rows}, path, config)
+    return path
+
+
+def source_files(workdir: Path) -> list[Path]:
+    """Files whose changes make the table stale (in either artifact format)."""
+    return [f for name in SOURCE_FILES for f in artifact_files(workdir / name)]
+
+
+def load_segment_table(workdir: Path) -> list[dict] | None:
+    """Read the materialized table, rebuilding it if it is missing or stale."""
+    path = workdir / SEGMENTS_FILE
+    table_files = [f for f in artifact_files(path) if f.exists()]
+    if table_files:
+        table_mtime = max(f.stat().st_mtime_ns for f in table_files)
+        if all(not s.exists() or s.stat().st_mtime_ns <= table_mtime
+               for s in source_files(workdir)):
+            return read_artifact(path)["segments"]
+    return build_segment_table(workdir)
+
+
+class SegmentIndex:
+    """Binary-search index over segment start times for each track.
+
+    ``window(t0, t1, track)`` returns the rows overlapping ``[t0, t1]`` on
+    the EN (``start``/``end``) or ES (``start_es``/``end_es``) timeline in
+    O(log n + k).  A running maximum of end times makes the lower bound
+    correct even when segments overlap.
+    """
+
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self._tracks: dict[str, tuple[list[int], list[float], list[float]]] = {}
+        for track in ("en", "es"):
+            starts = [self._start(r, track) for r in rows]
+            order = sorted(range(len(rows)), key=starts.__getitem__)
+            sorted_starts = [starts[i] for i in order]
+            max_ends = list(accumulate((self._end(rows[i], track) for i in order), max))
+            self._tracks[track] = (order, sorted_starts, max_ends)
+
+    @staticmethod
+    def _start(row: dict, track: str) -> float:
+        if track == "es" and row.get("start_es") is not None:
+            return row["start_es"]
+        return row["start"]
+
+    @staticmethod
+    def _end(row: dict, track: str) -> float:
+        if track == "es" and row.get("end_es") is not None:
+            return row["end_es"]
+        return row["end"]
+
+    def window(self, t0: float | None, t1: float | None, track: str = "en") -> list[dict]:
+        order, starts, max_ends = self._tracks[track]
+        lo = 0 if t0 is None else bisect_left(max_ends, t0)
+        hi = len(order) if t1 is None else bisect_right(starts, t1)
+        rows = (self.rows[i] for i in order[lo:hi])
+        if t0 is None:
+            return list(rows)
+        return [r for r in rows if self._end(r, track) >= t0]
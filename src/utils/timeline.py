@@ -0,0 +1,83 @@
+"""EN↔ES timeline mapping over RenderStep's timeline map."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from typing import Iterable
+
+LANGS = ("en", "es")
+
+
+class _Direction:
+    """Segment bounds sorted by source start time, as flat float arrays."""
+
+    def __init__(self, segments: list[dict], src: str, dst: str):
+        ordered = sorted(segments, key=lambda s: s[f"start_{src}"])
+        self.src_start = array("d", (s[f"start_{src}"] for s in ordered))
+        self.src_end = array("d", (s[f"end_{src}"] for s in ordered))
+        self.dst_start = array("d", (s[f"start_{dst}"] for s in ordered))
+        self.dst_end = array("d", (s[f"end_{dst}"] for s in ordered))
+
+    def map(self, t: float) -> float:
+        n = len(self.src_start)
+        if n == 0:
+            return t
+        i = bisect_right(self.src_start, t) - 1
+
+        # Before first segment: scale proportionally in the leading gap
+        if i < 0:
+            first_src = self.src_start[0]
+            if first_src > 0:
+                return t / first_src * self.dst_start[0]
+            return t
+
+        # Inside segment i: same fraction of the segment
+        if t <= self.src_end[i]:
+            src_dur = self.src_end[i] - self.src_start[i]
+            fraction = (t - self.src_start[i]) / src_dur if src_dur > 0 else 0.0
+            return self.dst_start[i] + fraction * (self.dst_end[i] - self.dst_start[i])
+
+        # After last segment: carry the overflow over unchanged
+        if i == n - 1:
+            return self.dst_end[i] + (t - self.src_end[i])
+
+        # Gap between segments i and i+1: interpolate linearly
+        gap_src = self.src_start[i + 1] - self.src_end[i]
+        fraction = (t - self.src_end[i]) / gap_src if gap_src > 0 else 0.0
+        return self.dst_end[i] + fraction * (self.dst_start[i + 1] - self.dst_end[i])
+
+
+class TimelineIndex:
+    """Map positions between the EN and ES timelines in O(log n).
+
+    Mirrors ``mapTime`` in ``frontend/src/lib/timelineMap.ts``: proportional
+    inside a segment, linear interpolation across gaps, proportional
+    scaling before the first segment and a constant offset after the last.
+    """
+
+    def __init__(self, timeline_map: dict):
+        segments = [
+            s for s in timeline_map.get("segments", [])
+            if s.get("start_es") is not None and s.get("end_es") is not None
+        ]
+        self.duration_en = timeline_map.get("duration_en")
+        self.duration_es = timeline_map.get("duration_es")
+        self._directions = {
+            ("en", "es"): _Direction(segments, "en", "es"),
+            ("es", "en"): _Direction(segments, "es", "en"),
+        }
+
+    def __len__(self) -> int:
+        return len(self._directions[("en", "es")].src_start)
+
+    def map(self, t: float, src: str, dst: str) -> float:
+        if src == dst:
+            return t
+        return self._directions[(src, dst)].map(t)
+
+    def map_many(self, times: Iterable[float], src: str, dst: str) -> list[float]:
+        if src == dst:
+            return list(times)
+        direction = self._directions[(src, dst)]
+        return [round(direction.map(t), 3) for t in times]
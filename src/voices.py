@@ -0,0 +1,276 @@
+"""Speaker voice library — recurring voices reused across jobs.
+
+Each known voice is a directory under ``voices.library_dir``::
+
+    data/voices/
+      index.npz            # normalized embeddings + ids, for nearest-neighbour lookup
+      ana/
+        meta.json          # name, embedding/TTS model, source job
+        embedding.npy      # diarization speaker embedding
+        reference.wav      # best reference clip (22050 Hz)
+        conditioning.pt    # cached XTTS conditioning latents (optional)
+
+The diarize step matches each speaker's embedding against the index and
+writes ``speaker_voices.json``; the TTS step then takes the reference clip
+and conditioning of matched speakers from the library instead of
+extracting and computing them again.
+
+Voices are added from a finished job:
+
+    python -m src.voices add --workdir ./work --speaker SPEAKER_00 --name "Ana"
+    python -m src.voices list
+    python -m src.voices remove ana
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+import threading
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+
+import click
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+
+from src.utils.io import read_json, write_json
+
+console = Console()
+
+
+def _slug(name: str) -> str:
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return re.sub(r"[^a-z0-9]+", "-", ascii_name.lower()).strip("-") or "voice"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class VoiceLibrary:
+    """Known voices on disk, with an embedding index rebuilt on every change."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._index: tuple[float, dict] | None = None  # (index mtime, arrays)
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.npz"
+
+    def voice_dir(self, voice_id: str) -> Path:
+        return self.root / voice_id
+
+    def voices(self) -> list[dict]:
+        """Metadata of every voice, sorted by id."""
+        if not self.root.exists():
+            return []
+        return [read_json(meta) for meta in sorted(self.root.glob("*/meta.json"))]
+
+    def _load_index(self) -> dict | None:
+        try:
+            mtime = self.index_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if self._index is None or self._index[0] != mtime:
+                with np.load(self.index_path) as data:
+                    self._index = (mtime, {k: data[k] for k in data.files})
+            return self._index[1]
+
+    def _rebuild_index(self):
+        metas = self.voices()
+        ids = [m["id"] for m in metas]
+        models = [m["embedding_model"] for m in metas]
+        if not ids:
+            self.index_path.unlink(missing_ok=True)
+            return
+        # Embedding sizes differ between models; pad to the widest, lookups
+        # only compare rows of the same model
+        vectors = [np.load(self.voice_dir(i) / "embedding.npy") for i in ids]
+        width = max(len(v) for v in vectors)
+        matrix = np.zeros((len(ids), width), dtype=np.float32)
+        for row, vec in enumerate(vectors):
+            matrix[row, :len(vec)] = _normalize(vec)
+        tmp = self.root / "index.tmp.npz"
+        np.savez(tmp, ids=np.array(ids), models=np.array(models), embeddings=matrix)
+        tmp.replace(self.index_path)
+
+    def match(self, embeddings: dict[str, list[float]], embedding_model: str,
+              threshold: float) -> dict[str, dict]:
+        """Library voice for each speaker whose cosine similarity reaches *threshold*.
+
+        Each voice is given to at most one speaker (the most similar one).
+        """
+        index = self._load_index()
+        if index is None or not embeddings:
+            return {}
+        rows = np.flatnonzero(index["models"] == embedding_model)
+        if rows.size == 0:
+            return {}
+        library = index["embeddings"][rows]
+        candidates = []
+        for speaker, embedding in embeddings.items():
+            vec = np.asarray(embedding, dtype=np.float32)
+            if not np.all(np.isfinite(vec)):
+                continue
+            query = np.zeros(library.shape[1], dtype=np.float32)
+            query[:len(vec)] = _normalize(vec)[:library.shape[1]]
+            sims = library @ query
+            for row in np.flatnonzero(sims >= threshold):
+                candidates.append((float(sims[row]), speaker, str(index["ids"][rows[row]])))
+
+        matches: dict[str, dict] = {}
+        taken = set()
+        for similarity, speaker, voice_id in sorted(candidates, reverse=True):
+            if speaker in matches or voice_id in taken:
+                continue
+            taken.add(voice_id)
+            meta = read_json(self.voice_dir(voice_id) / "meta.json")
+            matches[speaker] = {"voice": voice_id, "name": meta["name"],
+                                "similarity": round(similarity, 4)}
+        return matches
+
+    def reference(self, voice_id: str) -> Path | None:
+        path = self.voice_dir(voice_id) / "reference.wav"
+        return path if path.exists() else None
+
+    def conditioning(self, voice_id: str, tts_model: str) -> Path | None:
+        """Cached XTTS conditioning, if it was computed with *tts_model*."""
+        path = self.voice_dir(voice_id) / "conditioning.pt"
+        meta = read_json(self.voice_dir(voice_id) / "meta.json")
+        if path.exists() and meta.get("tts_model") == tts_model:
+            return path
+        return None
+
+    def add(self, name: str, embedding: list[float], embedding_model: str, reference: Path,
+            conditioning: Path | None = None, tts_model: str | None = None,
+            source: str | None = None) -> str:
+        """Store a voice (replacing one with the same name) and re-index."""
+        voice_id = _slug(name)
+        voice_dir = self.voice_dir(voice_id)
+        voice_dir.mkdir(parents=True, exist_ok=True)
+        np.save(voice_dir / "embedding.npy", np.asarray(embedding, dtype=np.float32))
+        shutil.copyfile(reference, voice_dir / "reference.wav")
+        (voice_dir / "conditioning.pt").unlink(missing_ok=True)
+        if conditioning is not None and conditioning.exists():
+            shutil.copyfile(conditioning, voice_dir / "conditioning.pt")
+        write_json({
+            "id": voice_id,
+            "name": name,
+            "embedding_model": embedding_model,
+            "tts_model": tts_model if conditioning is not None else None,
+            "source": source,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }, voice_dir / "meta.json")
+        self._rebuild_index()
+        return voice_id
+
+    def remove(self, voice_id: str) -> bool:
+        voice_dir = self.voice_dir(voice_id)
+        if not (voice_dir / "meta.json").exists():
+            return False
+        shutil.rmtree(voice_dir)
+        self._rebuild_index()
+        return True
+
+
+_libraries: dict[Path, VoiceLibrary] = {}
+
+
+def get_library(config: dict) -> VoiceLibrary | None:
+    """The library configured under ``voices.library_dir``, or None if disabled."""
+    root = config.get("voices", {}).get("library_dir")
+    if not root:
+        return None
+    root = Path(root).resolve()
+    if root not in _libraries:
+        _libraries[root] = VoiceLibrary(root)
+    return _libraries[root]
+
+
+def read_speaker_voices(workdir: Path) -> dict[str, dict]:
+    """Library matches written by the diarize step (speaker → voice)."""
+    path = workdir / "speaker_voices.json"
+    return read_json(path) if path.exists() else {}
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────
+
+def _cli_library(config_path: str) -> VoiceLibrary:
+    from src.config import load_config
+
+    library = get_library(load_config(config_path))
+    if library is None:
+        raise click.ClickException("voices.library_dir is not set in the config")
+    return library
+
+
+@click.group()
+def main():
+    """Manage the library of known voices."""
+
+
+@main.command("list")
+@click.option("--config", "config_path", default="configs/default.yaml")
+def list_voices(config_path: str):
+    """List known voices."""
+    table = Table(title="Voice library")
+    for col in ("id", "name", "embedding model", "conditioning", "source"):
+        table.add_column(col)
+    for meta in _cli_library(config_path).voices():
+        table.add_row(meta["id"], meta["name"], meta["embedding_model"],
+                      meta.get("tts_model") or "-", meta.get("source") or "-")
+    console.print(table)
+
+
+@main.command()
+@click.option("--workdir", required=True, type=click.Path(exists=True, file_okay=False))
+@click.option("--speaker", required=True, help="Diarization label in that job, e.g. SPEAKER_00")
+@click.option("--name", required=True, help="Name of the voice (re-adding a name replaces it)")
+@click.option("--config", "config_path", default="configs/default.yaml")
+def add(workdir: str, speaker: str, name: str, config_path: str):
+    """Add a speaker of a finished job to the library."""
+    work = Path(workdir)
+    emb_path = work / "speaker_embeddings.json"
+    if not emb_path.exists():
+        raise click.ClickException(f"{emb_path} not found; re-run the diarize step")
+    emb_data = read_json(emb_path)
+    if speaker not in emb_data["speakers"]:
+        raise click.ClickException(
+            f"No embedding for {speaker}; known: {', '.join(emb_data['speakers'])}"
+        )
+    reference = work / "speaker_refs" / f"{speaker}_ref.wav"
+    if not reference.exists():
+        raise click.ClickException(f"{reference} not found; run the tts step first")
+    conditioning = work / "speaker_refs" / f"{speaker}_conditioning.pt"
+    tts_model = None
+    if conditioning.exists():
+        import torch
+
+        tts_model = torch.load(conditioning, map_location="cpu").get("model")
+
+    voice_id = _cli_library(config_path).add(
+        name, emb_data["speakers"][speaker], emb_data["model"], reference,
+        conditioning if tts_model else None, tts_model, source=str(work.resolve()),
+    )
+    console.print(f"Added voice [bold]{voice_id}[/bold] from {speaker}")
+
+
+@main.command()
+@click.argument("voice_id")
+@click.option("--config", "config_path", default="configs/default.yaml")
+def remove(voice_id: str, config_path: str):
+    """Remove a voice from the library."""
+    if not _cli_library(config_path).remove(voice_id):
+        raise click.ClickException(f"Unknown voice: {voice_id}")
+    console.print(f"Removed {voice_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Model prefetch and warm-up.
+
+For every step that loads a model, :func:`warm_up` checks that its models
+are in the local cache (downloading them with ``download``), loads them
+into a :class:`~src.pipeline.models.ModelCache` with the same keys the
+steps use, and runs one tiny inference on synthetic input so allocation
+and kernel warm-up happen before the first job.  The API does this at
+startup (``warmup.enabled``) and keeps the cache resident for its jobs,
+reporting progress on ``/api/ready``; the CLI checks a node ahead of time
+or pre-populates the caches of an image:
+
+    python -m src.warmup                       # check, load, infer
+    python -m src.warmup --download --no-load  # only fetch missing models
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import Callable
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from src.pipeline.models import ModelCache
+from src.pipeline.registry import STEPS_ORDER, get_step
+
+console = Console()
+
+
+def warm_up(config: dict, models: ModelCache | None, steps: list[str] | None = None,
+            download: bool = False, load: bool = True,
+            on_result: Callable[[dict], None] | None = None,
+            guard: Callable[[str], AbstractContextManager] | None = None) -> list[dict]:
+    """Check, load and exercise the models of *steps* (default: ``warmup.steps``).
+
+    Returns one result per model step: ``{"step", "models", "ok", "seconds",
+    "error"}``, where ``models`` is the step's :meth:`check_models` report.
+    A step whose models are missing from the cache is not loaded.
+    *on_result* is called with each result as soon as it is known;
+    *guard(step)* is held while a step's models load and run.
+    """
+    names = steps or config.get("warmup", {}).get("steps") or STEPS_ORDER
+    results = []
+    with tempfile.TemporaryDirectory(prefix="loro-warmup-") as tmp:
+        for name in names:
+            step_cls = get_step(name)
+            if not step_cls.loads_models:
+                continue
+            step = step_cls(workdir=Path(tmp), config=config, models=models)
+            result = {"step": name, "models": [], "ok": False, "seconds": None, "error": None}
+            t0 = time.perf_counter()
+            try:
+                result["models"] = step.check_models(download=download)
+                missing = [m["model"] for m in result["models"] if m["cached"] is False]
+                if missing:
+                    result["error"] = f"not in the local cache: {', '.join(missing)}"
+                else:
+                    if load:
+                        with guard(name) if guard is not None else nullcontext():
+                            step.warmup()
+                    result["ok"] = True
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            result["seconds"] = round(time.perf_counter() - t0, 3)
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return results
+
+
+@click.command()
+@click.option("--config", "config_path", default="configs/default.yaml",
+              help="Path to YAML config file")
+@click.option("--preset", default=None, help="Warm the models of this preset")
+@click.option("--steps", multiple=True, type=click.Choice(STEPS_ORDER),
+              help="Steps to warm up (default: warmup.steps, else all)")
+@click.option("--download", is_flag=True, default=False,
+              help="Download models missing from the local cache")
+@click.option("--no-load", "no_load", is_flag=True, default=False,
+              help="Only check (or download) the models, do not load them")
+def main(config_path: str, preset: str | None, steps: tuple[str, ...], download: bool,
+         no_load: bool):
+    """Check that the configured models are cached, load them and run a tiny inference."""
+    from dotenv import load_dotenv
+
+    from src.config import apply_preset, load_config
+
+    load_dotenv()
+    try:
+        config = apply_preset(load_config(config_path), preset)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--preset")
+
+    def report(result: dict):
+        status = "[green]ok[/green]" if result["ok"] else f"[red]{result['error']}[/red]"
+        console.print(f"  {result['step']}: {status} ({result['seconds']:.1f}s)")
+
+    results = warm_up(config, ModelCache(), list(steps) or None, download=download,
+                      load=not no_load, on_result=report)
+
+    table = Table(title="Models")
+    for col in ("step", "model", "cached", "warm-up s"):
+        table.add_column(col)
+    for result in results:
+        for model in result["models"]:
+            cached = {True: "yes", False: "[red]no[/red]", None: "-"}[model["cached"]]
+            table.add_row(result["step"], model["model"], cached, f"{result['seconds']:.1f}")
+    console.print(table)
+
+    if not all(result["ok"] for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()